@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+电报页解析基准：旧版逐块 find/find_next 遍历 vs 单遍 iter_telegraph_items
+
+用法: python3 benchmarks/bench_telegraph.py [--repeat N] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from news_service import iter_telegraph_items  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'cls_telegraph.html')
+
+def legacy_extract(content: bytes, max_blocks: int = 20):
+    """旧版 _fetch_recent_telegraph 的提取逻辑（去掉日志和时间窗口过滤）"""
+    soup = BeautifulSoup(content, 'html.parser')
+    blocks = soup.find_all('div', class_=lambda x: x and 'telegraph-content-box' in x)
+    if not blocks:
+        blocks = soup.find_all('div', class_=lambda x: x and 'telegraph' in str(x).lower())
+    results = []
+    for block in blocks[:max_blocks]:
+        time_element = block.find('span', class_='telegraph-time-box')
+        if not time_element:
+            continue
+        time_text = time_element.get_text(strip=True)
+        if not re.match(r'^\d{1,2}:\d{2}:\d{2}$', time_text):
+            continue
+        content_element = block.find('div')
+        if not content_element:
+            continue
+        title = re.sub(r'\s+', ' ', content_element.get_text(strip=True)).strip()
+        if not title or len(title) <= 10:
+            continue
+        link_element = block.find('a')
+        url = link_element.get('href', '') if link_element else ''
+        if url and not url.startswith('http'):
+            url = f"https://www.cls.cn{url}"
+        stock_info = None
+        stock_container = block.find_next('div', class_='industry-stock')
+        if stock_container:
+            stock_items = []
+            for link in stock_container.find_all('a')[:3]:
+                name_span = link.find('span', class_='c-222')
+                change_span = link.find('span', class_='c-de0422')
+                if name_span and change_span:
+                    stock_items.append(f"{name_span.get_text(strip=True)} {change_span.get_text(strip=True)}")
+            if stock_items:
+                stock_info = ' '.join(stock_items)
+        results.append((time_text, title, url, stock_info))
+    return results
+
+def single_pass_extract(content: bytes, max_blocks: int = 20):
+    return list(iter_telegraph_items(content, max_blocks=max_blocks))
+
+def measure(func, content: bytes, repeat: int, **kwargs) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content, **kwargs)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'min_ms': samples[0] * 1000,
+        'median_ms': samples[len(samples) // 2] * 1000,
+        'max_ms': samples[-1] * 1000,
+    }
+
+def run(repeat: int = 20) -> dict:
+    with open(FIXTURE, 'rb') as f:
+        content = f.read()
+
+    legacy = legacy_extract(content)
+    fast = single_pass_extract(content)
+    # 旧版 find_next 会把下一个块的股票挂到无股票的块上，这里只比对时间/标题/链接
+    if [item[:3] for item in legacy] != [item[:3] for item in fast]:
+        raise SystemExit("单遍解析结果与旧版不一致")
+
+    result = {
+        'fixture': os.path.basename(FIXTURE),
+        'bytes': len(content),
+        'items': len(fast),
+        'legacy_20_blocks': measure(legacy_extract, content, repeat),
+        'single_pass_20_blocks': measure(single_pass_extract, content, repeat),
+        'legacy_all_blocks': measure(legacy_extract, content, repeat, max_blocks=10 ** 6),
+        'single_pass_all_blocks': measure(single_pass_extract, content, repeat, max_blocks=None),
+    }
+    result['speedup_20_blocks'] = result['legacy_20_blocks']['median_ms'] / result['single_pass_20_blocks']['median_ms']
+    result['speedup_all_blocks'] = result['legacy_all_blocks']['median_ms'] / result['single_pass_all_blocks']['median_ms']
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='电报页解析基准')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='输出JSON结果')
+    args = parser.parse_args()
+
+    result = run(args.repeat)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    print(f"样本: {result['fixture']} ({result['bytes']} 字节, {result['items']} 条电报)")
+    for key in ('legacy_20_blocks', 'single_pass_20_blocks', 'legacy_all_blocks', 'single_pass_all_blocks'):
+        print(f"  {key:<24} 中位数 {result[key]['median_ms']:8.2f} ms")
+    print(f"  加速比(前20块): {result['speedup_20_blocks']:.1f}x  加速比(全部): {result['speedup_all_blocks']:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+生成基准测试用的离线页面样本
+
+样本按真实页面结构合成（固定随机种子，可重复生成），写入 benchmarks/fixtures/，
+并生成与录制模式格式相同的 index.jsonl，可直接交给 tools/upstream_replay.py 回放。
+"""
+
+import json
+import os
+import random
+import sys
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+STOCK_NAMES = [
+    '宁德时代', '贵州茅台', '比亚迪', '中际旭创', '东方财富', '隆基绿能', '中芯国际',
+    '寒武纪', '工业富联', '招商银行', '紫金矿业', '赛力斯', '北方华创', '中国平安',
+]
+HEADLINE_WORDS = [
+    '央行', '降准', '新能源', '半导体', '订单', '业绩预告', '回购', '北向资金', '人工智能',
+    '机器人', '算力', '储能', '出口', '消费电子', '光伏', '并购重组', '国常会', '美联储',
+]
+
+def _headline(rng: random.Random) -> str:
+    words = rng.sample(HEADLINE_WORDS, 3)
+    return f"{words[0]}{rng.choice(['宣布', '拟', '据悉', '公告'])}{words[1]}相关{words[2]}事项"
+
+def _page_chrome(rng: random.Random, title: str) -> str:
+    """页面头部：模拟真实页面中体积较大的脚本和样式"""
+    script = ''.join(f"window.__cfg{i}={{a:{rng.randint(0, 10**6)},b:'{'x' * 40}'}};" for i in range(300))
+    style = ''.join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px}}" for i in range(400))
+    nav = ''.join(f'<li><a href="/nav/{i}">导航{i}</a></li>' for i in range(40))
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+            f'<style>{style}</style><script>{script}</script></head>'
+            f'<body><div class="header"><ul class="nav">{nav}</ul></div>')
+
+def make_cls_telegraph(rng: random.Random, blocks: int = 80) -> str:
+    """财联社电报页：telegraph-content-box 块 + 紧随其后的 industry-stock 容器
+
+    同一页面也是 cls_telegraph 新闻源的抓取地址，分享区的 /telegraph/ 链接
+    对应该源的 a[href*="/telegraph/"] 选择器；块内第一个链接仍是 /detail/。
+    """
+    parts = [_page_chrome(rng, '电报-财联社'), '<div class="telegraph-list">']
+    seconds = 15 * 3600
+    for i in range(blocks):
+        seconds -= rng.randint(20, 240)
+        hh, mm, ss = seconds // 3600, seconds % 3600 // 60, seconds % 60
+        headline = _headline(rng)
+        body = '，'.join(_headline(rng) for _ in range(rng.randint(2, 6)))
+        parts.append(
+            f'<div class="clearfix p-r l-h-26p f-s-16 telegraph-content-box" data-id="{1800000 + i}">'
+            f'<span class="telegraph-time-box">{hh:02d}:{mm:02d}:{ss:02d}</span>'
+            f'<div class="f-l l-h-13579 w-100p telegraph-content-left">'
+            f'<span class="c-34304b"><strong>【{headline}】</strong>财联社{i}日电，{body}。\n</span></div>'
+            f'<div class="telegraph-share"><a href="/detail/{1800000 + i}">评论</a>'
+            f'<a class="telegraph-share-title" href="/telegraph/{1800000 + i}">{headline}</a>'
+            f'<span class="share-num">{rng.randint(0, 999)}</span></div></div>'
+        )
+        if rng.random() < 0.7:
+            links = ''.join(
+                f'<a href="/stock?code=sz{rng.randint(300000, 301000)}">'
+                f'<span class="c-222">{name}</span><span class="c-de0422">{rng.choice("+-")}{rng.uniform(0, 10):.2f}%</span></a>'
+                for name in rng.sample(STOCK_NAMES, rng.randint(1, 5))
+            )
+            parts.append(f'<div class="industry-stock">{links}</div>')
+    parts.append('</div><div class="footer">')
+    parts.append(''.join(f'<p><a href="/about/{i}">关于我们{i}</a></p>' for i in range(60)))
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+EN_WORDS = ['startup', 'raises', 'Series B', 'AI', 'chip', 'launches', 'platform', 'acquires',
+            'open source', 'model', 'robotics', 'funding', 'cloud', 'security', 'developer']
+
+def _en_headline(rng: random.Random) -> str:
+    return ' '.join(rng.choice(EN_WORDS) for _ in range(rng.randint(5, 9))).capitalize()
+
+# 各新闻源列表页的条目模板，与 news_sources_config.json 中的首选选择器对应
+SOURCE_ITEM_TEMPLATES = {
+    '36kr': '<div class="kr-flow-article-item"><a class="article-item-title weight-bold" href="/p/{id}">{title}</a>'
+            '<a class="kr-flow-bar-author" href="/user/{id}">作者</a></div>',
+    'techcrunch': '<article class="post-block"><h2 class="post-block__title">'
+                  '<a class="post-block__title__link" href="https://techcrunch.com/2024/05/20/story-{id}/">{en_title}</a></h2></article>',
+    'huxiu': '<div class="article-item"><h5 class="article-title"><a href="/article/{id}.html">{title}</a></h5></div>',
+    'tmtpost': '<div class="item"><a class="_tit" href="/{id}.html">{title}</a><span class="time">1小时前</span></div>',
+    'leiphone': '<div class="box"><h3><a href="https://www.leiphone.com/category/ai/{id}.html">{title}</a></h3></div>',
+    'cls_finance': '<div class="subject-interest-item"><a href="/detail/{id}">{title}</a></div>',
+    'cls_depth': '<div class="depth-item"><a href="/depth/{id}">{title}</a></div>',
+}
+
+def make_source_page(key: str):
+    """按新闻源模板生成列表页"""
+    def builder(rng: random.Random, items: int = 60) -> str:
+        template = SOURCE_ITEM_TEMPLATES[key]
+        parts = [_page_chrome(rng, key), '<div class="main-list">']
+        for i in range(items):
+            parts.append(template.format(id=3000000 + i, title=_headline(rng) + '，' + _headline(rng),
+                                         en_title=_en_headline(rng)))
+        parts.append('</div></body></html>')
+        return ''.join(parts)
+    return builder
+
+# 流式抓取回退用例：开头是大量能通过校验的普通链接，真正的头条（优先选择器 .lead-story a）
+# 在页面末尾。前缀里只有兜底选择器 "a" 凑够条数，流式抓取必须读完整页，结果与整页解析相同
+STREAM_FALLBACK_URL = 'https://bench.example.com/stream_fallback'
+STREAM_FALLBACK_SOURCE = {
+    'enabled': True,
+    'name': 'stream_fallback',
+    'url': STREAM_FALLBACK_URL,
+    'selectors': ['.lead-story a', 'a'],
+    'min_title_length': 8,
+    'url_pattern': r'/p/\d+',
+    'stream': True,
+}
+
+def make_stream_fallback(rng: random.Random, links: int = 400, leads: int = 5) -> str:
+    parts = [_page_chrome(rng, 'stream_fallback'), '<div class="feed">']
+    parts += [f'<p><a href="/p/{4000000 + i}">{_headline(rng)}</a></p>' for i in range(links)]
+    parts.append('</div><div class="leads">')
+    parts += [f'<div class="lead-story"><a href="/p/{5000000 + i}">头条{i}：{_headline(rng)}</a></div>'
+              for i in range(leads)]
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+def make_cls_detail(rng: random.Random) -> str:
+    """财联社详情页：发布时间和相关股票"""
+    stocks = ''.join(
+        f'<a href="/stock?code=sh{rng.randint(600000, 605000)}"><span class="c-222">{name}</span>'
+        f'<span class="c-de0422">{rng.choice("+-")}{rng.uniform(0, 10):.2f}%</span></a>'
+        for name in rng.sample(STOCK_NAMES, 4)
+    )
+    body = ''.join(f'<p>{_headline(rng)}，{_headline(rng)}。</p>' for _ in range(30))
+    return (_page_chrome(rng, '详情-财联社') +
+            f'<div class="detail-header"><div class="f-l m-r-10 time">2024年05月20日 10:23:45</div></div>'
+            f'<div class="detail-content">{body}</div><div class="industry-stock">{stocks}</div></body></html>')
+
+SINA_INDICES = [
+    ('sh000001', '上证指数', 3100.0), ('sz399001', '深证成指', 9800.0), ('sz399006', '创业板指', 1900.0),
+    ('sh000688', '科创50', 850.0), ('bj899050', '北证50', 1000.0),
+]
+
+def make_sina_hq(rng: random.Random) -> bytes:
+    """新浪行情接口：GBK编码的 var hq_str_xxx="..." 行"""
+    lines = []
+    for code, name, base in SINA_INDICES:
+        prev_close = base * rng.uniform(0.97, 1.03)
+        current = prev_close * rng.uniform(0.97, 1.03)
+        fields = [name, f"{prev_close:.3f}", f"{prev_close:.3f}", f"{current:.3f}",
+                  f"{max(current, prev_close) * 1.01:.3f}", f"{min(current, prev_close) * 0.99:.3f}",
+                  '0.000', '0.000', str(rng.randint(10 ** 8, 10 ** 9)), str(rng.randint(10 ** 11, 10 ** 12))]
+        fields += ['0'] * 20 + ['2024-05-20', '15:00:03', '00']
+        lines.append(f'var hq_str_{code}="{",".join(fields)}";')
+    return ('\n'.join(lines) + '\n').encode('gbk')
+
+SECTOR_NAMES = ['半导体', '光伏设备', '电池', '酿酒行业', '银行', '证券', '保险', '汽车整车', '通信设备',
+                '软件开发', '医疗器械', '中药', '化学制药', '房地产开发', '煤炭行业', '电力行业']
+
+def make_eastmoney_clist(rng: random.Random) -> str:
+    """东方财富板块排行接口（np=1 时 diff 为列表）"""
+    diff = []
+    for i in range(50):
+        name = SECTOR_NAMES[i % len(SECTOR_NAMES)] + ('' if i < len(SECTOR_NAMES) else str(i // len(SECTOR_NAMES)))
+        change = round(rng.uniform(-5, 5), 2)
+        diff.append({'f1': 2, 'f2': round(rng.uniform(500, 3000), 2), 'f3': change,
+                     'f4': round(change * 10, 2), 'f12': f"BK{1000 + i:04d}", 'f14': name})
+    diff.sort(key=lambda x: x['f3'], reverse=True)
+    return json.dumps({'rc': 0, 'rt': 6, 'svr': 0, 'lt': 1, 'full': 1,
+                       'data': {'total': len(diff), 'diff': diff}}, ensure_ascii=False)
+
+FIXTURES = {
+    'cls_telegraph.html': make_cls_telegraph,
+    'cls_detail.html': make_cls_detail,
+    'sina_hq.txt': make_sina_hq,
+    'eastmoney_clist.json': make_eastmoney_clist,
+    'stream_fallback.html': make_stream_fallback,
+}
+FIXTURES.update({f"sources/{key}.html": make_source_page(key) for key in SOURCE_ITEM_TEMPLATES})
+
+HTML = 'text/html; charset=utf-8'
+
+def fixture_index(sources: dict) -> list:
+    """样本对应的上游URL，格式与 NEWS_SERVICE_RECORD_DIR 录制的 index.jsonl 相同"""
+    entries = [
+        ('https://www.cls.cn/telegraph', 'cls_telegraph.html', HTML),
+        ('https://hq.sinajs.cn/list=sh000001,sz399001,sz399006,sh000688,bj899050', 'sina_hq.txt',
+         'application/javascript; charset=GBK'),
+        ('http://push2.eastmoney.com/api/qt/clist/get', 'eastmoney_clist.json', 'application/json; charset=utf-8'),
+        (STREAM_FALLBACK_URL, 'stream_fallback.html', HTML),
+    ]
+    for key, config in sources.items():
+        if key in SOURCE_ITEM_TEMPLATES:
+            entries.append((config['url'], f"sources/{key}.html", HTML))
+    # 财联社盘面列表页中的详情链接共用同一个详情页样本
+    entries += [(f"https://www.cls.cn/detail/{3000000 + i}", 'cls_detail.html', HTML) for i in range(60)]
+    return [{'url': url, 'status': 200, 'headers': {'Content-Type': content_type}, 'body': body, 'elapsed_ms': 0}
+            for url, body, content_type in entries]
+
+def main(argv=None):
+    """生成全部样本；传入 --force 覆盖已有文件"""
+    argv = sys.argv[1:] if argv is None else argv
+    force = '--force' in argv
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, builder in FIXTURES.items():
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.exists(path) and not force:
+            continue
+        content = builder(random.Random(name))
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        print(f"已生成 {path} ({len(content)} 字节)")
+
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'news_sources_config.json')
+    with open(config_path, 'r', encoding='utf-8') as f:
+        sources = json.load(f)['sources']
+    with open(os.path.join(FIXTURES_DIR, 'index.jsonl'), 'w', encoding='utf-8') as f:
+        for entry in fixture_index(sources):
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+离线上游：把 news_service 发出的 HTTP 请求路由到 fixtures/ 下的样本文件
+
+只替换传输层（requests 适配器），响应对象的构造、解码和解析流程与线上一致。
+样本目录格式与录制模式（NEWS_SERVICE_RECORD_DIR）相同，也可以换成真实录制。
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from requests.adapters import BaseAdapter  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+from requests.utils import get_encoding_from_headers  # noqa: E402
+
+from tools.upstream_replay import RecordingIndex, retime_telegraph  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+REPO_CONFIG = os.path.join(os.path.dirname(BENCH_DIR), 'news_sources_config.json')
+
+class FixtureAdapter(BaseAdapter):
+    """按 fixtures/index.jsonl 返回样本内容的 requests 适配器"""
+
+    def __init__(self, directory: str = FIXTURES_DIR):
+        super().__init__()
+        self.index = RecordingIndex(directory)
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        entries = self.index.candidates(request.url)
+        if not entries:
+            response.status_code = 404
+            response.raw = io.BytesIO(b'')
+            response.headers = CaseInsensitiveDict({'Content-Type': 'text/plain'})
+        else:
+            entry = entries[-1]
+            content = self.index.body(entry)
+            if '/telegraph' in request.url:
+                content = retime_telegraph(content)
+            response.status_code = entry.get('status', 200)
+            # 以流的形式提供正文，stream=True 的请求可以分块读取
+            response.raw = io.BytesIO(content)
+            response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'OK' if response.status_code == 200 else 'Not Found'
+        return response
+
+    def close(self):
+        pass
+
+def load_sources(path: str = REPO_CONFIG) -> dict:
+    """读取仓库内 news_sources_config.json 的全部新闻源（含未启用的）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['sources']
+
+@contextlib.contextmanager
+def offline_upstream(directory: str = FIXTURES_DIR):
+    """在上下文内让 news_service 的所有上游请求走样本（或录制）目录"""
+    adapter = FixtureAdapter(directory)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # news_service 在调用时才导入 requests，直接替换模块上的 get
+    original_get = requests.get
+    requests.get = session.get
+    try:
+        yield adapter
+    finally:
+        requests.get = original_get
+        session.close()
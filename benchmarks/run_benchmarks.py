@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+离线基准测试套件：抓取-解析-服务全链路
+
+全部上游请求由 benchmarks/fixtures/ 下的样本提供，不访问网络。结果以 JSON 输出，
+可通过 --baseline 与历史结果比较，耗时类指标退化超过阈值时以非零状态退出。
+
+用法:
+    python3 benchmarks/run_benchmarks.py --output bench.json
+    python3 benchmarks/run_benchmarks.py --quick --baseline bench.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench_telegraph  # noqa: E402
+from make_fixtures import STREAM_FALLBACK_SOURCE  # noqa: E402
+from offline import REPO_CONFIG, load_sources, offline_upstream  # noqa: E402
+
+import news_service  # noqa: E402
+from news_service import BigAPool, NewsAPIHandler, NewsItem, NewsPool  # noqa: E402
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def timing_stats(samples) -> dict:
+    """秒级样本 -> 毫秒统计"""
+    return {
+        'runs': len(samples),
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+    }
+
+def timed(func, repeat: int, setup=None):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+def make_pool(max_size: int = 100) -> NewsPool:
+    return NewsPool(max_size=max_size, auto_start=False, config_file=REPO_CONFIG)
+
+def reset_upstream_cache():
+    """清空共享抓取层缓存的响应和流式前缀，使下一次抓取重新读取样本"""
+    fetcher = news_service.upstream_fetcher
+    with fetcher.lock:
+        fetcher._cache.clear()
+        fetcher._prefixes.clear()
+
+def fetch_titles(pool: NewsPool, config: dict, stream: bool) -> list:
+    reset_upstream_cache()
+    return [item.title for item in pool._fetch_news_from_source(dict(config, stream=stream))]
+
+def bench_fetch_parse(repeat: int) -> dict:
+    """每个新闻源的 _fetch_news_from_source 解析吞吐
+
+    matches_full 检查流式抓取与整页解析的结果是否一致（stream_fallback 为优先选择器只在
+    页面末尾命中的回退用例），不一致时套件以非零状态退出。
+    """
+    results = {}
+    pool = make_pool()
+    sources = load_sources()
+    sources['stream_fallback'] = STREAM_FALLBACK_SOURCE
+    with offline_upstream() as adapter:
+        for key, config in sources.items():
+            before = adapter.requests
+            samples, items = timed(lambda: pool._fetch_news_from_source(config), repeat)
+            stats = timing_stats(samples)
+            stats['items'] = len(items)
+            stats['upstream_requests_per_call'] = (adapter.requests - before) / repeat
+            stats['items_per_s'] = len(items) / statistics.median(samples) if items else 0.0
+            stats['stream'] = bool(config.get('stream'))
+            stats['matches_full'] = fetch_titles(pool, config, True) == fetch_titles(pool, config, False)
+            results[key] = stats
+    return results
+
+def bench_telegraph_fetch(repeat: int) -> dict:
+    """BigAPool._fetch_recent_telegraph 整体耗时，以及单遍提取与旧版遍历的对比"""
+    biga = BigAPool(auto_start=False)
+    with offline_upstream():
+        samples, items = timed(biga._fetch_recent_telegraph, repeat)
+    stats = timing_stats(samples)
+    stats['items'] = len(items)
+    return {
+        'fetch_recent_telegraph': stats,
+        'extract': bench_telegraph.run(repeat),
+    }
+
+def bench_merge(repeat: int, sizes) -> dict:
+    """refresh_news 合并阶段在不同池大小下的耗时"""
+    results = {}
+    batch_titles = [f"批次新闻标题 {i} 用于合并基准测试" for i in range(160)]
+    for size in sizes:
+        pool = make_pool(max_size=size)
+        pool.clusterer = None  # 这里的合成标题彼此近似，聚类的开销在 cluster 组单独测量
+        existing = [NewsItem(f"已有新闻标题 {i} 用于合并基准测试", f"https://example.com/{i}", 'bench')
+                    for i in range(size)]
+        # 一半与池中已有标题重复，模拟连续两轮抓取的重叠
+        batch = [NewsItem(existing[i].title if i % 2 and i < size else title, f"https://example.com/n{i}", 'bench')
+                 for i, title in enumerate(batch_titles)]
+
+        def reset():
+            pool.news_items = list(existing)
+
+        samples, _ = timed(lambda: pool._merge_news_items(list(batch)), repeat, setup=reset)
+        stats = timing_stats(samples)
+        stats['pool_size'] = size
+        stats['batch_size'] = len(batch)
+        results[str(size)] = stats
+    return results
+
+def bench_cluster(repeat: int, sizes, batch_size: int = 160) -> dict:
+    """近似重复聚类：签名和查询开销，以及合并阶段每条新入池新闻增加的耗时"""
+    import random
+    from news_service import StoryClusterer
+
+    # 样本页面的标题模板词汇太少，彼此都相似；这里用 3000 个常用区汉字组成的词表造标题，
+    # 使无关标题之间的重合度接近真实新闻
+    chars = [chr(0x4e00 + i) for i in range(3000)]
+
+    def _headline(rng):
+        return ''.join(rng.choice(chars) + rng.choice(chars) for _ in range(rng.randint(4, 7)))
+
+    results = {}
+    for size in sizes:
+        rng = random.Random(size)
+        existing = [NewsItem(f"【{_headline(rng)}】{_headline(rng)}", f"https://example.com/{i}", 'bench')
+                    for i in range(size)]
+        # 四分之一是池中已有新闻换了说法的版本（结尾改写、去掉括号），其余为新事件
+        batch = []
+        for i in range(batch_size):
+            if i % 4 == 0:
+                title = existing[rng.randrange(size)].title
+                title = title[:-2] + '宣布'
+                batch.append(NewsItem(title.replace('【', '').replace('】', '，'), f"https://example.com/d{i}", 'other'))
+            else:
+                batch.append(NewsItem(f"【{_headline(rng)}】{_headline(rng)}", f"https://example.com/n{i}", 'other'))
+
+        clusterer = StoryClusterer()
+        start = time.perf_counter()
+        for item in existing:
+            clusterer.add(item.title)
+        sign_seconds = time.perf_counter() - start
+        query_samples, _ = timed(lambda: clusterer.similar(batch[1].title), 200)
+
+        entry = {'pool_size': size, 'batch_size': batch_size, 'sign_us_per_item': sign_seconds / size * 1e6,
+                 'query_us': percentile(query_samples, 50) * 1e6}
+        for mode in ('plain', 'clustered'):
+            pool = make_pool(max_size=size + batch_size)
+            if mode == 'plain':
+                pool.clusterer = None
+            else:
+                pool.clusterer.sync(item.title for item in existing)
+
+            def reset():
+                pool.news_items = list(existing)
+                for item in batch:
+                    item.duplicates = []
+
+            samples, _ = timed(lambda: pool._merge_news_items(list(batch)), repeat, setup=reset)
+            entry[f"{mode}_merge_ms"] = statistics.median(samples) * 1000
+            entry[f"{mode}_items"] = len(pool.news_items)
+        entry['extra_us_per_item'] = (entry['clustered_merge_ms'] - entry['plain_merge_ms']) * 1000 / batch_size
+        results[str(size)] = entry
+    return results
+
+def bench_search(sizes, queries) -> dict:
+    """SearchIndex 在不同文档规模下的入库开销和查询延迟"""
+    import random
+    from make_fixtures import STOCK_NAMES, _headline
+    from news_service import SearchIndex
+
+    results = {}
+    for size in sizes:
+        rng = random.Random(size)
+        items = [NewsItem(f"【{_headline(rng)}】{_headline(rng)}{i}", f"https://example.com/{i}",
+                          rng.choice(['财联社电报', '财联社盘面', '36kr']),
+                          stock_info=f"{rng.choice(STOCK_NAMES)} +1.00%" if i % 3 == 0 else None)
+                 for i in range(size)]
+        index = SearchIndex()
+        start = time.perf_counter()
+        for item in items:
+            index.add('news', item)
+        add_seconds = time.perf_counter() - start
+
+        entry = {'documents': len(index), 'add_us_per_item': add_seconds / size * 1e6, 'queries': {}}
+        for query in queries:
+            samples, hits = timed(lambda: index.search(query, limit=20), 200)
+            entry['queries'][query] = {
+                'hits': len(hits),
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+            }
+        results[str(size)] = entry
+    return results
+
+def bench_alerts(keyword_counts, items: int = 2000) -> dict:
+    """提醒自动机在不同关键词数量下的编译耗时和每条扫描耗时"""
+    import random
+    from make_fixtures import STOCK_NAMES, _headline
+    from news_service import KeywordAutomaton
+
+    rng = random.Random('alerts')
+    texts = [f"【{_headline(rng)}】{_headline(rng)}\n{rng.choice(STOCK_NAMES)} +1.00%" for _ in range(items)]
+    results = {}
+    for count in keyword_counts:
+        keywords = list(STOCK_NAMES) + [f"{_headline(rng)[:4]}{i}" for i in range(count - len(STOCK_NAMES))]
+        start = time.perf_counter()
+        automaton = KeywordAutomaton(keywords)
+        build_seconds = time.perf_counter() - start
+
+        def scan():
+            return sum(1 for text in texts if automaton.find(text))
+
+        samples, matched = timed(scan, 5)
+        results[str(count)] = {
+            'states': len(automaton),
+            'build_ms': build_seconds * 1000,
+            'matched_items': matched,
+            'scan_us_per_item': percentile(samples, 50) / items * 1e6,
+        }
+    return results
+
+def _prepare_server():
+    """用样本数据填充两个数据池并启动与线上相同的 HTTPServer"""
+    with offline_upstream():
+        pool = make_pool()
+        pool.news_sources = load_sources()
+        pool.refresh_news()
+        biga = BigAPool(auto_start=False)
+        biga._update_indices()
+        biga._update_sectors()
+        biga._update_telegraph()
+    news_service.news_pool = pool
+    news_service.biga_pool = biga
+    httpd = HTTPServer(('127.0.0.1', 0), NewsAPIHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd
+
+def bench_api(requests_per_client: int, concurrency_levels, endpoints) -> dict:
+    """NewsAPIHandler 在并发客户端下的请求延迟"""
+    httpd = _prepare_server()
+    port = httpd.server_address[1]
+    results = {}
+    try:
+        for endpoint in endpoints:
+            for clients in concurrency_levels:
+                latencies = []
+                errors = []
+                lock = threading.Lock()
+
+                def client():
+                    local = []
+                    for _ in range(requests_per_client):
+                        start = time.perf_counter()
+                        try:
+                            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                            conn.request('GET', endpoint)
+                            response = conn.getresponse()
+                            response.read()
+                            conn.close()
+                            if response.status != 200:
+                                raise RuntimeError(f"HTTP {response.status}")
+                        except Exception as e:
+                            with lock:
+                                errors.append(str(e))
+                            continue
+                        local.append(time.perf_counter() - start)
+                    with lock:
+                        latencies.extend(local)
+
+                threads = [threading.Thread(target=client) for _ in range(clients)]
+                wall_start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                wall = time.perf_counter() - wall_start
+
+                results[f"{endpoint} c={clients}"] = {
+                    'endpoint': endpoint,
+                    'clients': clients,
+                    'requests': len(latencies),
+                    'errors': len(errors),
+                    'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+                    'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+                    'mean_ms': statistics.mean(latencies) * 1000 if latencies else None,
+                    'throughput_rps': len(latencies) / wall if wall else 0.0,
+                }
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    return results
+
+def _get(port: int, endpoint: str) -> float:
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    conn.request('GET', endpoint)
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}")
+    return time.perf_counter() - start
+
+def bench_refresh_latency(refresh_count: int, endpoint: str = '/biga/next', workers: int = 2) -> dict:
+    """全量刷新持续进行时的 API 尾延迟：解析在服务进程内 vs 解析进程池"""
+    results = {}
+    for mode, pool_workers in (('inline', 0), ('pool', workers)):
+        if pool_workers:
+            news_service.start_parse_pool(pool_workers)
+            # 预热：让子进程完成启动和导入
+            with open(os.path.join(os.path.dirname(REPO_CONFIG), 'benchmarks', 'fixtures', 'cls_telegraph.html'), 'rb') as f:
+                sample = f.read()
+            for _ in range(pool_workers * 2):
+                news_service.run_parser(news_service.parse_telegraph_page, sample, 20)
+        httpd = _prepare_server()
+        port = httpd.server_address[1]
+        refreshes = []
+
+        def refresher():
+            with offline_upstream():
+                for _ in range(refresh_count):
+                    start = time.perf_counter()
+                    news_service.news_pool.refresh_news()
+                    refreshes.append(time.perf_counter() - start)
+
+        try:
+            idle = [_get(port, endpoint) for _ in range(200)]
+            thread = threading.Thread(target=refresher, daemon=True)
+            thread.start()
+            busy = []
+            while thread.is_alive():
+                busy.append(_get(port, endpoint))
+            thread.join()
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            news_service.stop_parse_pool()
+
+        results[mode] = {
+            'workers': pool_workers,
+            'requests': len(busy),
+            'idle_p99_ms': percentile(idle, 99) * 1000,
+            'p50_ms': percentile(busy, 50) * 1000,
+            'p99_ms': percentile(busy, 99) * 1000,
+            'max_ms': max(busy) * 1000,
+            'refreshes': len(refreshes),
+            'refresh_median_ms': statistics.median(refreshes) * 1000 if refreshes else None,
+        }
+    return results
+
+def bench_startup(repeat: int) -> dict:
+    """进程启动耗时：解释器本身、导入 news_service、已有实例时新进程退出的总耗时"""
+    repo_dir = os.path.dirname(REPO_CONFIG)
+    port = 18765
+    env = dict(os.environ, NEWS_SERVICE_PORT=str(port), NEWS_SERVICE_ARCHIVE_DIR='')
+
+    def run(args):
+        return lambda: subprocess.run([sys.executable] + args, cwd=repo_dir, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+
+    # 本进程持有单实例锁，模拟服务已在运行
+    lock = news_service.acquire_instance_lock(port)
+    try:
+        results = {}
+        for name, args in (('python', ['-c', 'pass']),
+                           ('import', ['-c', 'import news_service']),
+                           ('parsing_libs', ['-c', 'import requests, bs4, soupsieve']),
+                           ('second_instance', ['news_service.py'])):
+            samples, returncode = timed(run(args), repeat)
+            results[name] = {'returncode': returncode, **timing_stats(samples)}
+        return results
+    finally:
+        if lock is not None:
+            lock.close()
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(REPO_CONFIG), timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': commit,
+    }
+
+def flatten_timings(results: dict, prefix: str = '') -> dict:
+    """提取所有耗时类指标（键名以 _ms 结尾，越小越好）"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_timings(value, f"{path}."))
+        elif key.endswith('_ms') and key not in ('min_ms', 'max_ms') and isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+def compare(current: dict, baseline: dict, tolerance: float):
+    """返回退化超过阈值的指标列表 [(指标, 基线, 当前, 比例)]"""
+    now = flatten_timings(current['results'])
+    before = flatten_timings(baseline.get('results', {}))
+    regressions = []
+    for key, value in sorted(now.items()):
+        old = before.get(key)
+        if old and value > old * (1 + tolerance):
+            regressions.append((key, old, value, value / old))
+    return regressions
+
+def empty_cases(results: dict, prefix: str = '') -> list:
+    """返回解析出 0 条的用例（带 items 字段的指标），空结果的耗时没有意义"""
+    empty = []
+    for key, value in results.items():
+        if isinstance(value, dict):
+            path = f"{prefix}{key}"
+            if value.get('items') == 0:
+                empty.append(path)
+            empty.extend(empty_cases(value, f"{path}."))
+    return empty
+
+def mismatched_cases(results: dict) -> list:
+    """返回流式抓取与整页解析结果不一致的新闻源"""
+    return [key for key, stats in results.get('fetch_parse', {}).items() if stats.get('matches_full') is False]
+
+BENCHMARKS = ('fetch_parse', 'telegraph', 'merge', 'cluster', 'search', 'alerts', 'api', 'refresh_latency', 'startup')
+
+def main():
+    parser = argparse.ArgumentParser(description='离线基准测试套件')
+    parser.add_argument('--quick', action='store_true', help='减少重复次数，用于快速检查')
+    parser.add_argument('--only', default='', help=f"逗号分隔的子集: {','.join(BENCHMARKS)}")
+    parser.add_argument('--output', help='结果JSON写入文件（默认输出到标准输出）')
+    parser.add_argument('--baseline', help='与之前的结果JSON比较')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='允许的耗时退化比例')
+    args = parser.parse_args()
+
+    selected = [name for name in args.only.split(',') if name] or list(BENCHMARKS)
+    repeat = 3 if args.quick else 15
+    results = {}
+    if 'fetch_parse' in selected:
+        results['fetch_parse'] = bench_fetch_parse(repeat)
+    if 'telegraph' in selected:
+        results['telegraph'] = bench_telegraph_fetch(repeat)
+    if 'merge' in selected:
+        results['merge'] = bench_merge(repeat * 2, (100, 1000, 10000, 50000))
+    if 'cluster' in selected:
+        results['cluster'] = bench_cluster(repeat, (100, 1000, 10000))
+    if 'search' in selected:
+        results['search'] = bench_search((10000, 50000), ('降准', '宁德时代', '半导体 订单', '算力公告', '芯', '茅'))
+    if 'alerts' in selected:
+        results['alerts'] = bench_alerts((100, 1000, 10000))
+    if 'api' in selected:
+        results['api'] = bench_api(20 if args.quick else 100, (1, 8, 32), ('/next', '/biga/next', '/status'))
+    if 'refresh_latency' in selected:
+        results['refresh_latency'] = bench_refresh_latency(3 if args.quick else 10)
+    if 'startup' in selected:
+        results['startup'] = bench_startup(repeat)
+
+    report = {'environment': environment(), 'results': results}
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"结果已写入 {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    empty = empty_cases(results)
+    for key in empty:
+        print(f"未解析出任何条目: {key}", file=sys.stderr)
+    mismatched = mismatched_cases(results)
+    for key in mismatched:
+        print(f"流式抓取与整页解析结果不一致: fetch_parse.{key}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for key, old, new, ratio in regressions:
+            print(f"性能退化: {key} {old:.2f}ms -> {new:.2f}ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("未发现超过阈值的性能退化", file=sys.stderr)
+    if empty or mismatched:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
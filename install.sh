@@ -57,11 +57,14 @@ echo "安装插件文件..."
 mkdir -p "$INSTALL_DIR"
 cp "$SOURCE_DIR/news_service.py" "$INSTALL_DIR/"
 cp "$SOURCE_DIR/status_line.sh" "$INSTALL_DIR/"
+cp "$SOURCE_DIR/status_line_biga.sh" "$INSTALL_DIR/"
+cp "$SOURCE_DIR/status_line_common.sh" "$INSTALL_DIR/"
 cp "$SOURCE_DIR/news_sources_config.json" "$INSTALL_DIR/"
 
 # 设置权限
 chmod +x "$INSTALL_DIR/news_service.py"
 chmod +x "$INSTALL_DIR/status_line.sh"
+chmod +x "$INSTALL_DIR/status_line_biga.sh"
 
 # 配置 Claude Code
 echo "配置 Claude Code..."
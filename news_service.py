@@ -4,32 +4,647 @@
 移除未使用的翻译功能，保持核心新闻聚合和显示功能
 """
 
-import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import json
 import threading
 import logging
+import logging.handlers
+import queue
+import argparse
+import atexit
+import codecs
+import contextlib
+import hashlib
+import gzip
 import signal
 import sys
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Union
+from datetime import date, datetime, timedelta, time as dt_time
+from typing import List, Dict, Optional, Union, Iterator, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from html.parser import HTMLParser
 import urllib.parse
 import re
+from collections import deque, Counter
+import itertools
+import heapq
+import bisect
+import struct
+import math
+import tempfile
+import copy
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/news_service.log'),
-        logging.StreamHandler()
-    ]
+# requests、bs4、soupsieve 导入较慢，在首次抓取或解析时才导入，
+# 已有实例运行时新进程可以在毫秒级内退出
+
+# 默认配置文件路径
+NEWS_SOURCES_CONFIG_FILE = os.path.expanduser('~/.claude/news_sources_config.json')
+
+# 状态栏脚本的显示配置，快照发布时按同样的配置渲染
+STATUSLINE_CONFIG_FILE = os.path.expanduser('~/.claude/news_statusline_config.json')
+
+# 历史归档目录，设置 NEWS_SERVICE_ARCHIVE_DIR 为空可关闭归档；NEWS_SERVICE_ARCHIVE_DAYS 为保留天数（默认30，0为不限）
+NEWS_ARCHIVE_DIR = os.path.expanduser(os.getenv('NEWS_SERVICE_ARCHIVE_DIR', '~/.claude/news_archive'))
+
+# 日志：各组件使用 news_service 的子记录器，可分别设置级别
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+logger = logging.getLogger('news_service')
+biga_logger = logger.getChild('biga')
+pool_logger = logger.getChild('pool')
+api_logger = logger.getChild('api')
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+class RateLimitFilter(logging.Filter):
+    """按调用位置限流：同一行日志在窗口内最多输出 burst 条，WARNING 及以上不限流"""
+
+    def __init__(self, burst: int = 10, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[tuple, list] = {}  # 调用位置 -> [窗口起点, 已输出, 已抑制]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._counters.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._counters[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (上一窗口内已抑制 {suppressed} 条同类日志)"
+                    record.args = None
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """队列满时直接丢弃日志，保证调用线程永不阻塞"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def load_logging_config() -> Dict:
+    """读取日志配置：配置文件的 logging 段，环境变量优先"""
+    config = {
+        'file': '/tmp/news_service.log',
+        'level': 'INFO',
+        'levels': {},
+        'max_bytes': 10 * 1024 * 1024,
+        'backup_count': 5,
+        'rotate_when': None,  # 设置后按时间轮转，如 "midnight"、"H"
+        'queue_size': 10000,
+        'rate_limit_burst': 10,
+        'rate_limit_window': 60,
+    }
+
+    try:
+        if os.path.exists(NEWS_SOURCES_CONFIG_FILE):
+            with open(NEWS_SOURCES_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config.update(json.load(f).get('logging', {}))
+    except Exception as e:
+        print(f"读取日志配置失败: {e}，使用默认配置", file=sys.stderr)
+
+    env_map = {
+        'NEWS_SERVICE_LOG_FILE': ('file', str),
+        'NEWS_SERVICE_LOG_LEVEL': ('level', str),
+        'NEWS_SERVICE_LOG_MAX_BYTES': ('max_bytes', int),
+        'NEWS_SERVICE_LOG_BACKUPS': ('backup_count', int),
+        'NEWS_SERVICE_LOG_ROTATE_WHEN': ('rotate_when', str),
+        'NEWS_SERVICE_LOG_RATE_LIMIT': ('rate_limit_burst', int),
+    }
+    for env_name, (key, cast) in env_map.items():
+        value = os.getenv(env_name)
+        if value:
+            try:
+                config[key] = cast(value)
+            except ValueError:
+                print(f"环境变量 {env_name} 无效: {value}", file=sys.stderr)
+
+    # 格式: NEWS_SERVICE_LOG_LEVELS="biga=WARNING,pool=DEBUG"
+    levels = dict(config.get('levels') or {})
+    for pair in os.getenv('NEWS_SERVICE_LOG_LEVELS', '').split(','):
+        if '=' in pair:
+            name, level = pair.split('=', 1)
+            levels[name.strip()] = level.strip()
+    config['levels'] = levels
+    return config
+
+def _parse_log_level(value, where: str, invalid: List[Tuple[str, object]]) -> int:
+    """把配置中的日志级别（名称或数字）转换为 logging 级别，无效时记入 invalid 并返回 INFO"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if str(value).strip().isdigit():
+        return int(str(value).strip())
+    level = logging.getLevelName(str(value).strip().upper())
+    if isinstance(level, int):
+        return level
+    invalid.append((where, value))
+    return logging.INFO
+
+def setup_logging(config: Optional[Dict] = None) -> logging.handlers.QueueListener:
+    """配置异步日志：调用线程只入队，后台线程负责写入可轮转的日志文件"""
+    global _log_listener
+    config = config or load_logging_config()
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    if config.get('rotate_when'):
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            config['file'], when=config['rotate_when'],
+            backupCount=config['backup_count'], encoding='utf-8'
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            config['file'], maxBytes=config['max_bytes'],
+            backupCount=config['backup_count'], encoding='utf-8'
+        )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=config['queue_size']))
+    queue_handler.addFilter(RateLimitFilter(config['rate_limit_burst'], config['rate_limit_window']))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    invalid = []
+    root.setLevel(_parse_log_level(config['level'], 'level', invalid))
+    for name, level in config['levels'].items():
+        if name != 'news_service' and not name.startswith('news_service.'):
+            name = f"news_service.{name}"
+        logging.getLogger(name).setLevel(_parse_log_level(level, f"levels.{name}", invalid))
+
+    _log_listener = logging.handlers.QueueListener(
+        queue_handler.queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    for where, value in invalid:
+        logging.getLogger('news_service').warning(f"无效的日志级别 {where}={value!r}，已改用 INFO")
+    atexit.register(shutdown_logging)
+    return _log_listener
+
+def shutdown_logging():
+    """停止后台日志线程并写完队列中剩余的日志"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+class UpstreamRecorder:
+    """录制上游原始响应：响应体按主机分目录保存，元数据追加到 index.jsonl"""
+
+    # 响应体已由 requests 解压，回放时这些头不再成立
+    SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, url: str, response: 'requests.Response', total_seconds: float):
+        try:
+            parsed = urllib.parse.urlparse(url)
+            digest = hashlib.sha1(url.encode('utf-8') + response.content).hexdigest()[:16]
+            body_path = os.path.join(parsed.netloc, f"{digest}.body")
+            entry = {
+                'url': url,
+                'status': response.status_code,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() not in self.SKIP_HEADERS},
+                'body': body_path,
+                'bytes': len(response.content),
+                'ttfb_ms': round(response.elapsed.total_seconds() * 1000, 1),
+                'elapsed_ms': round(total_seconds * 1000, 1),
+                'recorded_at': datetime.now().isoformat(),
+            }
+            with self.lock:
+                os.makedirs(os.path.join(self.directory, parsed.netloc), exist_ok=True)
+                with open(os.path.join(self.directory, body_path), 'wb') as f:
+                    f.write(response.content)
+                with open(os.path.join(self.directory, 'index.jsonl'), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except Exception as e:
+            logger.warning(f"录制上游响应失败 {url}: {e}")
+
+def _parse_upstream_hosts(value: str) -> Dict[str, str]:
+    """解析 "host=base,host2=base2" 格式的上游地址覆盖"""
+    hosts = {}
+    for pair in value.split(','):
+        if '=' in pair:
+            host, base = pair.split('=', 1)
+            hosts[host.strip()] = base.strip().rstrip('/')
+    return hosts
+
+# 上游地址覆盖：NEWS_SERVICE_UPSTREAM 把所有上游请求转发到 <base>/<原主机><原路径>，
+# NEWS_SERVICE_UPSTREAM_HOSTS 按主机单独替换为 <base><原路径>，后者优先
+UPSTREAM_BASE = os.getenv('NEWS_SERVICE_UPSTREAM', '').rstrip('/')
+UPSTREAM_HOSTS = _parse_upstream_hosts(os.getenv('NEWS_SERVICE_UPSTREAM_HOSTS', ''))
+_upstream_recorder = UpstreamRecorder(os.getenv('NEWS_SERVICE_RECORD_DIR')) if os.getenv('NEWS_SERVICE_RECORD_DIR') else None
+
+def resolve_upstream_url(url: str) -> str:
+    """按覆盖配置改写上游URL，未配置时原样返回"""
+    if not UPSTREAM_BASE and not UPSTREAM_HOSTS:
+        return url
+    parsed = urllib.parse.urlparse(url)
+    rest = urllib.parse.urlunparse(('', '', parsed.path or '/', parsed.params, parsed.query, ''))
+    if parsed.netloc in UPSTREAM_HOSTS:
+        return f"{UPSTREAM_HOSTS[parsed.netloc]}{rest}"
+    if UPSTREAM_BASE:
+        return f"{UPSTREAM_BASE}/{parsed.netloc}{rest}"
+    return url
+
+class RefreshTracer:
+    """刷新周期追踪：记录每轮刷新（新闻池刷新、大A各项更新）中各阶段的起止时间
+    
+    区间记在开始这一轮的线程上，不在任何一轮中的调用不记录，开销只有一次线程局部变量查找。
+    保留最近 max_cycles 轮，导出为 Chrome trace-event JSON（chrome://tracing、Perfetto 可直接打开），
+    区间按调用嵌套显示，逐层找耗时最长的子区间就是这一轮的关键路径。
+    """
+    MAX_EVENTS_PER_CYCLE = 5000
+    
+    def __init__(self, max_cycles: int = 20):
+        self.max_cycles = max_cycles
+        self.lock = threading.Lock()
+        self.cycles = deque(maxlen=max(1, max_cycles))
+        self.dropped_events = 0
+        self._local = threading.local()
+        # perf_counter 精度高但起点不定，导出时换算为墙钟时间，便于与日志对照
+        self._clock_offset = time.time() - time.perf_counter()
+    
+    @contextlib.contextmanager
+    def cycle(self, name: str, **args):
+        """一轮刷新，产出可追加参数的 dict；嵌套在另一轮中时按普通区间记录"""
+        if self.max_cycles <= 0 or getattr(self._local, 'events', None) is not None:
+            with self.span(name, **args) as span_args:
+                yield span_args
+            return
+        events = self._local.events = []
+        thread = threading.current_thread()
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = repr(e)
+            raise
+        finally:
+            end = time.perf_counter()
+            self._local.events = None
+            events.append((name, start, end, args))
+            with self.lock:
+                self.cycles.append({'name': name, 'thread': thread.name, 'tid': thread.native_id,
+                                    'start': start, 'end': end, 'events': events})
+    
+    @contextlib.contextmanager
+    def span(self, name: str, **args):
+        """一轮中的一个阶段，产出可追加参数的 dict"""
+        events = getattr(self._local, 'events', None)
+        if events is None:
+            yield args
+            return
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = repr(e)
+            raise
+        finally:
+            self._append(events, name, start, time.perf_counter(), args)
+    
+    def record(self, name: str, start: float, end: Optional[float] = None, **args):
+        """补记已经结束的区间（start/end 取自 time.perf_counter()，end 默认为现在）"""
+        events = getattr(self._local, 'events', None)
+        if events is not None:
+            self._append(events, name, start, time.perf_counter() if end is None else end, args)
+    
+    def _append(self, events: list, name: str, start: float, end: float, args: Dict):
+        if len(events) >= self.MAX_EVENTS_PER_CYCLE:
+            with self.lock:
+                self.dropped_events += 1
+            return
+        events.append((name, start, end, args))
+    
+    def _recent(self, limit: Optional[int] = None, min_ms: float = 0.0, name: Optional[str] = None) -> List[Dict]:
+        with self.lock:
+            cycles = list(self.cycles)
+        cycles = [cycle for cycle in cycles
+                  if (cycle['end'] - cycle['start']) * 1000 >= min_ms and name in (None, cycle['name'])]
+        return cycles[-limit:] if limit else cycles
+    
+    def export(self, limit: Optional[int] = None, min_ms: float = 0.0, name: Optional[str] = None) -> Dict:
+        """最近的各轮（可按耗时下限、名称过滤）导出为 Chrome trace-event JSON"""
+        pid = os.getpid()
+        trace_events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'news_service'}}]
+        threads = {}
+        for cycle in self._recent(limit, min_ms, name):
+            threads[cycle['tid']] = cycle['thread']
+            for event_name, start, end, args in cycle['events']:
+                event = {'name': event_name, 'cat': cycle['name'], 'ph': 'X', 'pid': pid, 'tid': cycle['tid'],
+                         'ts': round((start + self._clock_offset) * 1e6, 1), 'dur': round((end - start) * 1e6, 1)}
+                if args:
+                    event['args'] = args
+                trace_events.append(event)
+        for tid, thread_name in threads.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+    
+    def summary(self, limit: Optional[int] = None, min_ms: float = 0.0, name: Optional[str] = None) -> List[Dict]:
+        """最近各轮的概要：开始时间、总耗时和耗时最长的几个阶段"""
+        result = []
+        for cycle in self._recent(limit, min_ms, name):
+            spans = sorted(cycle['events'][:-1], key=lambda event: event[1] - event[2])[:5]
+            result.append({
+                'name': cycle['name'],
+                'thread': cycle['thread'],
+                'started_at': datetime.fromtimestamp(cycle['start'] + self._clock_offset).isoformat(),
+                'duration_ms': round((cycle['end'] - cycle['start']) * 1000, 1),
+                'spans': len(cycle['events']) - 1,
+                'slowest': [{'name': event[0], 'ms': round((event[2] - event[1]) * 1000, 1), **event[3]}
+                            for event in spans]
+            })
+        return result
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {'max_cycles': self.max_cycles, 'cycles': len(self.cycles) if self.max_cycles > 0 else 0,
+                    'dropped_events': self.dropped_events}
+
+# 刷新追踪：NEWS_SERVICE_TRACE_CYCLES 为保留的最近轮数（0 关闭），通过 /debug/trace 导出
+refresh_tracer = RefreshTracer(max_cycles=int(os.getenv('NEWS_SERVICE_TRACE_CYCLES', '20')))
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积攒 burst 个；令牌不足时按预约顺序等待"""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """取一个令牌，返回为此等待的秒数"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class FetchFlight:
+    """一次进行中的下载，同一 URL 后到的请求等待并共享它的结果"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error: Optional[Exception] = None
+
+class UpstreamFetcher:
+    """共享的上游抓取层：按 URL 合并并发请求、在新鲜期内复用响应，并按主机用令牌桶限制请求速率
+    
+    新闻池和大A数据池各自的定时器、详情页补全都经由这里，同一页面只下载一次。
+    只缓存 200 响应；每个调用方拿到响应的浅拷贝（正文共享），可以各自设置 encoding。
+    流式读取同样登记为进行中的下载；提前结束的流式读取只缓存已读到的前缀，供后续流式读取复用，
+    需要完整响应的调用方会重新下载。
+    """
+    def __init__(self, freshness: float = 10.0, host_rate: float = 5.0, host_burst: int = 20):
+        self.freshness = freshness
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, 'requests.Response']] = {}
+        self._prefixes: Dict[str, Tuple[float, bytes]] = {}  # 提前结束的流式读取已读到的前缀
+        self._flights: Dict[str, FetchFlight] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats = {'downloads': 0, 'shared': 0, 'cached': 0, 'throttled': 0, 'throttle_seconds': 0.0,
+                      'streams': 0, 'stream_early_stops': 0, 'stream_truncated': 0, 'streamed_bytes': 0}
+    
+    def _claim(self, url: str, prefix_beyond: Optional[int] = None) -> Tuple[str, object]:
+        """查找可复用的结果，返回 ('cached', 响应)、('prefix', 前缀字节)、('wait', 进行中的下载)
+        或 ('lead', 新登记的下载)；prefix_beyond 不为 None 时接受长于该值的新鲜前缀（需持有 self.lock）"""
+        now = time.monotonic()
+        cached = self._cache.get(url)
+        if cached and now - cached[0] < self.freshness:
+            self.stats['cached'] += 1
+            refresh_tracer.record('cached response', time.perf_counter(), url=url)
+            return 'cached', cached[1]
+        prefix = self._prefixes.get(url)
+        if prefix_beyond is not None and prefix and now - prefix[0] < self.freshness and len(prefix[1]) > prefix_beyond:
+            self.stats['cached'] += 1
+            refresh_tracer.record('cached prefix', time.perf_counter(), url=url, bytes=len(prefix[1]))
+            return 'prefix', prefix[1]
+        flight = self._flights.get(url)
+        if flight is not None:
+            self.stats['shared'] += 1
+            return 'wait', flight
+        flight = self._flights[url] = FetchFlight()
+        return 'lead', flight
+    
+    def _expire(self, now: float):
+        """清理过期的缓存（需持有 self.lock）"""
+        for cache in (self._cache, self._prefixes):
+            for key in [key for key, (fetched, _) in cache.items() if now - fetched >= self.freshness]:
+                del cache[key]
+    
+    def get(self, url: str, download) -> 'requests.Response':
+        """获取 url 的响应，需要下载时调用 download()"""
+        while True:
+            with self.lock:
+                kind, value = self._claim(url)
+            if kind == 'cached':
+                return copy.copy(value)
+            if kind == 'lead':
+                flight = value
+                break
+            with refresh_tracer.span('wait in-flight download', url=url):
+                value.done.wait()
+            if value.error is not None:
+                raise value.error
+            if value.response is not None:
+                return copy.copy(value.response)
+            # 进行中的是提前结束的流式读取，没有完整响应，重新查找或自己下载
+        
+        try:
+            self._throttle(urllib.parse.urlparse(url).netloc)
+            flight.response = download()
+            return copy.copy(flight.response)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self._flights.pop(url, None)
+                self.stats['downloads'] += 1
+                if flight.response is not None and flight.response.status_code == 200 and self.freshness > 0:
+                    now = time.monotonic()
+                    self._expire(now)
+                    self._cache[url] = (now, flight.response)
+            flight.done.set()
+    
+    def stream(self, url: str, open_stream, max_bytes: int) -> Iterator[bytes]:
+        """流式下载：逐块产出新读到的字节，调用方满足后关闭生成器即停止读取并断开连接
+        
+        最多读取 max_bytes 字节，超出部分截断。新鲜期内的完整响应、进行中的下载和提前结束的
+        流式读取留下的前缀都会复用；调用方读完复用的前缀仍要继续时，重新下载并跳过已产出的部分。
+        """
+        sent = 0
+        while True:
+            with self.lock:
+                kind, value = self._claim(url, prefix_beyond=sent)
+            if kind == 'cached':
+                content = value.content[:max_bytes]
+                if len(content) > sent:
+                    yield content[sent:]
+                return
+            if kind == 'prefix':
+                yield value[sent:max_bytes]
+                sent = min(len(value), max_bytes)
+                if sent >= max_bytes:
+                    return
+                continue
+            if kind == 'lead':
+                flight = value
+                break
+            with refresh_tracer.span('wait in-flight download', url=url):
+                value.done.wait()
+            if value.error is not None:
+                raise value.error
+        
+        body = bytearray()
+        complete = False
+        early_stop = False
+        response = None
+        start = time.perf_counter()
+        try:
+            self._throttle(urllib.parse.urlparse(url).netloc)
+            response = open_stream()
+            refresh_tracer.record('connect/ttfb', start, url=url, status=response.status_code)
+            start = time.perf_counter()
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                body += chunk
+                if len(body) >= max_bytes:
+                    del body[max_bytes:]
+                    with self.lock:
+                        self.stats['stream_truncated'] += 1
+                    logger.warning(f"上游响应超过 {max_bytes} 字节，已截断: {url}")
+                    break
+                if len(body) > sent:
+                    early_stop = True
+                    yield bytes(body[sent:])
+                    early_stop = False
+                    sent = len(body)
+            else:
+                complete = True
+                response._content = bytes(body)
+                response._content_consumed = True
+                flight.response = response
+            if len(body) > sent:
+                yield bytes(body[sent:])
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            if response is not None:
+                response.close()
+                refresh_tracer.record('body', start, bytes=len(body), streamed=True)
+            with self.lock:
+                self._flights.pop(url, None)
+                self.stats['downloads'] += 1
+                self.stats['streams'] += 1
+                self.stats['streamed_bytes'] += len(body)
+                if early_stop:
+                    self.stats['stream_early_stops'] += 1
+                if flight.error is None and self.freshness > 0 and body:
+                    now = time.monotonic()
+                    self._expire(now)
+                    if complete:
+                        self._cache[url] = (now, response)
+                    else:
+                        self._prefixes[url] = (now, bytes(body))
+            flight.done.set()
+    
+    def _throttle(self, host: str):
+        if self.host_rate <= 0:
+            return
+        with self.lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        start = time.perf_counter()
+        waited = bucket.acquire()
+        if waited > 0:
+            refresh_tracer.record('throttle', start, host=host)
+            with self.lock:
+                self.stats['throttled'] += 1
+                self.stats['throttle_seconds'] += waited
+            logger.debug(f"上游 {host} 请求限速，等待 {waited:.2f}s")
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats['throttle_seconds'] = round(stats['throttle_seconds'], 3)
+            stats['cached_urls'] = len(self._cache)
+            return stats
+
+# 共享抓取：NEWS_SERVICE_FETCH_FRESHNESS 为响应复用的新鲜期（秒，0 关闭），
+# NEWS_SERVICE_HOST_RATE / NEWS_SERVICE_HOST_BURST 为每个上游主机的请求速率（次/秒，0 不限）和突发量
+upstream_fetcher = UpstreamFetcher(
+    freshness=float(os.getenv('NEWS_SERVICE_FETCH_FRESHNESS', '10')),
+    host_rate=float(os.getenv('NEWS_SERVICE_HOST_RATE', '5')),
+    host_burst=int(os.getenv('NEWS_SERVICE_HOST_BURST', '20'))
 )
-logger = logging.getLogger(__name__)
+
+def _download(url: str, **kwargs) -> 'requests.Response':
+    import requests
+    with refresh_tracer.span('GET', url=url) as trace_args:
+        start = time.perf_counter()
+        # 先只等响应头，正文单独读取，追踪时可区分连接/首字节和下载正文
+        response = requests.get(resolve_upstream_url(url), stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        refresh_tracer.record('connect/ttfb', start, headers_at)
+        content = response.content  # 读完正文
+        refresh_tracer.record('body', headers_at, bytes=len(content))
+        trace_args['status'] = response.status_code
+    if _upstream_recorder is not None:
+        _upstream_recorder.record(url, response, time.perf_counter() - start)
+    return response
+
+def http_get(url: str, params: Optional[Dict] = None, **kwargs) -> 'requests.Response':
+    """所有上游请求的统一入口：处理地址覆盖、录制模式，并经由共享抓取层去重和限速"""
+    import requests
+    if params:
+        url = requests.Request('GET', url, params=params).prepare().url
+    return upstream_fetcher.get(url, lambda: _download(url, **kwargs))
+
+def http_stream(url: str, max_bytes: int, **kwargs) -> Iterator[bytes]:
+    """流式版本的 http_get，见 UpstreamFetcher.stream；录制模式下总是完整下载"""
+    if _upstream_recorder is not None:
+        response = http_get(url, **kwargs)
+        response.raise_for_status()
+        yield response.content[:max_bytes]
+        return
+    import requests
+    yield from upstream_fetcher.stream(
+        url, lambda: requests.get(resolve_upstream_url(url), stream=True, **kwargs), max_bytes)
 
 class NewsItem:
     """新闻项数据结构"""
@@ -41,6 +656,7 @@ class NewsItem:
         self.stock_info = stock_info  # 相关股票信息
         self.timestamp = datetime.now()  # 抓取时间
         self.id = f"{source}_{hash(title)}_{int(self.timestamp.timestamp())}"
+        self.duplicates: List['NewsItem'] = []  # 合并进来的其他来源的近似重复条目
     
     def to_dict(self) -> Dict:
         result = {
@@ -56,8 +672,23 @@ class NewsItem:
             result['news_time'] = self.news_time
         if self.stock_info:
             result['stock_info'] = self.stock_info
+        if self.duplicates:
+            result['sources'] = list(dict.fromkeys([self.source] + [dup.source for dup in self.duplicates]))
+            result['duplicates'] = [{'title': dup.title, 'url': dup.url, 'source': dup.source}
+                                    for dup in self.duplicates]
             
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NewsItem':
+        """由 to_dict 的结果还原（保留原抓取时间和 id），用于副本同步"""
+        item = cls(data['title'], data['url'], data.get('source', ''),
+                   data.get('news_time'), data.get('stock_info'))
+        item.timestamp = datetime.fromisoformat(data['timestamp'])
+        item.id = data.get('id', item.id)
+        item.duplicates = [cls(dup['title'], dup.get('url', ''), dup.get('source', ''))
+                           for dup in data.get('duplicates', [])]
+        return item
 
 class StockIndex:
     """股指数据结构"""
@@ -78,6 +709,12 @@ class StockIndex:
             'change_percent': self.change_percent,
             'timestamp': self.timestamp.isoformat()
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StockIndex':
+        index = cls(data['name'], data['code'], data['current_price'], data['change'], data['change_percent'])
+        index.timestamp = datetime.fromisoformat(data['timestamp'])
+        return index
 
 class SectorData:
     """板块数据结构"""
@@ -94,14 +731,1448 @@ class SectorData:
             'sector_type': self.sector_type,
             'timestamp': self.timestamp.isoformat()
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SectorData':
+        sector = cls(data['name'], data['change_percent'], data.get('sector_type', 'gainer'))
+        sector.timestamp = datetime.fromisoformat(data['timestamp'])
+        return sector
+
+_TELEGRAPH_TIME_RE = re.compile(r'^\d{1,2}:\d{2}:\d{2}$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _decode_html(content: Union[str, bytes]) -> str:
+    """将响应体解码为文本，优先UTF-8，失败时回退GB18030"""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('gb18030', errors='replace')
+
+class TelegraphPageParser(HTMLParser):
+    """财联社电报页单遍解析器
+
+    基于事件流一次扫描整个文档，不构建DOM树。每个 telegraph-content-box
+    块产出 (时间, 标题, 链接, 股票信息) 元组；块之后、下一个块之前出现的
+    第一个 industry-stock 容器归属于该块。
+    """
+
+    def __init__(self, max_blocks: Optional[int] = None, base_url: str = 'https://www.cls.cn'):
+        super().__init__(convert_charrefs=True)
+        self.max_blocks = max_blocks
+        self.base_url = base_url
+        self.items = deque()
+        self.done = False
+        self._block_count = 0
+        self._block = None
+        self._div_depth = 0
+        self._block_depth = 0
+        self._title_depth = 0
+        self._stock_depth = 0
+        self._stock_links = 0
+        self._span_depth = 0
+        self._time_span_depth = 0
+        self._stock_span = None
+        self._stock_span_depth = 0
+        self._stock_link = None
+        self._captures = []
+        self._skip_data = 0
+
+    @staticmethod
+    def _classes(attrs) -> List[str]:
+        for name, value in attrs:
+            if name == 'class' and value:
+                return value.split()
+        return []
+
+    def _start_block(self):
+        self._finish_block()
+        self._block_count += 1
+        if self.max_blocks is not None and self._block_count > self.max_blocks:
+            self.done = True
+            return
+        self._block = {'time_parts': None, 'title_parts': None, 'url': None, 'stocks': None}
+        self._block_depth = self._div_depth
+
+    def _finish_block(self):
+        block = self._block
+        self._block = None
+        self._captures = []
+        self._title_depth = 0
+        self._stock_depth = 0
+        self._time_span_depth = 0
+        self._stock_span = None
+        self._stock_link = None
+        if not block or block['time_parts'] is None:
+            return
+
+        time_text = ''.join(block['time_parts'])
+        if not _TELEGRAPH_TIME_RE.match(time_text):
+            return
+        title = _WHITESPACE_RE.sub(' ', ''.join(block['title_parts'] or [])).strip()
+        if len(title) <= 10:
+            return
+
+        url = block['url'] or ''
+        if url and not url.startswith('http'):
+            url = f"{self.base_url}{url}"
+        stocks = block['stocks']
+        stock_info = ' '.join(stocks) if stocks else None
+        self.items.append((time_text, title, url, stock_info))
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in ('script', 'style'):
+            self._skip_data += 1
+            return
+
+        if tag == 'div':
+            self._div_depth += 1
+            classes = self._classes(attrs)
+            if any('telegraph-content-box' in c for c in classes):
+                self._start_block()
+                return
+            block = self._block
+            if block is None:
+                return
+            if block['title_parts'] is None and self._block_depth and self._div_depth > self._block_depth:
+                block['title_parts'] = []
+                self._title_depth = self._div_depth
+                self._captures.append(block['title_parts'])
+            if block['stocks'] is None and 'industry-stock' in classes:
+                block['stocks'] = []
+                self._stock_depth = self._div_depth
+                self._stock_links = 0
+        elif tag == 'span':
+            self._span_depth += 1
+            block = self._block
+            if block is None:
+                return
+            classes = self._classes(attrs)
+            if self._block_depth and block['time_parts'] is None and 'telegraph-time-box' in classes:
+                block['time_parts'] = []
+                self._time_span_depth = self._span_depth
+                self._captures.append(block['time_parts'])
+            link = self._stock_link
+            if link is not None and self._stock_span is None:
+                for key, cls in (('name', 'c-222'), ('change', 'c-de0422')):
+                    if link[key] is None and cls in classes:
+                        link[key] = []
+                        self._stock_span = link[key]
+                        self._stock_span_depth = self._span_depth
+                        self._captures.append(link[key])
+                        break
+        elif tag == 'a':
+            block = self._block
+            if block is None:
+                return
+            if self._block_depth and block['url'] is None:
+                block['url'] = dict(attrs).get('href') or ''
+            if self._stock_depth and self._stock_links < 3:
+                # 每个电报最多取前3个股票链接
+                self._stock_links += 1
+                self._stock_link = {'name': None, 'change': None}
+
+    def _stop_capture(self, parts):
+        self._captures = [p for p in self._captures if p is not parts]
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in ('script', 'style'):
+            self._skip_data = max(0, self._skip_data - 1)
+            return
+
+        if tag == 'div':
+            if self._title_depth and self._div_depth == self._title_depth:
+                self._stop_capture(self._block['title_parts'])
+                self._title_depth = 0
+            if self._stock_depth and self._div_depth == self._stock_depth:
+                self._stock_depth = 0
+                self._stock_link = None
+            if self._block_depth and self._div_depth == self._block_depth:
+                # 块已结束，等待后续的 industry-stock 容器
+                self._block_depth = 0
+            self._div_depth = max(0, self._div_depth - 1)
+        elif tag == 'span':
+            if self._time_span_depth and self._span_depth == self._time_span_depth:
+                self._stop_capture(self._block['time_parts'])
+                self._time_span_depth = 0
+            if self._stock_span is not None and self._span_depth == self._stock_span_depth:
+                self._stop_capture(self._stock_span)
+                self._stock_span = None
+            self._span_depth = max(0, self._span_depth - 1)
+        elif tag == 'a':
+            link = self._stock_link
+            if link is not None:
+                if self._stock_span is not None:
+                    self._stop_capture(self._stock_span)
+                    self._stock_span = None
+                if link['name'] is not None and link['change'] is not None:
+                    self._block['stocks'].append(f"{''.join(link['name'])} {''.join(link['change'])}")
+                self._stock_link = None
+
+    def handle_data(self, data):
+        if self.done or self._skip_data or not self._captures:
+            return
+        text = data.strip()
+        if text:
+            for parts in self._captures:
+                parts.append(text)
+
+    def close(self):
+        super().close()
+        if not self.done:
+            self._finish_block()
+
+def iter_telegraph_items(html: Union[str, bytes], max_blocks: Optional[int] = None,
+                         chunk_size: int = 65536) -> Iterator[Tuple[str, str, str, Optional[str]]]:
+    """单遍提取电报页面内容，逐条产出 (时间, 标题, 链接, 股票信息)
+
+    达到 max_blocks 个电报块后立即停止扫描剩余文档。
+    """
+    text = _decode_html(html)
+    parser = TelegraphPageParser(max_blocks=max_blocks)
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+        while parser.items:
+            yield parser.items.popleft()
+        if parser.done:
+            return
+    parser.close()
+    while parser.items:
+        yield parser.items.popleft()
+
+class ExtractionRule:
+    """单个新闻源的抽取规则：选择器在加载配置时编译一次，并统计各选择器的命中情况
+
+    上次产出条目的选择器排在最前尝试，其余按配置顺序，页面改版后不必每次都先跑一遍已失效的选择器。
+    上次命中的是靠后的兜底选择器（如 "a"）时，每 REPROBE_INTERVAL 次抓取按配置顺序重试一次，
+    页面恢复正常后优先选择器重新排回最前，不会一直停留在兜底选择器上。
+
+    可选配置项：
+    - min_title_length: 标题需超过的长度（默认10）
+    - url_pattern: 条目链接需匹配的正则
+    - max_items: 每次最多产出的条目数（默认20）
+    - stream: 是否流式抓取，够数后提前断开（默认 false，适合条目集中在开头的大页面）
+    - max_bytes: 最多读取的响应字节数（默认 5MB）
+    """
+
+    def __init__(self, source_config: Dict):
+        self.config = source_config
+        self.name = source_config['name']
+        self.min_title_length = int(source_config.get('min_title_length', 10))
+        pattern = source_config.get('url_pattern')
+        self.url_pattern = re.compile(pattern) if pattern else None
+        self.max_items = int(source_config.get('max_items', 20))
+        self.stream = bool(source_config.get('stream', False))
+        self.max_bytes = int(source_config.get('max_bytes', 5 * 1024 * 1024))
+
+        parsed_url = urllib.parse.urlparse(source_config['url'])
+        self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        import soupsieve
+        self.selectors = []
+        for selector in source_config.get('selectors', []):
+            try:
+                self.selectors.append((selector, soupsieve.compile(selector)))
+            except Exception as e:
+                pool_logger.warning(f"新闻源 {self.name} 的选择器 '{selector}' 无效: {e}")
+
+        self.lock = threading.Lock()
+        self.fetches = 0
+        self.misses = 0
+        self.preferred: Optional[int] = None  # 上次产出条目的选择器序号
+        self.last_selector: Optional[str] = None
+        self.last_hit: Optional[datetime] = None
+        self.selector_stats = {selector: {'attempts': 0, 'hits': 0, 'items': 0} for selector, _ in self.selectors}
+
+    REPROBE_INTERVAL = 10
+
+    def order(self) -> List[int]:
+        """选择器的尝试顺序：上次命中的选择器在前，其余按配置顺序（调用方持有 lock）"""
+        config_order = list(range(len(self.selectors)))
+        if not self.preferred or self.fetches % self.REPROBE_INTERVAL == 0:
+            return config_order
+        return [self.preferred] + [index for index in config_order if index != self.preferred]
+
+    def resolve_url(self, url: str) -> str:
+        if url and not url.startswith('http'):
+            if url.startswith('/'):
+                return f"{self.base_url}{url}"
+            return f"{self.config['url'].rstrip('/')}/{url}"
+        return url
+
+    def is_valid(self, title: str, url: str) -> bool:
+        if not title or len(title) <= self.min_title_length:
+            return False
+        if self.url_pattern is not None and not self.url_pattern.search(url or ''):
+            return False
+        return True
+
+    def select(self, soup: 'BeautifulSoup', order: List[int]) -> Tuple[List[Tuple[str, str, object]], List[Tuple[int, int]]]:
+        """按给定顺序尝试选择器，返回 (有效条目, 尝试记录 [(选择器序号, 条目数)])，不修改统计"""
+        attempts = []
+        for index in order:
+            _, compiled = self.selectors[index]
+            candidates = []
+            for element in compiled.select(soup):
+                if element.name == 'a':
+                    link = element
+                else:
+                    link = element.find('a')
+                title = (link or element).get_text(strip=True)
+                url = self.resolve_url(link.get('href', '') if link else '')
+                if self.is_valid(title, url):
+                    candidates.append((title, url, element))
+                    if len(candidates) >= self.max_items:
+                        break
+            attempts.append((index, len(candidates)))
+            if candidates:
+                return candidates, attempts
+        return [], attempts
+
+    def record(self, attempts: List[Tuple[int, int]]):
+        """记录一次抽取的选择器尝试结果"""
+        with self.lock:
+            self.fetches += 1
+            for index, count in attempts:
+                selector = self.selectors[index][0]
+                stats = self.selector_stats[selector]
+                stats['attempts'] += 1
+                if count:
+                    stats['hits'] += 1
+                    stats['items'] += count
+                    self.preferred = index
+                    self.last_selector = selector
+                    self.last_hit = datetime.now()
+                    pool_logger.debug(f"使用选择器 '{selector}' 得到 {count} 条有效新闻")
+            if not attempts or not attempts[-1][1]:
+                self.misses += 1
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            return {
+                'name': self.name,
+                'fetches': self.fetches,
+                'misses': self.misses,
+                'last_selector': self.last_selector,
+                'order': [self.selectors[index][0] for index in self.order()],
+                'last_hit': self.last_hit.isoformat() if self.last_hit else None,
+                'min_title_length': self.min_title_length,
+                'url_pattern': self.url_pattern.pattern if self.url_pattern else None,
+                'selectors': {selector: dict(stats) for selector, stats in self.selector_stats.items()},
+            }
+
+class LinkCounter(HTMLParser):
+    """流式抓取时的增量扫描：逐块喂入页面，统计通过新闻源校验规则（标题长度、链接格式）的 <a> 数
+
+    只用来判断何时可以停止下载，不构建 DOM。按 UTF-8 增量解码，其他编码的页面标题长度
+    只是近似值，链接格式的判断不受影响。
+    """
+
+    def __init__(self, rule: ExtractionRule):
+        super().__init__(convert_charrefs=True)
+        self.rule = rule
+        self.count = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+
+    def feed_bytes(self, chunk: bytes) -> int:
+        """喂入一块原始字节，返回目前为止的有效链接数"""
+        self.feed(self._decoder.decode(chunk))
+        return self.count
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self._href = dict(attrs).get('href') or ''
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._href is not None:
+            # 与 get_text(strip=True) 相同：各段文本去掉首尾空白后拼接
+            title = ''.join(self._text)
+            if self.rule.is_valid(title, self.rule.resolve_url(self._href)):
+                self.count += 1
+            self._href = None
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data.strip())
+
+def extract_telegraph_page_data(soup: 'BeautifulSoup') -> Dict:
+    """从电报页面提取时间和股票信息"""
+    result = {'news_time': None, 'stock_info': None}
+    
+    try:
+        # 提取时间信息
+        time_element = soup.find('span', class_='telegraph-time-box')
+        if time_element:
+            time_text = time_element.get_text(strip=True)
+            if time_text and ':' in time_text:
+                # 格式化时间（添加今天的日期）
+                today = datetime.now().strftime('%Y-%m-%d')
+                result['news_time'] = f"{today} {time_text}"
+        
+        # 提取股票信息
+        stock_container = soup.find('div', class_='industry-stock')
+        if stock_container:
+            stock_items = []
+            stock_links = stock_container.find_all('a')
+            for link in stock_links[:5]:  # 最多5只股票
+                name_span = link.find('span', class_='c-222')
+                change_span = link.find('span', class_='c-de0422')
+                if name_span and change_span:
+                    name = name_span.get_text(strip=True)
+                    change = change_span.get_text(strip=True)
+                    stock_items.append(f"{name} {change}")
+            
+            if stock_items:
+                result['stock_info'] = ' '.join(stock_items)
+                
+    except Exception as e:
+        pool_logger.debug(f"从电报页面提取数据错误: {e}")
+        
+    return result
+
+def parse_detail_page(content: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """解析财联社详情页，返回 (发布时间, 股票信息)"""
+    from bs4 import BeautifulSoup
+    news_time = None
+    stock_info = None
+    detail_soup = BeautifulSoup(content, 'html.parser')
+    
+    # 提取时间信息 - 财联社详情页的时间格式
+    # 查找可能的时间元素
+    time_selectors = [
+        '.time',
+        '.publish-time',
+        '[class*="time"]',
+        '.article-time',
+        'time'
+    ]
+    
+    for selector in time_selectors:
+        time_element = detail_soup.select_one(selector)
+        if time_element:
+            time_text = time_element.get_text(strip=True)
+            if time_text and ('年' in time_text or '月' in time_text or ':' in time_text):
+                news_time = time_text
+                break
+    
+    # 提取股票信息 - 查找股票相关元素
+    stock_selectors = [
+        '.industry-stock a',
+        '[class*="stock"] a',
+        'a[href*="stock"]'
+    ]
+    
+    for selector in stock_selectors:
+        stock_elements = detail_soup.select(selector)
+        if stock_elements:
+            stock_items = []
+            for elem in stock_elements[:5]:  # 最多5只股票
+                name_span = elem.find('span', class_='c-222') or elem.find('span')
+                change_span = elem.find('span', class_='c-de0422') or elem.find_all('span')[-1] if elem.find_all('span') else None
+                
+                if name_span and change_span:
+                    name = name_span.get_text(strip=True)
+                    change = change_span.get_text(strip=True)
+                    if '+' in change or '-' in change or '%' in change:
+                        stock_items.append(f"{name} {change}")
+            
+            if stock_items:
+                stock_info = ' '.join(stock_items)
+                break
+    
+    return news_time, stock_info
+
+_page_rules: Dict[str, ExtractionRule] = {}  # 按配置缓存的抽取规则，主进程内即 NewsPool 编译的同一份
+
+def _page_rule_key(source_config: Dict) -> str:
+    return json.dumps(source_config, sort_keys=True, ensure_ascii=False)
+
+def share_page_rule(rule: ExtractionRule):
+    """让本进程内的 parse_source_page 直接使用已编译的规则，不再重复编译选择器"""
+    if len(_page_rules) >= 64:
+        _page_rules.clear()
+    _page_rules[_page_rule_key(rule.config)] = rule
+
+def parse_source_page(content: bytes, source_config: Dict,
+                      order: List[int]) -> Tuple[List[Tuple], List[Tuple[int, int]]]:
+    """解析新闻源页面，返回 ([(标题, 链接, 发布时间, 股票信息)], 选择器尝试记录)
+
+    财联社详情页链接的时间和股票信息需要另行抓取，这里留空。
+    """
+    from bs4 import BeautifulSoup
+    rule = _page_rules.get(_page_rule_key(source_config))
+    if rule is None:
+        # 解析进程池中的子进程拿不到主进程的规则，在子进程内编译一次后缓存
+        rule = ExtractionRule(source_config)
+        share_page_rule(rule)
+
+    soup = BeautifulSoup(content, 'html.parser')
+    candidates, attempts = rule.select(soup, order)
+    is_cls = "财联社" in source_config['name']
+    page_data = None
+    items = []
+    for title, url, _ in candidates:
+        news_time = None
+        stock_info = None
+        if is_cls and url and '/detail/' not in url and 'telegraph' in url:
+            # 电报页面的时间和股票信息直接从当前页面提取
+            if page_data is None:
+                page_data = extract_telegraph_page_data(soup)
+            news_time = page_data['news_time']
+            stock_info = page_data['stock_info']
+        items.append((title, url, news_time, stock_info))
+    return items, attempts
+
+def parse_telegraph_page(content: bytes, max_blocks: int) -> List[Tuple[str, str, str, Optional[str]]]:
+    """解析电报页面，返回 [(时间, 标题, 链接, 股票信息)]"""
+    return list(iter_telegraph_items(content, max_blocks=max_blocks))
+
+# 解析进程池：NEWS_SERVICE_PARSE_WORKERS 大于 0 时，HTML 解析在子进程中执行，
+# 避免刷新时纯 Python 的解析占住 GIL 拖慢 HTTP 响应
+PARSE_TIMEOUT = 30
+_parse_executor = None
+
+def start_parse_pool(workers: int):
+    """启动解析进程池（spawn 方式启动，子进程不继承父进程中日志等线程持有的锁）"""
+    global _parse_executor
+    import concurrent.futures
+    import multiprocessing
+    if workers > 0 and _parse_executor is None:
+        _parse_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"解析进程池已启动: {workers} 个进程")
+
+def stop_parse_pool():
+    global _parse_executor
+    executor, _parse_executor = _parse_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+def run_parser(func, *args):
+    """在解析进程池中执行解析函数，未启用或进程池不可用时在当前线程执行"""
+    executor = _parse_executor
+    with refresh_tracer.span(func.__name__, process_pool=executor is not None):
+        if executor is not None:
+            import concurrent.futures
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                return executor.submit(func, *args).result(timeout=PARSE_TIMEOUT)
+            except (BrokenProcessPool, concurrent.futures.TimeoutError, RuntimeError) as e:
+                logger.error(f"解析进程池不可用，改为在当前线程解析: {e!r}")
+        return func(*args)
+
+_SEARCH_TOKEN_RE = re.compile(r'[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+def tokenize_text(text: str) -> List[str]:
+    """分词：连续汉字切成二元组（单字保留单字），ASCII 字母数字按词切分并转小写"""
+    tokens = []
+    for run in _SEARCH_TOKEN_RE.findall(text.lower()):
+        if run[0].isascii() or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+def item_epoch(item: NewsItem) -> float:
+    """新闻的有效时间：电报用发布时间（HH:MM:SS，取抓取当天），其余用抓取时间"""
+    if item.news_time and _TELEGRAPH_TIME_RE.match(item.news_time):
+        try:
+            hour, minute, second = (int(part) for part in item.news_time.split(':'))
+            return datetime.combine(item.timestamp.date(), dt_time(hour, minute, second)).timestamp()
+        except ValueError:
+            pass
+    return item.timestamp.timestamp()
+
+class SearchIndex:
+    """新闻和电报的内存倒排索引
+
+    文档以 (命名空间, 标题) 为键，与池中按标题去重的语义一致；同一标题再次入池时
+    只刷新条目引用，不重新分词。词出现在标题中权重为2、只出现在股票信息中为1，
+    得分为各查询词权重乘 IDF 之和，同分时较新入库的在前。倒排表按入库顺序保存，
+    查询从最新文档开始扫描，凑满 limit 条满分结果即停止。
+    每个汉字另有单字倒排表（权重取包含它的词中最高的），单字查询直接使用，不必临时合并二元组。
+    另记录每个词出现在多少篇文档的标题中：只出现在股票信息里的词（如股票代码）满分按股票权重计，
+    同样能凑满 limit 条后提前停止。
+    """
+
+    TITLE_WEIGHT = 2
+    STOCK_WEIGHT = 1
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._next_id = 0
+        self._doc_ids: Dict[tuple, int] = {}
+        self._docs: Dict[int, list] = {}  # doc_id -> [命名空间, 条目, 有效时间, 词频]
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._char_postings: Dict[str, Dict[int, int]] = {}  # 汉字 -> 单字倒排表，用于单字查询
+        self._title_docs: Dict[str, int] = {}  # 词 -> 在标题中出现的文档数
+        self._char_title_docs: Dict[str, int] = {}  # 汉字 -> 在标题中出现的文档数
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _char_weights(weights: Dict[str, int]) -> Dict[str, int]:
+        """文档中各汉字的权重：取包含该字的词的最高权重"""
+        chars: Dict[str, int] = {}
+        for token, weight in weights.items():
+            if not token.isascii():
+                for char in token:
+                    if weight > chars.get(char, 0):
+                        chars[char] = weight
+        return chars
+
+    def add(self, namespace: str, item: NewsItem):
+        key = (namespace, item.title)
+        with self.lock:
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                doc = self._docs[doc_id]
+                doc[1] = item
+                doc[2] = item_epoch(item)
+                return
+
+            weights: Dict[str, int] = dict.fromkeys(tokenize_text(item.stock_info or ''), self.STOCK_WEIGHT)
+            weights.update(dict.fromkeys(tokenize_text(item.title), self.TITLE_WEIGHT))
+
+            doc_id = self._next_id
+            self._next_id += 1
+            self._doc_ids[key] = doc_id
+            self._docs[doc_id] = [namespace, item, item_epoch(item), weights]
+            for table, counts, keys in ((self._postings, self._title_docs, weights),
+                                        (self._char_postings, self._char_title_docs, self._char_weights(weights))):
+                for token, weight in keys.items():
+                    table.setdefault(token, {})[doc_id] = weight
+                    if weight == self.TITLE_WEIGHT:
+                        counts[token] = counts.get(token, 0) + 1
+
+    def remove(self, namespace: str, title: str):
+        with self.lock:
+            doc_id = self._doc_ids.pop((namespace, title), None)
+            if doc_id is None:
+                return
+            _, _, _, weights = self._docs.pop(doc_id)
+            for table, counts, keys in ((self._postings, self._title_docs, weights),
+                                        (self._char_postings, self._char_title_docs, self._char_weights(weights))):
+                for token, weight in keys.items():
+                    if weight == self.TITLE_WEIGHT:
+                        counts[token] -= 1
+                        if not counts[token]:
+                            del counts[token]
+                    posting = table.get(token)
+                    if posting is None:
+                        continue
+                    posting.pop(doc_id, None)
+                    if not posting:
+                        del table[token]
+
+    def _posting_for(self, token: str) -> Tuple[Dict[int, int], int]:
+        """查询词的倒排表和其中文档可能的最高权重"""
+        if len(token) == 1 and not token.isascii():
+            # 单个汉字：包括单独出现和出现在二元组中的文档
+            posting, in_titles = self._char_postings.get(token, {}), self._char_title_docs.get(token)
+        else:
+            posting, in_titles = self._postings.get(token, {}), self._title_docs.get(token)
+        return posting, self.TITLE_WEIGHT if in_titles else self.STOCK_WEIGHT
+
+    def search(self, query: str, source: Optional[str] = None, since: Optional[float] = None,
+               limit: int = 20) -> List[Dict]:
+        """所有查询词都需命中，返回得分最高的 limit 条"""
+        tokens = list(dict.fromkeys(tokenize_text(query)))
+        if not tokens:
+            return []
+
+        with self.lock:
+            lookups = sorted((self._posting_for(token) for token in tokens), key=lambda lookup: len(lookup[0]))
+            if not lookups[0][0]:
+                return []
+            postings = [posting for posting, _ in lookups]
+            total = len(self._docs)
+            idfs = [math.log(1 + total / len(posting)) for posting in postings]
+            best_score = sum(idf * max_weight for idf, (_, max_weight) in zip(idfs, lookups)) - 1e-9
+
+            heap = []
+            full_matches = 0
+            for doc_id in reversed(postings[0]):
+                score = postings[0][doc_id] * idfs[0]
+                for posting, idf in zip(postings[1:], idfs[1:]):
+                    weight = posting.get(doc_id)
+                    if weight is None:
+                        break
+                    score += weight * idf
+                else:
+                    _, item, epoch, _ = self._docs[doc_id]
+                    if source and item.source != source:
+                        continue
+                    if since is not None and epoch < since:
+                        continue
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (score, doc_id))
+                    else:
+                        heapq.heappushpop(heap, (score, doc_id))
+                    if score >= best_score:
+                        full_matches += 1
+                        if full_matches >= limit:
+                            # 剩余文档都更旧且得分不会更高
+                            break
+
+            results = []
+            for score, doc_id in sorted(heap, reverse=True):
+                namespace, item, _, _ = self._docs[doc_id]
+                result = item.to_dict()
+                result['kind'] = namespace
+                result['score'] = round(score, 3)
+                results.append(result)
+            return results
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {'documents': len(self._docs), 'tokens': len(self._postings), 'chars': len(self._char_postings)}
+
+class StoryClusterer:
+    """近似重复新闻聚类：标题分词（汉字二元组、英文单词）做 MinHash 签名，LSH 分桶索引
+    
+    查询只比较落在同一桶中的候选，再用精确 Jaccard 相似度确认，不随池大小线性增长。
+    可在配置文件的 clustering 段设置：enabled（默认 true）、threshold（Jaccard 阈值，默认 0.5）、
+    num_perm（签名长度，默认 32）。分桶数按阈值自动选择，偏向召回。
+    每个分词用一次 shake_128 得到 num_perm 个独立的 32 位哈希并缓存，签名为逐列最小值。
+    """
+    MAX_CACHED_SHINGLES = 100000
+    
+    def __init__(self, threshold: float = 0.5, num_perm: int = 32, enabled: bool = True):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+        self._row_format = struct.Struct(f'<{num_perm}I')
+        self._rows: Dict[str, Tuple[int, ...]] = {}  # 分词 -> 各哈希函数的值
+        self._shingles: Dict[str, frozenset] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+        self.signed = 0
+        self.sign_seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+    
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """选择 bands×rows=num_perm：相似度等于阈值时成为候选的概率不低于 0.95，
+        其中相似度为阈值一半时成为候选的概率最低的一组（候选最终都用精确相似度确认）"""
+        def candidate_probability(similarity, bands, rows):
+            return 1.0 - (1.0 - similarity ** rows) ** bands
+        options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+        recalled = [option for option in options if candidate_probability(threshold, *option) >= 0.95]
+        if not recalled:
+            return max(options, key=lambda option: candidate_probability(threshold, *option))
+        return min(recalled, key=lambda option: candidate_probability(threshold / 2, *option))
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def _sign(self, text: str) -> Tuple[frozenset, Tuple[int, ...]]:
+        start = time.perf_counter()
+        shingles = frozenset(tokenize_text(text))
+        rows = []
+        for shingle in shingles or ('',):
+            row = self._rows.get(shingle)
+            if row is None:
+                if len(self._rows) >= self.MAX_CACHED_SHINGLES:
+                    self._rows.clear()
+                row = self._rows[shingle] = self._row_format.unpack(
+                    hashlib.shake_128(shingle.encode('utf-8')).digest(self._row_format.size))
+            rows.append(row)
+        signature = tuple(map(min, zip(*rows)))
+        self.signed += 1
+        self.sign_seconds += time.perf_counter() - start
+        return shingles, signature
+    
+    def _band_keys(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+    
+    def add(self, key: str):
+        """以标题为键加入索引（已存在时忽略）"""
+        if key in self._signatures:
+            return
+        shingles, signature = self._sign(key)
+        self._shingles[key] = shingles
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+    
+    def remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        del self._shingles[key]
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+    
+    def similar(self, key: str) -> List[Tuple[float, str]]:
+        """索引中与 key 相似度不低于阈值的其他键，按相似度从高到低"""
+        self.add(key)
+        start = time.perf_counter()
+        shingles = self._shingles[key]
+        candidates = set()
+        for band_key in self._band_keys(self._signatures[key]):
+            candidates |= self._buckets.get(band_key, set())
+        candidates.discard(key)
+        matches = []
+        for candidate in candidates:
+            other = self._shingles[candidate]
+            union = len(shingles | other)
+            similarity = len(shingles & other) / union if union else 0.0
+            if similarity >= self.threshold:
+                matches.append((similarity, candidate))
+        matches.sort(reverse=True)
+        self.queries += 1
+        self.query_seconds += time.perf_counter() - start
+        return matches
+    
+    def sync(self, keys):
+        """让索引只包含 keys（池中的代表条目）"""
+        keys = set(keys)
+        for key in [key for key in self._signatures if key not in keys]:
+            self.remove(key)
+        for key in keys:
+            self.add(key)
+    
+    def collapse(self, items: List[NewsItem], keep_titles=()) -> List[NewsItem]:
+        """把近似重复的新闻合并为一条：代表条目的 duplicates 列出其余来源的条目
+        
+        已在池中的条目（keep_titles）优先作为代表，避免同一事件的显示标题来回变化。
+        返回代表条目，保持输入顺序。
+        """
+        if not self.enabled:
+            return items
+        keep_titles = set(keep_titles)
+        representatives: Dict[str, NewsItem] = {}
+        members: Dict[str, List[NewsItem]] = {}
+        # 池中已有的条目上一轮已经聚类过，直接作为代表，只为新条目查询索引
+        for item in items:
+            if item.title in keep_titles:
+                self.add(item.title)
+                representatives[item.title] = item
+                members[item.title] = []
+        for item in items:
+            if item.title in representatives:
+                continue
+            match = next((title for _, title in self.similar(item.title) if title in representatives), None)
+            if match is None:
+                representatives[item.title] = item
+                members[item.title] = []
+            else:
+                members[match].append(item)
+        
+        for title, item in representatives.items():
+            duplicates = {dup.title: dup for dup in item.duplicates}
+            for member in members[title]:
+                duplicates[member.title] = member
+                for dup in member.duplicates:
+                    duplicates.setdefault(dup.title, dup)
+            duplicates.pop(title, None)
+            item.duplicates = [NewsItem(dup.title, dup.url, dup.source) for dup in duplicates.values()]
+        return [item for item in items if item.title in representatives]
+    
+    def get_stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'rows': self.rows,
+            'indexed': len(self._signatures),
+            'sign_us_per_item': round(self.sign_seconds / self.signed * 1e6, 1) if self.signed else None,
+            'query_us': round(self.query_seconds / self.queries * 1e6, 1) if self.queries else None
+        }
+
+class KeywordAutomaton:
+    """Aho-Corasick 多模式匹配自动机
+
+    所有关键词编译进同一个状态机，扫描一段文本的开销只与文本长度和命中数有关，
+    与关键词数量无关。ASCII 关键词不区分大小写。
+    """
+
+    def __init__(self, keywords):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[tuple] = [()]
+        for keyword in keywords:
+            self._insert(keyword)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str):
+        keyword = keyword.strip()
+        if not keyword:
+            return
+        state = 0
+        for char in keyword.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        if keyword not in self._output[state]:
+            self._output[state] += (keyword,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # 沿失败链可达的输出合并到当前状态，匹配时不必再回溯
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> List[str]:
+        """返回文本中出现的关键词（去重，按首次出现顺序）"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Dict[str, None] = {}
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(dict.fromkeys(output[state]))
+        return list(found)
+
+class AlertManager:
+    """关键词/股票提醒：新条目入池时用自动机扫描一次标题和股票信息
+
+    关注列表来自配置文件的 alerts.watchlists 段（随配置热加载）或 API 注册，
+    同名时 API 注册的优先。关注列表变化时重新编译自动机并整体替换引用，
+    扫描不需要加锁。已入池的条目不会因关注列表变化而重新扫描。
+    """
+
+    def __init__(self, config_file: Optional[str] = None, max_alerts: int = 500):
+        self.lock = threading.Lock()
+        self.config_file = config_file or NEWS_SOURCES_CONFIG_FILE
+        self.max_alerts = max_alerts
+        self.config_watchlists: Dict[str, List[str]] = {}
+        self.api_watchlists: Dict[str, List[str]] = {}
+        self._keyword_lists: Dict[str, List[str]] = {}  # 关键词 -> 所属关注列表
+        self.automaton = KeywordAutomaton(())
+        self.alerts = deque(maxlen=max_alerts)
+        self._marks: Dict[str, Dict] = {}  # (类型, 标题) -> 命中信息，与 alerts 同步淘汰
+        self._next_seq = 1
+        self.scanned = 0
+        self.scan_seconds = 0.0
+        self.load_config()
+
+    def load_config(self):
+        """从配置文件读取关注列表"""
+        watchlists = {}
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    watchlists = json.load(f).get('alerts', {}).get('watchlists', {})
+        except Exception as e:
+            logger.error(f"读取提醒配置失败: {e}")
+            return
+        with self.lock:
+            self.config_watchlists = {
+                name: [keyword.strip() for keyword in keywords if isinstance(keyword, str) and keyword.strip()]
+                for name, keywords in watchlists.items()
+            }
+            self._rebuild()
+
+    def set_watchlist(self, name: str, keywords: List[str]):
+        """通过 API 注册关注列表，关键词为空时删除"""
+        keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+        with self.lock:
+            if keywords:
+                self.api_watchlists[name] = keywords
+            else:
+                self.api_watchlists.pop(name, None)
+            self._rebuild()
+
+    def get_watchlists(self) -> Dict[str, List[str]]:
+        with self.lock:
+            return {**self.config_watchlists, **self.api_watchlists}
+
+    def _rebuild(self):
+        """重新编译自动机（需持有 self.lock）"""
+        keyword_lists: Dict[str, List[str]] = {}
+        for name, keywords in {**self.config_watchlists, **self.api_watchlists}.items():
+            for keyword in keywords:
+                keyword_lists.setdefault(keyword, []).append(name)
+        self._keyword_lists = keyword_lists
+        self.automaton = KeywordAutomaton(keyword_lists)
+        logger.info(f"提醒关键词已编译: {len(keyword_lists)} 个关键词，{len(self.automaton)} 个状态")
+
+    def scan(self, kind: str, items: List[NewsItem]) -> int:
+        """扫描新入池的条目，记录命中的提醒，返回命中条数"""
+        automaton = self.automaton
+        if not items or len(automaton) == 1:
+            return 0
+
+        start = time.perf_counter()
+        matched = []
+        for item in items:
+            text = f"{item.title}\n{item.stock_info}" if item.stock_info else item.title
+            keywords = automaton.find(text)
+            if keywords:
+                matched.append((item, keywords))
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.scanned += len(items)
+            self.scan_seconds += elapsed
+            for item, keywords in matched:
+                watchlists = sorted({name for keyword in keywords for name in self._keyword_lists.get(keyword, ())})
+                if len(self.alerts) == self.max_alerts:
+                    oldest = self.alerts[0]
+                    key = (oldest['kind'], oldest['item'].title)
+                    if self._marks.get(key, {}).get('seq') == oldest['seq']:
+                        del self._marks[key]
+                mark = {'seq': self._next_seq, 'keywords': keywords, 'watchlists': watchlists}
+                self.alerts.append({
+                    'kind': kind,
+                    'alerted_at': time.time(),
+                    'item': item,
+                    **mark
+                })
+                self._marks[(kind, item.title)] = mark
+                self._next_seq += 1
+                logger.info(f"关键词提醒 [{','.join(keywords)}]: {item.title[:50]}")
+        return len(matched)
+
+    def mark_for(self, kind: str, item: NewsItem) -> Optional[Dict]:
+        """条目入池时命中的提醒信息，未命中返回 None"""
+        with self.lock:
+            return self._marks.get((kind, item.title))
+
+    def get_alerts(self, since: Optional[float] = None, limit: int = 100) -> List[Dict]:
+        """按时间倒序返回提醒"""
+        with self.lock:
+            alerts = [alert for alert in reversed(self.alerts)
+                      if since is None or alert['alerted_at'] >= since]
+        results = []
+        for alert in alerts[:limit]:
+            result = dict(alert)
+            result['alerted_at'] = datetime.fromtimestamp(alert['alerted_at']).isoformat()
+            result['item'] = alert['item'].to_dict()
+            results.append(result)
+        return results
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'keywords': len(self._keyword_lists),
+                'states': len(self.automaton),
+                'alerts': len(self.alerts),
+                'scanned_items': self.scanned,
+                'avg_scan_us': round(self.scan_seconds / self.scanned * 1e6, 2) if self.scanned else 0.0,
+            }
+
+_ARCHIVE_DAY_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+class NewsArchive:
+    """按天追加的压缩历史归档
+
+    每天一个数据文件 YYYY-MM-DD.jsonl.gz，由若干独立的 gzip 成员拼接而成（整体仍是合法的
+    gzip 文件），每批写入一个成员；同名 .idx 文件每行记录一个成员的
+    [偏移, 长度, 条数, 最早时间, 最晚时间, 来源列表]。分页读取时按索引定位成员，只解压需要的部分。
+    入池路径只把记录放入队列，由后台线程按批写盘。
+    retention_days 大于 0 时只保留最近这么多天的文件，启动时和每天第一次写盘时删除更早的。
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 10.0, batch_size: int = 500,
+                 queue_size: int = 10000, retention_days: int = 30):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.written = 0
+        self.segments_written = 0
+        self.dropped = 0
+        self.pruned_days = 0
+        self._pruned_on = None
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+        self.writer_thread = threading.Thread(target=self._writer_worker, daemon=True)
+        self.writer_thread.start()
+
+    def append(self, kind: str, items: List[NewsItem]):
+        """把新入池的条目放入写入队列，队列满时丢弃"""
+        for item in items:
+            record = item.to_dict()
+            record['kind'] = kind
+            record['epoch'] = round(item_epoch(item), 3)
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _writer_worker(self):
+        """攒够一批或等满 flush_interval 秒后写盘，收到 None 时写完剩余记录并退出"""
+        while True:
+            batch = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            if batch:
+                if self._pruned_on != date.today():
+                    self.prune()
+                self._write_batch(batch)
+            if stop:
+                return
+
+    def prune(self, today: Optional[date] = None) -> int:
+        """删除超出保留天数的归档文件，返回删除的天数"""
+        today = today or date.today()
+        self._pruned_on = today
+        if self.retention_days <= 0:
+            return 0
+        oldest = (today - timedelta(days=self.retention_days - 1)).strftime('%Y-%m-%d')
+        try:
+            names = os.listdir(self.directory)
+        except OSError as e:
+            logger.error(f"读取历史归档目录失败 {self.directory}: {e}")
+            return 0
+        days = {name.split('.', 1)[0] for name in names if name.endswith(('.jsonl.gz', '.idx'))}
+        pruned = 0
+        for day in sorted(days):
+            if not _ARCHIVE_DAY_RE.match(day) or day >= oldest:
+                continue
+            # 先删索引再删数据，中途失败只会留下没有索引的数据文件
+            with self.lock:
+                try:
+                    for path in reversed(self._paths(day)):
+                        if os.path.exists(path):
+                            os.remove(path)
+                except OSError as e:
+                    logger.error(f"删除过期归档失败 {day}: {e}")
+                    continue
+            pruned += 1
+        if pruned:
+            self.pruned_days += pruned
+            logger.info(f"已删除 {pruned} 天超出保留期（{self.retention_days} 天）的历史归档")
+        return pruned
+
+    def _paths(self, day: str) -> Tuple[str, str]:
+        return (os.path.join(self.directory, f"{day}.jsonl.gz"),
+                os.path.join(self.directory, f"{day}.idx"))
+
+    def _write_batch(self, batch: List[Dict]):
+        by_day: Dict[str, List[Dict]] = {}
+        for record in batch:
+            day = datetime.fromtimestamp(record['epoch']).strftime('%Y-%m-%d')
+            by_day.setdefault(day, []).append(record)
+
+        for day, records in by_day.items():
+            data_path, index_path = self._paths(day)
+            lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+            member = gzip.compress(lines.encode('utf-8'))
+            epochs = [record['epoch'] for record in records]
+            try:
+                with self.lock:
+                    with open(data_path, 'ab') as f:
+                        offset = f.seek(0, os.SEEK_END)
+                        f.write(member)
+                    # 数据写完后再写索引，中途崩溃只会留下索引未引用的尾部数据
+                    entry = [offset, len(member), len(records), min(epochs), max(epochs),
+                             sorted({record['source'] for record in records})]
+                    with open(index_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    self.written += len(records)
+                    self.segments_written += 1
+            except OSError as e:
+                logger.error(f"写入历史归档失败 {data_path}: {e}")
+
+    def read_index(self, day: str) -> List[list]:
+        """读取某天的成员索引，跳过数据文件中不存在的成员（数据文件缺失或被截断）"""
+        data_path, index_path = self._paths(day)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        try:
+            size = os.path.getsize(data_path)
+        except OSError:
+            size = 0
+        valid = [entry for entry in entries if entry[0] + entry[1] <= size]
+        if len(valid) < len(entries):
+            logger.warning(f"历史归档 {day} 有 {len(entries) - len(valid)} 个索引项指向缺失的数据，已跳过")
+        return valid
+
+    def history(self, day: str, source: Optional[str] = None, cursor: Optional[str] = None,
+                since: Optional[float] = None, limit: int = 50) -> Dict:
+        """分页读取某天的归档，cursor 为上一页返回的 next_cursor（"成员序号.行号"）"""
+        day = datetime.strptime(day, '%Y-%m-%d').strftime('%Y-%m-%d')
+        segment, line = 0, 0
+        if cursor:
+            segment, line = (int(part) for part in cursor.split('.', 1))
+            if segment < 0 or line < 0:
+                raise ValueError(f"invalid cursor: {cursor}")
+
+        segments = self.read_index(day)
+        data_path, _ = self._paths(day)
+        items = []
+        decompressed = 0
+        if segment >= len(segments):
+            return {'date': day, 'count': 0, 'items': [], 'next_cursor': None,
+                    'segments': len(segments), 'segments_read': 0}
+        with open(data_path, 'rb') as f:
+            while segment < len(segments) and len(items) < limit:
+                offset, length, _, _, last_epoch, sources = segments[segment]
+                if (source and source not in sources) or (since is not None and last_epoch < since):
+                    segment, line = segment + 1, 0
+                    continue
+                f.seek(offset)
+                lines = gzip.decompress(f.read(length)).decode('utf-8').splitlines()
+                decompressed += 1
+                while line < len(lines) and len(items) < limit:
+                    record = json.loads(lines[line])
+                    line += 1
+                    if source and record.get('source') != source:
+                        continue
+                    if since is not None and record['epoch'] < since:
+                        continue
+                    items.append(record)
+                if line >= len(lines):
+                    segment, line = segment + 1, 0
+
+        return {
+            'date': day,
+            'count': len(items),
+            'items': items,
+            'next_cursor': f"{segment}.{line}" if segment < len(segments) else None,
+            'segments': len(segments),
+            'segments_read': decompressed,
+        }
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'directory': self.directory,
+                'retention_days': self.retention_days,
+                'pruned_days': self.pruned_days,
+                'written': self.written,
+                'segments_written': self.segments_written,
+                'pending': self.queue.qsize(),
+                'dropped': self.dropped,
+            }
+
+    def close(self):
+        """写完队列中剩余的记录后停止后台线程"""
+        if self.writer_thread.is_alive():
+            try:
+                self.queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+            self.writer_thread.join(timeout=5)
+
+class ChangeFeed:
+    """数据池变更流：新闻池和大A数据的每次变化分配一个单调递增的序号
+    
+    变更记录是紧凑的增量：新闻为新增条目和移除的标题，电报为新并入当天时间线的条目，
+    股指、板块为替换后的完整列表。
+    只保留最近 max_changes 条，落后更多的读者改为拉取全量快照。
+    """
+    def __init__(self, max_changes: int = 2000):
+        self.lock = threading.Lock()
+        self.feed_id = f"{os.getpid()}-{int(time.time())}"  # 实例重启后序号从头开始，读者据此识别
+        self.seq = 0
+        self.changes = deque(maxlen=max_changes)
+    
+    def record(self, kind: str, **delta) -> int:
+        """记录一次变更，返回它的序号"""
+        with self.lock:
+            self.seq += 1
+            change = {'seq': self.seq, 'kind': kind}
+            change.update(delta)
+            self.changes.append(change)
+            return self.seq
+    
+    def read(self, since: int, feed_id: Optional[str] = None, limit: int = 500) -> Optional[Dict]:
+        """返回序号大于 since 的变更（最多 limit 条）
+        
+        since 已滚出缓冲区、超过当前序号或 feed_id 与本实例不符时返回 None，读者应改用全量快照。
+        """
+        with self.lock:
+            if feed_id and feed_id != self.feed_id:
+                return None
+            oldest = self.changes[0]['seq'] if self.changes else self.seq + 1
+            if since > self.seq or (since < oldest - 1 and since < self.seq):
+                return None
+            changes = [change for change in self.changes if change['seq'] > since][:limit]
+            seq = changes[-1]['seq'] if changes else self.seq
+            return {'feed_id': self.feed_id, 'seq': seq, 'more': seq < self.seq, 'changes': changes}
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'feed_id': self.feed_id,
+                'seq': self.seq,
+                'buffered': len(self.changes),
+                'oldest_seq': self.changes[0]['seq'] if self.changes else None
+            }
+
+class TelegraphTimeline:
+    """当天的电报时间线：按发布时间升序保存，按内容指纹去重，超过内存上限时丢弃最早的
+    
+    times 与 items 一一对应，插入用二分查找，晚到的电报也能落到正确位置；跨天时清空。
+    本身不加锁，由 BigAPool.lock 保护。
+    """
+    ITEM_OVERHEAD = 400  # 每条电报除字符串外的对象开销估算（字节）
+    
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, future_tolerance: float = 300.0):
+        self.max_bytes = max_bytes
+        self.future_tolerance = future_tolerance  # 超过当前时间这么多秒的视为前一天的电报
+        self.day = None
+        self.times: List[float] = []
+        self.items: List[NewsItem] = []
+        self.fingerprints = set()
+        self.bytes = 0
+        self.evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    @staticmethod
+    def fingerprint(item: NewsItem) -> bytes:
+        return hashlib.blake2b(_WHITESPACE_RE.sub('', item.title).encode('utf-8'), digest_size=8).digest()
+    
+    @classmethod
+    def _item_size(cls, item: NewsItem) -> int:
+        return (sys.getsizeof(item.title) + sys.getsizeof(item.url) + sys.getsizeof(item.stock_info or '')
+                + cls.ITEM_OVERHEAD)
+    
+    def clear(self) -> List[NewsItem]:
+        """清空时间线，返回被清掉的电报"""
+        items = self.items
+        self.times = []
+        self.items = []
+        self.fingerprints = set()
+        self.bytes = 0
+        return items
+    
+    def add(self, items: List[NewsItem], now: Optional[datetime] = None,
+            removed: Optional[List[NewsItem]] = None) -> List[NewsItem]:
+        """加入一批电报（news_time 为当天的 HH:MM:SS），返回新加入的电报，最新的在前
+        
+        传入 removed 列表时，跨天清空和超出内存上限丢弃的电报会追加到其中。
+        """
+        now = now or datetime.now()
+        if now.date() != self.day:
+            cleared = self.clear()
+            if removed is not None:
+                removed.extend(cleared)
+            self.day = now.date()
+        latest = now.timestamp() + self.future_tolerance
+        
+        added = []
+        # 页面上最新的在前，倒序插入使同一秒内的电报保持页面顺序
+        for item in reversed(items):
+            try:
+                hour, minute, second = (int(part) for part in (item.news_time or '').split(':'))
+                epoch = datetime.combine(self.day, dt_time(hour, minute, second)).timestamp()
+            except ValueError:
+                continue
+            if epoch > latest:
+                continue
+            fingerprint = self.fingerprint(item)
+            if fingerprint in self.fingerprints:
+                continue
+            index = bisect.bisect_right(self.times, epoch)
+            self.times.insert(index, epoch)
+            self.items.insert(index, item)
+            self.fingerprints.add(fingerprint)
+            self.bytes += self._item_size(item)
+            added.append(item)
+        
+        if self.bytes > self.max_bytes:
+            drop = 0
+            while self.bytes > self.max_bytes and drop < len(self.items):
+                self.bytes -= self._item_size(self.items[drop])
+                self.fingerprints.discard(self.fingerprint(self.items[drop]))
+                drop += 1
+            if removed is not None:
+                removed.extend(self.items[:drop])
+            del self.times[:drop]
+            del self.items[:drop]
+            self.evicted += drop
+            biga_logger.info(f"电报时间线超过内存上限，丢弃最早的 {drop} 条")
+        added.reverse()
+        return added
+    
+    def index_at(self, epoch: float) -> int:
+        """第一条发布时间不早于 epoch 的电报的位置"""
+        return bisect.bisect_left(self.times, epoch)
+    
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 100) -> List[NewsItem]:
+        """[since, until] 时间范围内最新的 limit 条，最新的在前"""
+        start = self.index_at(since) if since is not None else 0
+        end = bisect.bisect_right(self.times, until) if until is not None else len(self.times)
+        start = max(start, end - limit)
+        return [self.items[i] for i in range(end - 1, start - 1, -1)]
+    
+    def get_stats(self) -> Dict:
+        return {
+            'day': self.day.isoformat() if self.day else None,
+            'count': len(self.items),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'evicted': self.evicted
+        }
 
 class BigAPool:
     """大A模式数据管理器"""
-    def __init__(self):
+    def __init__(self, auto_start: bool = True, search_index: Optional[SearchIndex] = None,
+                 alert_manager: Optional[AlertManager] = None, archive: Optional[NewsArchive] = None,
+                 change_feed: Optional[ChangeFeed] = None):
         self.lock = threading.Lock()
+        self.search_index = search_index
+        self.alert_manager = alert_manager
+        self.archive = archive
+        self.change_feed = change_feed
+        self.change_listeners = []  # 数据变化时调用 listener(kind)
         self.indices: List[StockIndex] = []
         self.sectors: List[SectorData] = []
-        self.telegraph_items: List[NewsItem] = []
+        self.telegraph_items: List[NewsItem] = []  # 时间线中最近15分钟内最新的5条
+        self.telegraph_timeline = TelegraphTimeline()
+        self.telegraph_window = 15 * 60  # 轮播和 telegraph_items 只取最近15分钟的电报（秒）
         self.last_indices_update = datetime.min
         self.last_sectors_update = datetime.min
         self.last_telegraph_update = datetime.min
@@ -114,7 +2185,8 @@ class BigAPool:
         # 启动数据更新线程
         self.running = True
         self.update_thread = threading.Thread(target=self._update_worker, daemon=True)
-        self.update_thread.start()
+        if auto_start:
+            self.update_thread.start()
     
     def _update_worker(self):
         """后台数据更新工作线程"""
@@ -140,45 +2212,135 @@ class BigAPool:
                 time.sleep(10)  # 每10秒检查一次
                 
             except Exception as e:
-                logger.error(f"BigA数据更新错误: {e}")
+                biga_logger.error(f"BigA数据更新错误: {e}")
     
     def _update_indices(self):
         """更新股指数据"""
         try:
-            new_indices = self._fetch_stock_indices()
-            with self.lock:
-                self.indices = new_indices
-            logger.info(f"已更新{len(new_indices)}个股指数据")
+            with refresh_tracer.cycle('biga indices'):
+                new_indices = self._fetch_stock_indices()
+                self._set_indices(new_indices)
+            biga_logger.info(f"已更新{len(new_indices)}个股指数据")
         except Exception as e:
-            logger.error(f"更新股指数据失败: {e}")
+            biga_logger.error(f"更新股指数据失败: {e}")
     
     def _update_sectors(self):
         """更新板块数据"""
         try:
-            new_sectors = self._fetch_sector_data()
-            with self.lock:
-                self.sectors = new_sectors
-            logger.info(f"已更新{len(new_sectors)}个板块数据")
+            with refresh_tracer.cycle('biga sectors'):
+                new_sectors = self._fetch_sector_data()
+                self._set_sectors(new_sectors)
+            biga_logger.info(f"已更新{len(new_sectors)}个板块数据")
         except Exception as e:
-            logger.error(f"更新板块数据失败: {e}")
+            biga_logger.error(f"更新板块数据失败: {e}")
     
     def _update_telegraph(self):
-        """更新电报数据 - 每30秒完全替换为最新5条"""
+        """更新电报数据 - 每30秒把页面上的电报并入当天时间线"""
         try:
             current_time = datetime.now().strftime("%H:%M:%S")
-            logger.info(f"开始更新电报数据 - 当前时间: {current_time}")
+            biga_logger.info(f"开始更新电报数据 - 当前时间: {current_time}")
             
-            new_telegraph = self._fetch_recent_telegraph()
-            with self.lock:
-                # 完全替换池子内容为最新的5条电报
-                self.telegraph_items = new_telegraph[:5]
+            with refresh_tracer.cycle('biga telegraph') as trace_args:
+                new_telegraph = self._fetch_recent_telegraph()
+                with refresh_tracer.span('timeline add', items=len(new_telegraph)):
+                    added = self._add_telegraph(new_telegraph)
+                with refresh_tracer.span('process added', added=len(added)):
+                    self._process_added_telegraph(added)
+                trace_args['added'] = len(added)
                 
             # 记录更新后的电报时间
             times = [item.news_time for item in self.telegraph_items if item.news_time]
-            logger.info(f"已更新电报数据，完全替换为最新{len(self.telegraph_items)}条电报")
-            logger.info(f"更新后电报时间: {times}")
+            biga_logger.info(f"已更新电报数据，新增{len(added)}条，当天共{len(self.telegraph_timeline)}条")
+            biga_logger.info(f"更新后电报时间: {times}")
         except Exception as e:
-            logger.error(f"更新电报数据失败: {e}")
+            biga_logger.error(f"更新电报数据失败: {e}")
+    
+    def _set_telegraph_items(self, items: List[NewsItem]):
+        """替换轮播用的电报列表（需持有 self.lock），有变化时通知监听者"""
+        changed = [item.title for item in items] != [item.title for item in self.telegraph_items]
+        self.telegraph_items = items
+        if changed:
+            self._notify_change('telegraph')
+    
+    def _add_telegraph(self, items: List[NewsItem]) -> List[NewsItem]:
+        """电报并入时间线，并把 telegraph_items 更新为最近15分钟内最新的5条，返回新出现的电报
+        
+        搜索索引和变更流跟随时间线：新并入的电报都入索引并记入变更流，
+        跨天清空或超出内存上限丢弃的电报从索引中移除。
+        """
+        with self.lock:
+            removed = []
+            added = self.telegraph_timeline.add(items, removed=removed)
+            if self.search_index is not None:
+                for item in removed:
+                    self.search_index.remove('telegraph', item.title)
+                for item in added:
+                    self.search_index.add('telegraph', item)
+            if added and self.change_feed is not None:
+                self.change_feed.record('telegraph', items=[item.to_dict() for item in added])
+            recent = self.telegraph_timeline.query(since=time.time() - self.telegraph_window, limit=5)
+            self._set_telegraph_items(recent)
+        return added
+    
+    def query_telegraph(self, since: Optional[float] = None, until: Optional[float] = None,
+                        limit: int = 100) -> Dict:
+        """按发布时间范围查询当天的电报，最新的在前"""
+        with self.lock:
+            items = self.telegraph_timeline.query(since, until, limit)
+            return {
+                'count': len(items),
+                'total': len(self.telegraph_timeline),
+                'items': [item.to_dict() for item in items]
+            }
+    
+    def _process_added_telegraph(self, added: List[NewsItem]):
+        """新出现的电报做关键词提醒并归档"""
+        if self.alert_manager is not None:
+            self.alert_manager.scan('telegraph', added)
+        if self.archive is not None:
+            self.archive.append('telegraph', added)
+    
+    def _set_indices(self, indices: List[StockIndex]):
+        """替换股指数据，内容有变化时记入变更流"""
+        with self.lock:
+            # 只比较行情数值，休市时重复抓到的相同数据不产生变更
+            changed = ([(idx.code, idx.current_price, idx.change_percent) for idx in indices] !=
+                       [(idx.code, idx.current_price, idx.change_percent) for idx in self.indices])
+            self.indices = indices
+        if changed and self.change_feed is not None:
+            self.change_feed.record('indices', items=[idx.to_dict() for idx in indices])
+        self._notify_change('indices')
+    
+    def _set_sectors(self, sectors: List[SectorData]):
+        """替换板块数据，内容有变化时记入变更流"""
+        with self.lock:
+            changed = ([(sector.name, sector.change_percent) for sector in sectors] !=
+                       [(sector.name, sector.change_percent) for sector in self.sectors])
+            self.sectors = sectors
+        if changed and self.change_feed is not None:
+            self.change_feed.record('sectors', items=[sector.to_dict() for sector in sectors])
+        self._notify_change('sectors')
+    
+    def apply_remote_change(self, kind: str, items: List[Dict]):
+        """副本模式：把主实例的电报并入本地时间线，用股指/板块列表替换本地数据（幂等）"""
+        now = datetime.now()
+        if kind == 'telegraph':
+            added = self._add_telegraph([NewsItem.from_dict(data) for data in items])
+            self.last_telegraph_update = now
+            self._process_added_telegraph(added)
+        elif kind == 'indices':
+            self._set_indices([StockIndex.from_dict(data) for data in items])
+            self.last_indices_update = now
+        elif kind == 'sectors':
+            self._set_sectors([SectorData.from_dict(data) for data in items])
+            self.last_sectors_update = now
+    
+    def _notify_change(self, kind: str):
+        for listener in self.change_listeners:
+            try:
+                listener(kind)
+            except Exception as e:
+                biga_logger.error(f"数据变化通知失败: {e}")
     
     def _fetch_stock_indices(self) -> List[StockIndex]:
         """获取股指数据 - 从新浪财经API"""
@@ -203,7 +2365,7 @@ class BigAPool:
             codes_param = ','.join(index_codes.keys())
             api_url = f"https://hq.sinajs.cn/list={codes_param}"
             
-            response = requests.get(api_url, headers=headers, timeout=10)
+            response = http_get(api_url, headers=headers, timeout=10)
             response.encoding = 'gbk'  # 新浪API返回GBK编码
             
             if response.status_code == 200:
@@ -234,7 +2396,7 @@ class BigAPool:
                                     except (ValueError, IndexError):
                                         continue
         except Exception as e:
-            logger.error(f"获取股指数据失败: {e}")
+            biga_logger.error(f"获取股指数据失败: {e}")
         
         return indices
     
@@ -263,7 +2425,7 @@ class BigAPool:
                 'fields': 'f1,f2,f3,f4,f12,f14'
             }
             
-            response = requests.get(api_url, params=params, headers=headers, timeout=10)
+            response = http_get(api_url, params=params, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -294,12 +2456,12 @@ class BigAPool:
                             sectors.append(sector)
                             
         except Exception as e:
-            logger.error(f"获取板块数据失败: {e}")
+            biga_logger.error(f"获取板块数据失败: {e}")
         
         return sectors
     
     def _fetch_recent_telegraph(self) -> List[NewsItem]:
-        """获取最近30分钟的财联社电报"""
+        """获取电报页面上当天的财联社电报（最多前20块），最新的在前"""
         telegraph_items = []
         
         try:
@@ -307,139 +2469,44 @@ class BigAPool:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
             
-            response = requests.get('https://www.cls.cn/telegraph', headers=headers, timeout=10)
+            response = http_get('https://www.cls.cn/telegraph', headers=headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 查找电报内容 - 尝试多种选择器
-            telegraph_blocks = soup.find_all('div', class_=lambda x: x and 'telegraph-content-box' in x)
-            
-            # 如果第一个选择器没找到，尝试其他选择器
-            if not telegraph_blocks:
-                logger.info("使用备选选择器查找电报内容")
-                telegraph_blocks = soup.find_all('div', class_=lambda x: x and 'telegraph' in str(x).lower())
-                
-            if not telegraph_blocks:
-                # 尝试查找包含时间格式的内容块
-                telegraph_blocks = soup.find_all('div', string=lambda text: text and ':' in text and len(text.split(':')) >= 3)
-            logger.info(f"找到 {len(telegraph_blocks)} 个电报块")
-            
-            fifteen_minutes_ago = datetime.now() - timedelta(minutes=15)
+            today = datetime.now().date()
             
-            for i, block in enumerate(telegraph_blocks[:20]):  # 限制处理数量
+            # 单遍扫描页面，最多处理前20个电报块
+            for time_text, title, url, stock_info in run_parser(parse_telegraph_page, response.content, 20):
                 try:
-                    # 提取时间
-                    time_element = block.find('span', class_='telegraph-time-box')
-                    if time_element:
-                        time_text = time_element.get_text(strip=True)
-                        logger.info(f"电报块 {i}: 时间 {time_text}")
-                        # 解析时间格式 HH:MM:SS
-                        if re.match(r'^\d{1,2}:\d{2}:\d{2}$', time_text):
-                            today = datetime.now().date()
-                            time_parts = time_text.split(':')
-                            news_time = datetime.combine(
-                                today, 
-                                datetime.min.time().replace(
-                                    hour=int(time_parts[0]), 
-                                    minute=int(time_parts[1]), 
-                                    second=int(time_parts[2])
-                                )
-                            )
-                            
-                            logger.info(f"解析时间: {news_time}, 15分钟前: {fifteen_minutes_ago}")
-                            # 只要最近15分钟的
-                            if news_time < fifteen_minutes_ago:
-                                logger.info(f"跳过旧新闻: {time_text}")
-                                continue
-                        else:
-                            logger.warning(f"时间格式不匹配: {time_text}")
-                            continue
-                    else:
-                        logger.warning(f"电报块 {i}: 未找到时间元素")
-                        continue
-                    
-                    # 提取标题和内容
-                    content_element = block.find('div')
-                    if content_element:
-                        title = content_element.get_text(strip=True)
-                        # 安全清理换行符和控制字符，保护数字内容
-                        original_title = title  # 保存原始标题用于调试
-                        title = title.replace('\n', ' ').replace('\r', ' ').replace('\u2028', ' ').replace('\u2029', ' ')
-                        # 使用更安全的空格处理，确保数字不被误删
-                        import re
-                        title = re.sub(r'\s+', ' ', title).strip()  # 将多个空白字符替换为单个空格
-                        
-                        # 调试：记录文本处理过程
-                        if original_title != title:
-                            logger.debug(f"文本处理: 原始='{original_title[:50]}...' -> 处理后='{title[:50]}...'")
-                        else:
-                            logger.debug(f"文本无需处理: '{title[:50]}...'")
-                        if title and len(title) > 10:
-                            # 提取链接
-                            link_element = block.find('a')
-                            url = link_element.get('href', '') if link_element else ''
-                            
-                            if url and not url.startswith('http'):
-                                url = f"https://www.cls.cn{url}"
-                            
-                            # 提取股票信息
-                            stock_container = block.find_next('div', class_='industry-stock')
-                            stock_info = None
-                            if stock_container:
-                                stock_items = []
-                                stock_links = stock_container.find_all('a')
-                                for link in stock_links[:3]:  # 最多3只股票
-                                    name_span = link.find('span', class_='c-222')
-                                    change_span = link.find('span', class_='c-de0422')
-                                    if name_span and change_span:
-                                        name = name_span.get_text(strip=True)
-                                        change = change_span.get_text(strip=True)
-                                        stock_items.append(f"{name} {change}")
-                                
-                                if stock_items:
-                                    stock_info = ' '.join(stock_items)
-                            
-                            news_item = NewsItem(
-                                title=title,
-                                url=url,
-                                source="财联社电报",
-                                news_time=time_text if time_element else None,
-                                stock_info=stock_info
-                            )
-                            telegraph_items.append(news_item)
-                            logger.info(f"添加电报项: {time_text} - {title[:50]}...")
-                            
-                except Exception as e:
-                    logger.debug(f"解析电报项错误: {e}")
+                    hour, minute, second = (int(part) for part in time_text.split(':'))
+                    news_time = datetime.combine(today, dt_time(hour, minute, second))
+                except ValueError:
+                    biga_logger.warning(f"时间格式不匹配: {time_text}")
                     continue
+                
+                news_item = NewsItem(
+                    title=title,
+                    url=url,
+                    source="财联社电报",
+                    news_time=time_text,
+                    stock_info=stock_info
+                )
+                telegraph_items.append((news_time, news_item))
+                biga_logger.debug(f"添加电报项: {time_text} - {title[:50]}...")
             
             # 按新闻时间排序，最新的在前
-            def parse_news_time(item):
-                if item.news_time:
-                    try:
-                        time_parts = item.news_time.split(':')
-                        today = datetime.now().date()
-                        return datetime.combine(today, datetime.min.time().replace(
-                            hour=int(time_parts[0]), 
-                            minute=int(time_parts[1]), 
-                            second=int(time_parts[2])
-                        ))
-                    except:
-                        return datetime.min
-                return datetime.min
-            
-            telegraph_items.sort(key=parse_news_time, reverse=True)
-            logger.info(f"最终获得 {len(telegraph_items)} 个有效电报项")
+            telegraph_items.sort(key=lambda pair: pair[0], reverse=True)
+            telegraph_items = [item for _, item in telegraph_items]
+            biga_logger.info(f"最终获得 {len(telegraph_items)} 个有效电报项")
             
             # 记录排序后的前5个电报时间
             for i, item in enumerate(telegraph_items[:5]):
-                logger.info(f"排序后第{i+1}个电报: {item.news_time}")
+                biga_logger.debug(f"排序后第{i+1}个电报: {item.news_time}")
             
         except Exception as e:
-            logger.error(f"获取财联社电报失败: {e}")
+            biga_logger.error(f"获取财联社电报失败: {e}")
+            telegraph_items = []
         
-        return telegraph_items[:5]  # 只保留最新5条
+        return telegraph_items
     
     def get_display_content(self) -> Dict:
         """获取当前应该显示的内容 - 基于10秒轮播"""
@@ -449,20 +2516,27 @@ class BigAPool:
             cycle_second = int(current_time.timestamp()) % 10
             
             # 记录轮播状态到调试日志
-            logger.debug(f"轮播状态: 当前时间={current_time.strftime('%H:%M:%S')}, 周期秒={cycle_second}")
+            biga_logger.debug(f"轮播状态: 当前时间={current_time.strftime('%H:%M:%S')}, 周期秒={cycle_second}")
             
             if cycle_second < 5:
-                # 0-5秒：显示电报（轮播最新的5条中的前3条）
-                if self.telegraph_items:
-                    # 优先轮播最新的3条电报
-                    display_telegraph = self.telegraph_items[:3]
-                    if display_telegraph:
-                        telegraph_index = (cycle_second * len(display_telegraph)) // 5
-                        if telegraph_index < len(display_telegraph):
-                            return {
-                                'type': 'telegraph',
-                                'content': display_telegraph[telegraph_index].to_dict()
-                            }
+                # 0-5秒：显示电报（轮播最近15分钟内最新的3条），直接按下标读取时间线
+                timeline = self.telegraph_timeline
+                end = len(timeline)
+                start = max(timeline.index_at(current_time.timestamp() - self.telegraph_window), end - 3)
+                if end > start:
+                    display_count = end - start
+                    telegraph_index = (cycle_second * display_count) // 5
+                    if telegraph_index < display_count:
+                        item = timeline.items[end - 1 - telegraph_index]
+                        content = item.to_dict()
+                        if self.alert_manager is not None:
+                            mark = self.alert_manager.mark_for('telegraph', item)
+                            if mark:
+                                content['alert'] = mark
+                        return {
+                            'type': 'telegraph',
+                            'content': content
+                        }
                 
                 return {
                     'type': 'telegraph', 
@@ -492,6 +2566,11 @@ class BigAPool:
         with self.lock:
             return [item.to_dict() for item in self.telegraph_items]
     
+    def get_telegraph_timeline(self) -> List[Dict]:
+        """当天时间线中的全部电报，最新的在前"""
+        with self.lock:
+            return [item.to_dict() for item in reversed(self.telegraph_timeline.items)]
+    
     def get_status(self) -> Dict:
         """获取BigA模式状态"""
         with self.lock:
@@ -499,6 +2578,7 @@ class BigAPool:
                 'indices_count': len(self.indices),
                 'sectors_count': len(self.sectors),
                 'telegraph_count': len(self.telegraph_items),
+                'telegraph_timeline': self.telegraph_timeline.get_stats(),
                 'last_indices_update': self.last_indices_update.isoformat(),
                 'last_sectors_update': self.last_sectors_update.isoformat(),
                 'last_telegraph_update': self.last_telegraph_update.isoformat()
@@ -510,30 +2590,89 @@ class BigAPool:
         if self.update_thread.is_alive():
             self.update_thread.join(timeout=5)
 
+class RefreshFlight:
+    """一次进行中的刷新，同一范围内后到的刷新请求共享它的结果"""
+    _ids = itertools.count(1)
+    
+    def __init__(self, scope: str):
+        self.id = next(self._ids)
+        self.scope = scope  # '*' 表示全量刷新，否则为新闻源的配置键
+        self.started_at = datetime.now()
+        self.finished = None  # 完成时的 time.monotonic()
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'scope': self.scope,
+            'started_at': self.started_at.isoformat(),
+            'done': self.done.is_set(),
+            'result': self.result
+        }
+
 class NewsPool:
     """新闻池管理器"""
-    def __init__(self, max_size: int = 100, refresh_interval: int = 60):
+    def __init__(self, max_size: int = 100, refresh_interval: int = 60,
+                 auto_start: bool = True, config_file: Optional[str] = None,
+                 search_index: Optional[SearchIndex] = None,
+                 alert_manager: Optional[AlertManager] = None,
+                 archive: Optional[NewsArchive] = None,
+                 change_feed: Optional[ChangeFeed] = None):
         self.news_items: List[NewsItem] = []
+        self.search_index = search_index
+        self.alert_manager = alert_manager
+        self.archive = archive
+        self.change_feed = change_feed
+        self.replica = None  # 副本模式下的 ReplicaFollower，刷新改为从主实例同步
+        self.clusterer: Optional[StoryClusterer] = None
+        self.change_listeners = []  # 新闻池变化时调用 listener('news')
         self.max_size = max_size
         self.refresh_interval = refresh_interval
+        self.config_file = config_file or NEWS_SOURCES_CONFIG_FILE
+        self.config_check_interval = 5  # 配置文件检查间隔（秒）
+        self._config_mtime = None
+        self.extraction_rules: Dict[str, ExtractionRule] = {}
         self.lock = threading.Lock()
         self.last_refresh = None
         self.refresh_thread = None
+        self.min_refresh_interval = 30  # 手动刷新同一范围的最小间隔（秒）
+        self._refresh_lock = threading.Lock()
+        self._refresh_flights: Dict[str, RefreshFlight] = {}  # 进行中的刷新
+        self._last_refresh_flights: Dict[str, RefreshFlight] = {}  # 各范围最近一次完成的刷新
+        self._recent_refresh_flights = deque(maxlen=32)  # 供 /refresh?flight= 按编号查询
+        self._reload_lock = threading.Lock()  # /reload 与配置文件监视不同时比对配置，避免同一变更抓取两次
         self.running = True
         
         # 加载新闻源配置
         self.load_news_sources_config()
         
-        # 启动自动刷新
-        self.start_auto_refresh()
-        
-        # 立即获取一次新闻
-        self.refresh_news()
+        if auto_start:
+            # 启动自动刷新
+            self.start_auto_refresh()
+            
+            # 立即获取一次新闻
+            self.refresh_news()
     
     def load_news_sources_config(self):
         """加载新闻源配置，支持可开关配置"""
-        # 默认配置文件路径
-        config_file = os.path.expanduser('~/.claude/news_sources_config.json')
+        self.news_sources = self._read_news_sources_config()
+        self._compile_rules()
+        self._load_clustering_config()
+        
+        enabled_sources = list(self.news_sources.keys())
+        pool_logger.info(f"已启用的新闻源: {enabled_sources}")
+    
+    def _read_news_sources_config(self, use_defaults_on_error: bool = True) -> Optional[Dict[str, Dict]]:
+        """读取配置文件并与默认配置合并，返回已启用的新闻源
+        
+        配置文件无法读取或解析时，use_defaults_on_error 为 False 则返回 None（热加载时保留当前配置，
+        避免保存到一半的文件让默认配置中所有源都被启用）。
+        """
+        config_file = self.config_file
         
         # 默认新闻源配置（所有源默认启用）
         default_config = {
@@ -548,6 +2687,9 @@ class NewsPool:
                         '.article-title',
                         'h3.title a'
                     ],
+                    'min_title_length': 8,
+                    'url_pattern': r'36kr\.com/p/\d+',
+                    'stream': True,
                     'icon': '💼'
                 },
                 'techcrunch': {
@@ -560,6 +2702,9 @@ class NewsPool:
                         'h3 a',
                         '.article-title'
                     ],
+                    'min_title_length': 15,
+                    'url_pattern': r'techcrunch\.com/\d{4}/\d{2}/\d{2}/',
+                    'stream': True,
                     'icon': '🚀'
                 },
                 'huxiu': {
@@ -572,6 +2717,9 @@ class NewsPool:
                         '.news-title',
                         'a.item-title'
                     ],
+                    'min_title_length': 8,
+                    'url_pattern': r'huxiu\.com/article/\d+',
+                    'stream': True,
                     'icon': '🦆'
                 },
                 'tmtpost': {
@@ -584,6 +2732,9 @@ class NewsPool:
                         'h3 a',
                         '.article-title'
                     ],
+                    'min_title_length': 8,
+                    'url_pattern': r'tmtpost\.com/\d+\.html',
+                    'stream': True,
                     'icon': '🔧'
                 },
                 'leiphone': {
@@ -596,6 +2747,9 @@ class NewsPool:
                         '.article-title',
                         '.news-title'
                     ],
+                    'min_title_length': 8,
+                    'url_pattern': r'leiphone\.com/category/[\w-]+/\w+\.html',
+                    'stream': True,
                     'icon': '⚡'
                 },
                 'cls_telegraph': {
@@ -608,6 +2762,8 @@ class NewsPool:
                         '.telegraph-item a',
                         'a'
                     ],
+                    'min_title_length': 10,
+                    'url_pattern': r'cls\.cn/(telegraph|detail)/\d+',
                     'icon': '📈'
                 },
                 'cls_finance': {
@@ -620,6 +2776,8 @@ class NewsPool:
                         '.news-item a',
                         'a'
                     ],
+                    'min_title_length': 10,
+                    'url_pattern': r'cls\.cn/detail/\d+',
                     'icon': '💹'
                 },
                 'cls_depth': {
@@ -632,6 +2790,8 @@ class NewsPool:
                         'h3 a',
                         'a'
                     ],
+                    'min_title_length': 10,
+                    'url_pattern': r'cls\.cn/(depth|detail)/\d+',
                     'icon': '📊'
                 }
             }
@@ -639,6 +2799,7 @@ class NewsPool:
         
         # 尝试加载配置文件
         try:
+            self._config_mtime = self._get_config_mtime()
             if os.path.exists(config_file):
                 with open(config_file, 'r', encoding='utf-8') as f:
                     user_config = json.load(f)
@@ -648,65 +2809,319 @@ class NewsPool:
                             # 更新用户自定义的设置
                             source_config.update(user_config['sources'][source_key])
                     
-                    logger.info(f"已加载用户配置文件: {config_file}")
+                    pool_logger.info(f"已加载用户配置文件: {config_file}")
             else:
                 # 创建默认配置文件
                 os.makedirs(os.path.dirname(config_file), exist_ok=True)
                 with open(config_file, 'w', encoding='utf-8') as f:
                     json.dump(default_config, f, ensure_ascii=False, indent=2)
-                logger.info(f"已创建默认配置文件: {config_file}")
+                self._config_mtime = self._get_config_mtime()
+                pool_logger.info(f"已创建默认配置文件: {config_file}")
         except Exception as e:
-            logger.warning(f"配置文件处理错误: {e}，使用默认配置")
+            if not use_defaults_on_error:
+                pool_logger.error(f"配置文件处理错误: {e}，保留当前配置")
+                return None
+            pool_logger.warning(f"配置文件处理错误: {e}，使用默认配置")
         
         # 只启用已启用的新闻源
-        self.news_sources = {
+        return {
             key: config for key, config in default_config['sources'].items()
             if config.get('enabled', True)
         }
+    
+    def _load_clustering_config(self):
+        """读取配置文件的 clustering 段，参数变化时重建近似重复索引"""
+        settings = {}
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    settings = json.load(f).get('clustering', {})
+        except Exception as e:
+            pool_logger.error(f"读取聚类配置失败: {e}")
+            return
+        try:
+            params = {
+                'threshold': float(settings.get('threshold', 0.5)),
+                'num_perm': int(settings.get('num_perm', 32)),
+                'enabled': bool(settings.get('enabled', True))
+            }
+        except (TypeError, ValueError) as e:
+            pool_logger.error(f"聚类配置无效: {e}")
+            return
+        current = self.clusterer
+        if current is not None and (current.threshold, current.num_perm, current.enabled) == (
+                params['threshold'], params['num_perm'], params['enabled']):
+            return
+        clusterer = StoryClusterer(**params)
+        with self.lock:
+            clusterer.sync(item.title for item in self.news_items)
+            self.clusterer = clusterer
+        pool_logger.info(f"近似重复聚类: {clusterer.get_stats()}")
+    
+    def _get_config_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.config_file).st_mtime
+        except OSError:
+            return None
+    
+    def config_changed(self) -> bool:
+        """配置文件修改时间是否与上次加载时不同"""
+        return self._get_config_mtime() != self._config_mtime
+    
+    def reload_news_sources_config(self, background: bool = False) -> Dict:
+        """热加载新闻源配置：只抓取新增或变更的源，移除已删除源的新闻，其余内容保留"""
+        with self._reload_lock:
+            return self._reload_news_sources_config(background)
+    
+    def _reload_news_sources_config(self, background: bool) -> Dict:
+        """比对并应用新配置（需持有 self._reload_lock）"""
+        old_sources = self.news_sources
+        new_sources = self._read_news_sources_config(use_defaults_on_error=False)
+        if new_sources is None:
+            return {'error': 'config file could not be parsed, keeping current sources'}
+        
+        added = [key for key in new_sources if key not in old_sources]
+        removed = [key for key in old_sources if key not in new_sources]
+        changed = [key for key in new_sources if key in old_sources and new_sources[key] != old_sources[key]]
+        
+        self.news_sources = new_sources
+        self._compile_rules()
+        self._load_clustering_config()
+        if self.alert_manager is not None:
+            self.alert_manager.load_config()
+        dropped = self._drop_source_items({old_sources[key]['name'] for key in removed})
+        
+        result = {'added': added, 'removed': removed, 'changed': changed, 'dropped_items': dropped}
+        pool_logger.info(f"新闻源配置已重新加载: 新增{added} 删除{removed} 变更{changed}，移除{dropped}条新闻")
+        
+        to_fetch = {key: new_sources[key] for key in added + changed}
+        if to_fetch and self.replica is None:
+            # 变更的源抓取成功后以新结果替换旧内容（名称可能已改变）
+            replaced = {key: old_sources[key]['name'] for key in changed}
+            if background:
+                threading.Thread(target=self._fetch_and_merge, args=(to_fetch, replaced), daemon=True).start()
+            else:
+                result['fetched_items'] = self._fetch_and_merge(to_fetch, replaced)
+        return result
+    
+    def _fetch_and_merge(self, sources: Dict[str, Dict], replaced: Optional[Dict[str, str]] = None) -> int:
+        """抓取指定的新闻源并合并到池中，返回抓取到的新闻数
+        
+        replaced 为 {源: 旧名称}，这些源抓到新闻时才移除旧名称下的内容，抓取失败或为空时保留旧内容。
+        """
+        replaced = replaced or {}
+        with refresh_tracer.cycle('fetch and merge', sources=len(sources)) as trace_args:
+            new_items = []
+            drop_names = set()
+            for source_key, source_config in sources.items():
+                with refresh_tracer.span(source_config['name'], source=source_key) as source_args:
+                    items = []
+                    try:
+                        items = self._fetch_news_from_source(source_config)
+                        new_items.extend(items)
+                        source_args['items'] = len(items)
+                        pool_logger.info(f"从 {source_config['name']} 获取到 {len(items)} 条新闻")
+                    except Exception as e:
+                        pool_logger.error(f"从 {source_config['name']} 获取新闻失败: {e}")
+                    if source_key in replaced:
+                        if items:
+                            drop_names.add(replaced[source_key])
+                        else:
+                            pool_logger.warning(f"{source_config['name']} 配置变更后未抓到新闻，保留原有内容")
+            
+            if drop_names:
+                self._drop_source_items(drop_names)
+            with refresh_tracer.span('merge', new_items=len(new_items)):
+                added = self._merge_news_items(new_items)
+            with refresh_tracer.span('process added', added=len(added)):
+                self._process_added_news(added)
+            trace_args['added'] = len(added)
+        return len(new_items)
+    
+    def _process_added_news(self, added: List[NewsItem]):
+        """新入池的新闻做关键词提醒并归档"""
+        if self.alert_manager is not None:
+            self.alert_manager.scan('news', added)
+        if self.archive is not None:
+            self.archive.append('news', added)
+    
+    def apply_remote_changes(self, added: List[Dict], removed=(), reset: bool = False) -> int:
+        """副本模式：把主实例的新闻增量应用到本地池（幂等），reset 时以 added 为全量内容
+        
+        顺序与主实例一致（按抓取时间倒序），新入池的新闻照常提醒和归档。返回新入池数量。
+        """
+        removed = set(removed)
+        with self.lock:
+            kept = [] if reset else [item for item in self.news_items if item.title not in removed]
+            seen = {item.title for item in kept}
+            for data in added:
+                if data['title'] not in seen:
+                    seen.add(data['title'])
+                    kept.append(NewsItem.from_dict(data))
+            kept.sort(key=lambda x: x.timestamp, reverse=True)
+            new_items = self._set_news_items(kept[:self.max_size])
+            self.last_refresh = datetime.now()
+        self._process_added_news(new_items)
+        return len(new_items)
+    
+    def _drop_source_items(self, source_names) -> int:
+        """从池中移除指定来源的新闻，返回移除数量"""
+        if not source_names:
+            return 0
+        with self.lock:
+            kept = [item for item in self.news_items if item.source not in source_names]
+            dropped = len(self.news_items) - len(kept)
+            self._set_news_items(kept)
+        return dropped
+    
+    def _set_news_items(self, items: List[NewsItem]) -> List[NewsItem]:
+        """替换新闻池内容并同步搜索索引（需持有 self.lock），返回新入池的新闻"""
+        old_titles = {item.title for item in self.news_items}
+        new_titles = {item.title for item in items}
+        added = [item for item in items if item.title not in old_titles]
+        removed = [item for item in self.news_items if item.title not in new_titles]
+        self.news_items = items
         
-        enabled_sources = list(self.news_sources.keys())
-        logger.info(f"已启用的新闻源: {enabled_sources}")
+        if self.clusterer is not None:
+            self.clusterer.sync(item.title for item in items)
+        if self.search_index is not None:
+            for item in removed:
+                self.search_index.remove('news', item.title)
+            for item in items:
+                self.search_index.add('news', item)
+        if added or removed:
+            if self.change_feed is not None:
+                with refresh_tracer.span('serialize changes', added=len(added), removed=len(removed)):
+                    self.change_feed.record('news', added=[item.to_dict() for item in added],
+                                            removed=[item.title for item in removed])
+            for listener in self.change_listeners:
+                try:
+                    listener('news')
+                except Exception as e:
+                    pool_logger.error(f"数据变化通知失败: {e}")
+        return added
     
     def start_auto_refresh(self):
         """启动自动刷新线程"""
         if self.refresh_thread is None or not self.refresh_thread.is_alive():
             self.refresh_thread = threading.Thread(target=self._auto_refresh_worker, daemon=True)
             self.refresh_thread.start()
-            logger.info("自动刷新线程已启动")
+            pool_logger.info("自动刷新线程已启动")
     
     def _auto_refresh_worker(self):
-        """自动刷新工作线程"""
+        """自动刷新工作线程，同时监视配置文件变化"""
+        next_refresh = time.monotonic() + self.refresh_interval
         while self.running:
             try:
-                time.sleep(self.refresh_interval)
-                if self.running:
+                time.sleep(min(self.config_check_interval, max(0.0, next_refresh - time.monotonic())))
+                if not self.running:
+                    break
+                if self.config_changed():
+                    self.reload_news_sources_config()
+                if time.monotonic() >= next_refresh:
                     self.refresh_news()
+                    next_refresh = time.monotonic() + self.refresh_interval
             except Exception as e:
-                logger.error(f"自动刷新错误: {e}")
+                pool_logger.error(f"自动刷新错误: {e}")
     
-    def refresh_news(self):
-        """刷新新闻池"""
-        logger.info("开始刷新新闻...")
+    def refresh_news(self) -> Optional[Dict]:
+        """全量刷新新闻池并等待完成；已有全量刷新在进行时加入它"""
+        flight, _ = self.request_refresh(force=True, background=False)
+        flight.wait()
+        return flight.result
+    
+    def request_refresh(self, source: Optional[str] = None, force: bool = False,
+                        background: bool = True) -> Tuple[RefreshFlight, str]:
+        """请求刷新（单飞），source 为新闻源配置键或名称，为空时全量刷新
         
-        new_items = []
-        for source_key, source_config in self.news_sources.items():
-            try:
-                items = self._fetch_news_from_source(source_config)
-                new_items.extend(items)
-                logger.info(f"从 {source_config['name']} 获取到 {len(items)} 条新闻")
-            except Exception as e:
-                logger.error(f"从 {source_config['name']} 获取新闻失败: {e}")
+        同一范围（或全量刷新）正在进行时加入它；距同一范围（或全量刷新）上次完成
+        不足 min_refresh_interval 秒时直接返回上次的结果，force 时不受此限制。
+        返回 (刷新, 'started'|'joined'|'throttled')，未知的新闻源抛出 KeyError。
+        """
+        scope = '*'
+        if source:
+            scope = next((key for key, config in self.news_sources.items()
+                          if source in (key, config.get('name'))), None)
+            if scope is None:
+                raise KeyError(source)
+        
+        with self._refresh_lock:
+            for key in dict.fromkeys((scope, '*')):
+                if key in self._refresh_flights:
+                    return self._refresh_flights[key], 'joined'
+            if not force:
+                for key in dict.fromkeys((scope, '*')):
+                    last = self._last_refresh_flights.get(key)
+                    if last and time.monotonic() - last.finished < self.min_refresh_interval:
+                        return last, 'throttled'
+            flight = RefreshFlight(scope)
+            self._refresh_flights[scope] = flight
+            self._recent_refresh_flights.append(flight)
         
+        if background:
+            threading.Thread(target=self._run_refresh, args=(flight,), daemon=True).start()
+        else:
+            self._run_refresh(flight)
+        return flight, 'started'
+    
+    def get_refresh_flight(self, flight_id: int) -> Optional[RefreshFlight]:
+        """按编号查找最近的刷新，已滚出记录时返回 None"""
+        with self._refresh_lock:
+            return next((flight for flight in self._recent_refresh_flights if flight.id == flight_id), None)
+    
+    def _run_refresh(self, flight: RefreshFlight):
+        """执行一次刷新并唤醒所有等待者"""
+        start = time.perf_counter()
+        try:
+            with refresh_tracer.cycle('refresh', scope=flight.scope):
+                if flight.scope == '*':
+                    pool_logger.info("开始刷新新闻...")
+                    sources = self.news_sources
+                else:
+                    pool_logger.info(f"开始刷新新闻源 {flight.scope}...")
+                    sources = {flight.scope: self.news_sources[flight.scope]}
+                if self.replica is not None:
+                    fetched = self.replica.poll()
+                else:
+                    fetched = self._fetch_and_merge(sources)
+            flight.result = {
+                'fetched_items': fetched,
+                'total_news': len(self.news_items),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+            }
+        except Exception as e:
+            pool_logger.error(f"刷新新闻失败 ({flight.scope}): {e}")
+            flight.result = {'error': str(e)}
+        finally:
+            flight.finished = time.monotonic()
+            with self._refresh_lock:
+                self._refresh_flights.pop(flight.scope, None)
+                self._last_refresh_flights[flight.scope] = flight
+            flight.done.set()
+    
+    def _merge_news_items(self, new_items: List[NewsItem]) -> List[NewsItem]:
+        """合并新抓取的新闻到池中：去重、过期清理并限制池大小，返回新入池的新闻"""
+        waiting_since = time.perf_counter()
         with self.lock:
+            refresh_tracer.record('wait lock', waiting_since)
             # 合并新旧新闻，去重
             all_items = new_items + self.news_items
             unique_items = []
-            seen_titles = set()
+            seen_titles = {}
             
             for item in all_items:
-                if item.title not in seen_titles:
-                    seen_titles.add(item.title)
+                kept = seen_titles.get(item.title)
+                if kept is None:
+                    seen_titles[item.title] = item
                     unique_items.append(item)
+                elif item.duplicates and not kept.duplicates:
+                    # 新抓到的同标题条目沿用池中已合并的其他来源
+                    kept.duplicates = item.duplicates
+            
+            # 近似重复的新闻（同一事件的不同来源、改写标题）合并为一条
+            if self.clusterer is not None:
+                with refresh_tracer.span('cluster', items=len(unique_items)):
+                    unique_items = self.clusterer.collapse(unique_items, {item.title for item in self.news_items})
             
             # 按时间排序，保留最新的
             unique_items.sort(key=lambda x: x.timestamp, reverse=True)
@@ -716,10 +3131,12 @@ class NewsPool:
             fresh_items = [item for item in unique_items if item.timestamp > cutoff_time]
             
             # 限制池大小
-            self.news_items = fresh_items[:self.max_size]
+            with refresh_tracer.span('store'):
+                added = self._set_news_items(fresh_items[:self.max_size])
             self.last_refresh = datetime.now()
             
-            logger.info(f"新闻池刷新完成，当前有 {len(self.news_items)} 条新闻")
+            pool_logger.info(f"新闻池刷新完成，当前有 {len(self.news_items)} 条新闻")
+        return added
     
     def _fetch_news_from_source(self, source_config: Dict) -> List[NewsItem]:
         """从单个新闻源获取新闻"""
@@ -728,88 +3145,102 @@ class NewsPool:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(source_config['url'], headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            news_items = []
-            
-            # 尝试不同的选择器
-            for selector in source_config['selectors']:
-                elements = soup.select(selector)
-                if elements:
-                    logger.info(f"使用选择器 '{selector}' 找到 {len(elements)} 个元素")
-                    break
-            
-            if not elements:
-                logger.warning(f"未找到新闻元素: {source_config['name']}")
+            rule = self._rule_for(source_config)
+            with rule.lock:
+                order = rule.order()
+            if rule.stream:
+                candidates, attempts = self._stream_source_page(rule, order, headers)
+            else:
+                # 同样经由流式读取，超过 max_bytes 时在读取中途断开，而不是下载完整页面后再截断
+                body = b''.join(http_stream(source_config['url'], rule.max_bytes, headers=headers, timeout=10))
+                candidates, attempts = run_parser(parse_source_page, body, rule.config, order)
+            rule.record(attempts)
+            if not candidates:
+                pool_logger.warning(f"未找到新闻元素: {source_config['name']}")
                 return []
             
-            for element in elements[:20]:  # 限制每个源最多20条
+            news_items = []
+            for title, url, news_time, stock_info in candidates:
                 try:
-                    if element.name == 'a':
-                        title = element.get_text(strip=True)
-                        url = element.get('href', '')
-                    else:
-                        link = element.find('a')
-                        if link:
-                            title = link.get_text(strip=True)
-                            url = link.get('href', '')
-                        else:
-                            title = element.get_text(strip=True)
-                            url = ''
+                    # 财联社详情页需要访问页面提取时间和股票信息
+                    if "财联社" in source_config['name'] and url and '/detail/' in url:
+                        with refresh_tracer.span('detail', url=url):
+                            extracted_data = self._fetch_detail_page_data(url)
+                        news_time = extracted_data.get('news_time')
+                        stock_info = extracted_data.get('stock_info')
                     
-                    if title and len(title) > 10:  # 过滤太短的标题
-                        # 处理相对URL
-                        if url and not url.startswith('http'):
-                            if url.startswith('/'):
-                                # 获取基础域名
-                                from urllib.parse import urlparse
-                                parsed_url = urlparse(source_config['url'])
-                                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                                url = f"{base_url}{url}"
-                            else:
-                                url = f"{source_config['url'].rstrip('/')}/{url}"
-                        
-                        # 对财联社来源提取额外信息
-                        news_time = None
-                        stock_info = None
-                        
-                        if "财联社" in source_config['name'] and url:
-                            extracted_data = self._extract_cls_data(url, soup, element)
-                            news_time = extracted_data.get('news_time')
-                            stock_info = extracted_data.get('stock_info')
-                        
-                        news_item = NewsItem(title, url, source_config['name'], news_time, stock_info)
-                        news_items.append(news_item)
+                    news_item = NewsItem(title, url, source_config['name'], news_time, stock_info)
+                    news_items.append(news_item)
                 
                 except Exception as e:
-                    logger.debug(f"处理新闻项错误: {e}")
+                    pool_logger.debug(f"处理新闻项错误: {e}")
                     continue
             
-            return news_items[:20]  # 返回最多20条
+            return news_items
             
         except Exception as e:
-            logger.error(f"获取新闻失败 {source_config['name']}: {e}")
+            pool_logger.error(f"获取新闻失败 {source_config['name']}: {e}")
             return []
     
-    def _extract_cls_data(self, url: str, soup: BeautifulSoup, element) -> Dict:
-        """提取财联社特定数据：时间和股票信息"""
-        result = {'news_time': None, 'stock_info': None}
+    def _stream_source_page(self, rule: ExtractionRule, order: List[int], headers: Dict) -> Tuple[List[Tuple], List[Tuple[int, int]]]:
+        """流式抓取并解析新闻源页面：边下载边用 LinkCounter 增量扫描，有效链接够数即停止读取，
+        然后只对已下载的部分做一次完整解析
         
+        扫描只是估计（有效链接不一定都被优先选择器选中）。只有第一个尝试的选择器就在已下载部分
+        得到超过 max_items 条时才采用前缀的结果：多出的一条说明前面的条目都已完整，且结果与解析
+        整页相同。第一个选择器未命中、由后面的兜底选择器凑够条数时，整页中可能还有第一个选择器
+        的条目，此时继续读完页面再解析一次。
+        """
+        counter = LinkCounter(rule)
+        body = bytearray()
+        chunks = http_stream(rule.config['url'], rule.max_bytes, headers=headers, timeout=10)
         try:
-            # 如果是详情页面，需要访问页面提取信息
-            if '/detail/' in url:
-                result = self._fetch_detail_page_data(url)
-                
-            elif 'telegraph' in url:
-                # 如果是电报页面，直接从当前页面提取
-                result = self._extract_from_telegraph_page(soup, element)
-                
-        except Exception as e:
-            logger.debug(f"提取CLS数据错误: {e}")
-        
-        return result
+            for chunk in chunks:
+                body += chunk
+                if counter.feed_bytes(chunk) > rule.max_items:
+                    break
+            else:
+                return run_parser(parse_source_page, bytes(body), rule.config, order)
+            
+            # 截在最后一个标签开始处，避免切断多字节字符和标签
+            cut = body.rfind(b'<')
+            prefix = bytes(body[:cut]) if cut > 0 else bytes(body)
+            probe_config = dict(rule.config, max_items=rule.max_items + 1)
+            items, attempts = run_parser(parse_source_page, prefix, probe_config, order)
+            if len(items) > rule.max_items and len(attempts) == 1:
+                return items[:rule.max_items], [(index, min(count, rule.max_items)) for index, count in attempts]
+            for chunk in chunks:
+                body += chunk
+            return run_parser(parse_source_page, bytes(body), rule.config, order)
+        finally:
+            chunks.close()
+    
+    def _rule_for(self, source_config: Dict) -> ExtractionRule:
+        """获取新闻源的编译规则，配置变化时重新编译"""
+        rule = self.extraction_rules.get(source_config['name'])
+        if rule is None or rule.config != source_config:
+            rule = ExtractionRule(source_config)
+            self.extraction_rules[source_config['name']] = rule
+            share_page_rule(rule)
+        return rule
+    
+    def _compile_rules(self):
+        """为已启用的新闻源编译抽取规则，配置未变的源保留已学习的顺序和统计"""
+        rules = {}
+        for source_config in self.news_sources.values():
+            rule = self.extraction_rules.get(source_config['name'])
+            if rule is None or rule.config != source_config:
+                rule = ExtractionRule(source_config)
+            share_page_rule(rule)
+            rules[source_config['name']] = rule
+        self.extraction_rules = rules
+    
+    def get_source_stats(self) -> Dict:
+        """各新闻源的选择器命中统计"""
+        return {
+            key: self._rule_for(source_config).to_dict()
+            for key, source_config in self.news_sources.items()
+        }
     
     def _fetch_detail_page_data(self, url: str) -> Dict:
         """访问详情页面获取时间和股票信息"""
@@ -820,91 +3251,13 @@ class NewsPool:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             response.raise_for_status()
             
-            detail_soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 提取时间信息 - 财联社详情页的时间格式
-            # 查找可能的时间元素
-            time_selectors = [
-                '.time',
-                '.publish-time',
-                '[class*="time"]',
-                '.article-time',
-                'time'
-            ]
-            
-            for selector in time_selectors:
-                time_element = detail_soup.select_one(selector)
-                if time_element:
-                    time_text = time_element.get_text(strip=True)
-                    if time_text and ('年' in time_text or '月' in time_text or ':' in time_text):
-                        result['news_time'] = time_text
-                        break
-            
-            # 提取股票信息 - 查找股票相关元素
-            stock_selectors = [
-                '.industry-stock a',
-                '[class*="stock"] a',
-                'a[href*="stock"]'
-            ]
-            
-            for selector in stock_selectors:
-                stock_elements = detail_soup.select(selector)
-                if stock_elements:
-                    stock_items = []
-                    for elem in stock_elements[:5]:  # 最多5只股票
-                        name_span = elem.find('span', class_='c-222') or elem.find('span')
-                        change_span = elem.find('span', class_='c-de0422') or elem.find_all('span')[-1] if elem.find_all('span') else None
-                        
-                        if name_span and change_span:
-                            name = name_span.get_text(strip=True)
-                            change = change_span.get_text(strip=True)
-                            if '+' in change or '-' in change or '%' in change:
-                                stock_items.append(f"{name} {change}")
-                    
-                    if stock_items:
-                        result['stock_info'] = ' '.join(stock_items)
-                        break
+            result['news_time'], result['stock_info'] = run_parser(parse_detail_page, response.content)
                         
         except Exception as e:
-            logger.debug(f"获取详情页面数据错误: {e}")
-            
-        return result
-    
-    def _extract_from_telegraph_page(self, soup: BeautifulSoup, element) -> Dict:
-        """从电报页面提取数据"""
-        result = {'news_time': None, 'stock_info': None}
-        
-        try:
-            # 提取时间信息
-            time_element = soup.find('span', class_='telegraph-time-box')
-            if time_element:
-                time_text = time_element.get_text(strip=True)
-                if time_text and ':' in time_text:
-                    # 格式化时间（添加今天的日期）
-                    today = datetime.now().strftime('%Y-%m-%d')
-                    result['news_time'] = f"{today} {time_text}"
-            
-            # 提取股票信息
-            stock_container = soup.find('div', class_='industry-stock')
-            if stock_container:
-                stock_items = []
-                stock_links = stock_container.find_all('a')
-                for link in stock_links[:5]:  # 最多5只股票
-                    name_span = link.find('span', class_='c-222')
-                    change_span = link.find('span', class_='c-de0422')
-                    if name_span and change_span:
-                        name = name_span.get_text(strip=True)
-                        change = change_span.get_text(strip=True)
-                        stock_items.append(f"{name} {change}")
-                
-                if stock_items:
-                    result['stock_info'] = ' '.join(stock_items)
-                    
-        except Exception as e:
-            logger.debug(f"从电报页面提取数据错误: {e}")
+            pool_logger.debug(f"获取详情页面数据错误: {e}")
             
         return result
     
@@ -921,6 +3274,11 @@ class NewsPool:
             
             return self.news_items[rotation_index]
     
+    def get_items(self) -> List[Dict]:
+        """池中全部新闻（按抓取时间倒序）"""
+        with self.lock:
+            return [item.to_dict() for item in self.news_items]
+    
     def get_random_news(self, count: int = 5) -> List[NewsItem]:
         """获取随机新闻"""
         with self.lock:
@@ -931,22 +3289,578 @@ class NewsPool:
     def get_status(self) -> Dict:
         """获取服务状态"""
         with self.lock:
-            return {
+            status = {
                 'total_news': len(self.news_items),
                 'last_refresh': self.last_refresh.isoformat() if self.last_refresh else None,
                 'sources': list(self.news_sources.keys()),
-                'auto_refresh_interval': self.refresh_interval
+                'auto_refresh_interval': self.refresh_interval,
+                'refreshing': list(self._refresh_flights)
             }
+        if self.clusterer is not None:
+            status['clustering'] = self.clusterer.get_stats()
+        if self.change_feed is not None:
+            status['change_seq'] = self.change_feed.seq
+        if self.replica is not None:
+            status['replica'] = self.replica.get_status()
+        return status
     
     def stop(self):
         """停止服务"""
         self.running = False
+        if self.replica is not None:
+            self.replica.stop()
         if self.refresh_thread:
             self.refresh_thread.join(timeout=1)
 
+class ReplicaFollower:
+    """只读副本：轮询主实例的 /changes 并应用到本地数据池，自身不访问任何上游
+    
+    首次同步拉取全量快照，之后按序号取增量；主实例重启或副本落后太多时自动改取快照。
+    """
+    def __init__(self, primary_url: str, news_pool: NewsPool, biga_pool: Optional[BigAPool] = None,
+                 poll_interval: float = 5.0, timeout: float = 10.0):
+        self.primary_url = primary_url.rstrip('/')
+        self.news_pool = news_pool
+        self.biga_pool = biga_pool
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.feed_id = None
+        self.seq = None
+        self.applied = 0
+        self.last_sync = None
+        self.last_error = None
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+    
+    def start(self):
+        """先同步一次（副本启动即有数据），再启动后台轮询"""
+        try:
+            self.poll()
+        except Exception as e:
+            self.last_error = str(e)
+            pool_logger.warning(f"首次从主实例同步失败: {e}")
+        self.thread.start()
+    
+    def _worker(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.last_error = str(e)
+                pool_logger.warning(f"从主实例同步失败: {e}")
+    
+    def poll(self) -> int:
+        """拉取并应用主实例的新变更（一次取不完时连续拉取），返回应用的变更数"""
+        import requests
+        with self._poll_lock:
+            applied = 0
+            while True:
+                params = {} if self.seq is None else {'since': self.seq, 'feed': self.feed_id}
+                response = requests.get(f"{self.primary_url}/changes", params=params, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                if data.get('reset'):
+                    self._apply_snapshot(data['snapshot'])
+                    applied += 1
+                for change in data['changes']:
+                    self._apply_change(change)
+                    applied += 1
+                self.feed_id = data['feed_id']
+                self.seq = data['seq']
+                if not data.get('more'):
+                    break
+            self.applied += applied
+            self.last_sync = datetime.now()
+            self.last_error = None
+            if applied:
+                pool_logger.info(f"已从主实例同步 {applied} 条变更 (seq={self.seq})")
+            return applied
+    
+    def _apply_snapshot(self, snapshot: Dict):
+        self.news_pool.apply_remote_changes(snapshot.get('news', []), reset=True)
+        if self.biga_pool is not None:
+            for kind in ('telegraph', 'indices', 'sectors'):
+                if kind in snapshot:
+                    self.biga_pool.apply_remote_change(kind, snapshot[kind])
+    
+    def _apply_change(self, change: Dict):
+        if change['kind'] == 'news':
+            self.news_pool.apply_remote_changes(change['added'], change['removed'])
+        elif self.biga_pool is not None:
+            self.biga_pool.apply_remote_change(change['kind'], change['items'])
+    
+    def get_status(self) -> Dict:
+        return {
+            'primary': self.primary_url,
+            'feed_id': self.feed_id,
+            'seq': self.seq,
+            'applied_changes': self.applied,
+            'last_sync': self.last_sync.isoformat() if self.last_sync else None,
+            'last_error': self.last_error
+        }
+    
+    def stop(self):
+        self._stop.set()
+
+# 状态栏文本只在这里渲染：快照文件和 /next?format=line、/biga/next?format=line 共用，
+# status_line.sh / status_line_biga.sh 只负责原样输出
+_SOURCE_ICONS = {
+    '36kr': '💼', 'TechCrunch': '🚀', '虎嗅': '🦆', '钛媒体': '🔧', '雷锋网': '⚡',
+    '财联社电报': '📈', '财联社盘面': '💹', '财联社深度': '📊',
+}
+_INDEX_SHORT_NAMES = {'上证指数': '沪指', '深证成指': '深指', '创业板指': '创业', '科创50': '科创', '北证50': '北证'}
+_STOCK_CHANGE_RE = re.compile(r'^[+-][0-9]+\.[0-9]+%$')
+_FULL_DATE_TIME_RE = re.compile(r'[0-9]{4}年[0-9]{2}月[0-9]{2}日\s+([0-9]{1,2}:[0-9]{2})')
+_HMS_RE = re.compile(r'([0-9]{1,2}:[0-9]{2}:[0-9]{2})')
+_HM_RE = re.compile(r'([0-9]{1,2}:[0-9]{2})')
+_CLS_TITLE_RE = re.compile(r'【([^】]+)】')
+
+def _clean_title(title: str, source: str) -> str:
+    title = ' '.join(title.split())
+    if '财联社' in source:
+        match = _CLS_TITLE_RE.search(title)
+        if match:
+            title = match.group(1)
+    return title
+
+def _hyperlink(text: str, url: Optional[str], enable_links: bool) -> str:
+    if enable_links and url:
+        return f"\033]8;;{url}\033\\{text}\033]8;;\033\\"
+    return text
+
+def color_stock_info(stock_info: str) -> str:
+    """股票涨跌幅着色：涨红跌绿"""
+    parts = []
+    name = ''
+    for word in stock_info.split():
+        if _STOCK_CHANGE_RE.match(word):
+            color = '31' if word.startswith('+') else '32'
+            parts.append(f"{name} \033[{color}m{word}\033[0m")
+            name = ''
+        else:
+            name = f"{name} {word}" if name else word
+    if name:
+        parts.append(name)
+    return ' '.join(parts)
+
+def render_news_status_line(item: Optional[Dict], enable_links: bool = True, max_length: int = 120) -> str:
+    """渲染 /next 的状态栏文本"""
+    if not item or not item.get('title'):
+        return "📰 News service connecting..."
+    source = item.get('source', '')
+    title = _clean_title(item['title'], source)
+    icon = _SOURCE_ICONS.get(source, '📰')
+    
+    time_display = ''
+    news_time = item.get('news_time')
+    if news_time:
+        simplified = None
+        match = _FULL_DATE_TIME_RE.search(news_time) or _HMS_RE.search(news_time) or _HM_RE.search(news_time)
+        if match:
+            simplified = match.group(1)[:5]
+        if simplified:
+            time_display = f"\033[2m{simplified}\033[0m "
+    
+    # 先按可见文本截断再加 OSC 8 超链接，转义序列不计入长度，也不会被截断
+    display_text = f"{icon} {title}"
+    if len(display_text) > max_length:
+        display_text = display_text[:max(0, max_length - 3)] + '...'
+    line = time_display + _hyperlink(display_text, item.get('url'), enable_links)
+    if item.get('stock_info'):
+        line += f" | 📈 {color_stock_info(item['stock_info'])}"
+    return line
+
+def render_biga_status_line(content: Optional[Dict], enable_links: bool = True) -> str:
+    """渲染 /biga/next 的状态栏文本"""
+    content = content or {}
+    if content.get('type') == 'telegraph':
+        telegraph = content.get('content') or {}
+        if telegraph.get('title'):
+            source = telegraph.get('source', '')
+            title = _clean_title(telegraph['title'], source)
+            icon = '📈' if source == '财联社电报' else '📰'
+            time_display = ''
+            news_time = telegraph.get('news_time')
+            if news_time:
+                match = _HMS_RE.search(news_time)
+                if match:
+                    time_display = f"{match.group(1)[:5]} "
+                else:
+                    match = _HM_RE.search(news_time)
+                    time_display = f"{match.group(1) if match else news_time[:5]} "
+            line = time_display + _hyperlink(f"{icon} {title}", telegraph.get('url'), enable_links)
+            if telegraph.get('stock_info'):
+                line += f" | 💹 {color_stock_info(telegraph['stock_info'])}"
+            return line
+    elif content.get('type') == 'market':
+        index_parts = []
+        for index in content.get('indices', []):
+            name = _INDEX_SHORT_NAMES.get(index.get('name', '未知'), index.get('name', '未知'))
+            change = index.get('change_percent', 0)
+            label = f"{name}{index.get('current_price', 0):.0f}"
+            if change > 0:
+                index_parts.append(f"{label}\033[31m{change:+.2f}%\033[0m")
+            elif change < 0:
+                index_parts.append(f"{label}\033[32m{change:+.2f}%\033[0m")
+            else:
+                index_parts.append(f"{label}{change:+.2f}%")
+        gainers = []
+        losers = []
+        for sector in content.get('sectors', []):
+            change = sector.get('change_percent', 0)
+            if sector.get('sector_type', 'gainer') == 'gainer':
+                gainers.append(f"\033[31m{sector.get('name', '未知板块')}{change:+.1f}%\033[0m")
+            else:
+                losers.append(f"\033[32m{sector.get('name', '未知板块')}{change:+.1f}%\033[0m")
+        sector_parts = []
+        if gainers:
+            sector_parts.append('🔥' + ' '.join(gainers))
+        if losers:
+            sector_parts.append('❄️' + ' '.join(losers))
+        parts = [part for part in (' '.join(index_parts), ' | '.join(sector_parts)) if part]
+        if parts:
+            return ' | '.join(parts)
+    return "📊 BigA模式连接中..."
+
+_statusline_config_cache = {'mtime': None, 'config': (True, 120)}
+_statusline_config_lock = threading.Lock()
+
+def load_statusline_config() -> Tuple[bool, int]:
+    """读取状态栏显示配置 (enable_links, max_length)，文件修改后才重新读取"""
+    try:
+        mtime = os.stat(STATUSLINE_CONFIG_FILE).st_mtime
+    except OSError:
+        mtime = None
+    with _statusline_config_lock:
+        cache = _statusline_config_cache
+        if mtime != cache['mtime']:
+            cache['mtime'] = mtime
+            enable_links, max_length = True, 120
+            if mtime is not None:
+                try:
+                    with open(STATUSLINE_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                    enable_links = config.get('enable_links', True) is not False
+                    max_length = int(config.get('max_length', 120))
+                    if max_length < 20:
+                        max_length = 120
+                except (ValueError, OSError) as e:
+                    logger.warning(f"读取状态栏配置失败: {e}")
+            cache['config'] = (enable_links, max_length)
+        return cache['config']
+
+def default_snapshot_path(port: int) -> str:
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, f"news_service_{port}.snapshot")
+
+class SnapshotPublisher:
+    """把当前轮播内容和渲染好的状态栏文本发布到文件，读取方不需要访问 HTTP 接口
+    
+    文件共四行：发布时间（Unix 秒）、/next 状态栏文本、/biga/next 状态栏文本、
+    JSON（published_at, next, biga_next）。数据变化时立即发布，此外每秒检查一次
+    轮播位置，内容不变时每 heartbeat 秒刷新一次发布时间。先写同目录临时文件再 rename，
+    读取方不会读到写了一半的内容。
+    """
+    
+    def __init__(self, path: str, news_pool: 'NewsPool', biga_pool: Optional[BigAPool] = None,
+                 heartbeat: float = 10.0):
+        self.path = path
+        self.news_pool = news_pool
+        self.biga_pool = biga_pool
+        self.heartbeat = heartbeat
+        self.published = 0
+        self._last_body: Optional[tuple] = None
+        self._last_write = 0.0
+        self._wakeup = threading.Event()
+        self.running = True
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+    
+    def notify(self, kind: Optional[str] = None):
+        """数据变化时调用，立即重新发布"""
+        self._wakeup.set()
+    
+    def _worker(self):
+        while self.running:
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error(f"发布快照失败: {e}")
+            # 等到下一个整秒（轮播位置按整秒切换）或数据变化
+            self._wakeup.wait(1.0 - time.time() % 1.0 + 0.001)
+            self._wakeup.clear()
+    
+    def publish(self) -> bool:
+        """内容有变化（或超过 heartbeat 秒）时写入快照，返回是否写入"""
+        enable_links, max_length = load_statusline_config()
+        news_item = self.news_pool.get_next_news()
+        next_content = news_item.to_dict() if news_item else None
+        biga_content = self.biga_pool.get_display_content() if self.biga_pool else None
+        
+        status_lines = '\n'.join(line.replace('\n', ' ') for line in (
+            render_news_status_line(next_content, enable_links, max_length),
+            render_biga_status_line(biga_content, enable_links) if self.biga_pool else '',
+        ))
+        payload = {'next': next_content, 'biga_next': biga_content}
+        body = (status_lines, json.dumps(payload, ensure_ascii=False, sort_keys=True))
+        now = time.time()
+        if body == self._last_body and now - self._last_write < self.heartbeat:
+            return False
+        
+        payload['published_at'] = round(now, 3)
+        data = f"{int(now)}\n{status_lines}\n{json.dumps(payload, ensure_ascii=False)}\n"
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._last_body = body
+        self._last_write = now
+        self.published += 1
+        return True
+    
+    def stop(self):
+        """停止发布并删除快照文件，读取方随即回退到 HTTP 接口"""
+        self.running = False
+        self._wakeup.set()
+        self.thread.join(timeout=2)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+# 调试端点 /debug/* 只在设置了 NEWS_SERVICE_DEBUG_TOKEN 时开放，请求需带 token=<同值>
+DEBUG_TOKEN = os.getenv('NEWS_SERVICE_DEBUG_TOKEN', '')
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """采样式剖析：后台线程按固定间隔抓取所有线程的调用栈
+    
+    两种模式：
+    - cpu（默认）：每个栈按该线程自上次采样以来消耗的 CPU 时间（微秒）加权，
+      阻塞在 sleep、锁、socket 上的空闲线程不消耗 CPU，不计入结果
+    - wall：每次采样每个线程计 1，包含等待，用于查看线程卡在哪里
+    平台不支持读取其他线程的 CPU 时钟时退回 wall。
+    
+    只在剖析期间运行，平时没有任何开销。结果可导出为 collapsed stacks
+    （flamegraph.pl、speedscope 可直接打开）或按函数汇总的文本。
+    """
+    MODES = ('cpu', 'wall')
+    
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.seconds = 0.0
+        self.mode = 'cpu'
+    
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+    
+    def start(self, seconds: float, mode: str = 'cpu') -> bool:
+        """开始剖析 seconds 秒，已在进行时返回 False"""
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {', '.join(self.MODES)}")
+        if mode == 'cpu' and not hasattr(time, 'pthread_getcpuclockid'):
+            mode = 'wall'
+        with self.lock:
+            if self.running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.started_at = datetime.now()
+            self.seconds = seconds
+            self.mode = mode
+            self.thread = threading.Thread(target=self._run, args=(seconds, mode), name='profiler', daemon=True)
+            self.thread.start()
+            return True
+    
+    def _run(self, seconds: float, mode: str):
+        own = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        stacks = Counter()
+        samples = 0
+        last_cpu: Dict[int, int] = {}
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident not in names:
+                    continue
+                weight = 1
+                if mode == 'cpu':
+                    # 两次采样之间消耗的 CPU 时间记在本次采到的栈上，空闲线程为 0
+                    try:
+                        cpu = time.clock_gettime_ns(time.pthread_getcpuclockid(ident))
+                    except OSError:
+                        continue
+                    previous = last_cpu.get(ident)
+                    last_cpu[ident] = cpu
+                    weight = (cpu - previous) // 1000 if previous is not None else 0
+                    if weight <= 0:
+                        continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names[ident])
+                stacks[tuple(reversed(stack))] += weight
+            samples += 1
+            time.sleep(self.interval)
+        with self.lock:
+            self.stacks = stacks
+            self.samples = samples
+        logger.info(f"剖析完成 ({mode}): {seconds}s, {samples} 次采样")
+    
+    def collapsed(self) -> str:
+        """collapsed stacks 格式：线程;外层函数;...;内层函数 权重（cpu 模式为 CPU 微秒，wall 模式为采样次数）"""
+        with self.lock:
+            return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+    
+    def summary(self, top: int = 30) -> str:
+        """按线程和函数汇总的文本：self 为位于栈顶的权重，total 为出现在栈中的权重，均为占总权重的比例"""
+        with self.lock:
+            stacks = dict(self.stacks)
+            samples = self.samples
+            mode = self.mode
+        weight = sum(stacks.values())
+        threads = Counter()
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in stacks.items():
+            threads[stack[0]] += count
+            self_counts[stack[-1]] += count
+            for label in set(stack[1:]):
+                total_counts[label] += count
+        
+        def percent(count):
+            return 100.0 * count / weight if weight else 0.0
+        
+        if mode == 'cpu':
+            header = f"mode: cpu (weighted by per-thread CPU time, idle threads excluded)  cpu: {weight / 1000:.1f}ms"
+            unit = 'CPU time'
+        else:
+            header = 'mode: wall-clock (every live thread counted per sample, including waiting)'
+            unit = 'samples'
+        lines = [f"started: {self.started_at.isoformat() if self.started_at else '-'}  "
+                 f"seconds: {self.seconds}  samples: {samples}  interval: {self.interval * 1000:.0f}ms", header, '',
+                 f"threads (share of {unit}):"]
+        lines += [f"  {percent(count):6.1f}%  {name}" for name, count in threads.most_common()]
+        for title, counts in (('self', self_counts), ('total', total_counts)):
+            lines += ['', f"top {top} functions by {title} (share of {unit}, summed over threads):"]
+            lines += [f"  {percent(count):6.1f}%  {label}" for label, count in counts.most_common(top)]
+        return '\n'.join(lines) + '\n'
+    
+    def get_status(self) -> Dict:
+        return {
+            'running': self.running,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'seconds': self.seconds,
+            'mode': self.mode,
+            'samples': self.samples
+        }
+
+class MemoryTracker:
+    """基于 tracemalloc 的分配快照：首次使用时开始跟踪并记录基线，之后的快照与基线比较
+    
+    tracemalloc 只在首次请求后开启，stop() 后不再有开销。
+    """
+    def __init__(self, frames: int = 5):
+        self.frames = frames
+        self.lock = threading.Lock()
+        self.baseline = None
+        self.baseline_at = None
+    
+    def _take(self) -> 'tracemalloc.Snapshot':
+        import tracemalloc
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+    
+    def start(self) -> bool:
+        """开始跟踪并记录基线，已在跟踪时返回 False"""
+        import tracemalloc
+        with self.lock:
+            if tracemalloc.is_tracing():
+                return False
+            tracemalloc.start(self.frames)
+            self.baseline = self._take()
+            self.baseline_at = datetime.now()
+            logger.info("tracemalloc 已开启，基线已记录")
+            return True
+    
+    def reset_baseline(self):
+        with self.lock:
+            self.baseline = self._take()
+            self.baseline_at = datetime.now()
+    
+    def snapshot(self) -> 'tracemalloc.Snapshot':
+        with self.lock:
+            return self._take()
+    
+    def summary(self, snapshot: 'tracemalloc.Snapshot', top: int = 30, key_type: str = 'lineno') -> str:
+        """与基线相比增长最多的分配位置"""
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        with self.lock:
+            baseline = self.baseline
+            baseline_at = self.baseline_at
+        stats = snapshot.compare_to(baseline, key_type)
+        lines = [f"baseline: {baseline_at.isoformat()}  traced: {current / 1024:.1f} KiB  peak: {peak / 1024:.1f} KiB",
+                 '', f"top {top} allocation sites by growth since baseline ({key_type}):"]
+        for stat in stats[:top]:
+            frame = stat.traceback[-1]
+            lines.append(f"  {stat.size_diff / 1024:+10.1f} KiB  {stat.count_diff:+7d} blocks  "
+                         f"{stat.size / 1024:10.1f} KiB total  {frame.filename}:{frame.lineno}")
+            if key_type == 'traceback':
+                lines += [f"        {line}" for line in stat.traceback.format(most_recent_first=True)[2:]]
+        return '\n'.join(lines) + '\n'
+    
+    def stop(self):
+        import tracemalloc
+        with self.lock:
+            tracemalloc.stop()
+            self.baseline = None
+            self.baseline_at = None
+            logger.info("tracemalloc 已关闭")
+
+sampling_profiler = SamplingProfiler()
+memory_tracker = MemoryTracker()
+
+def parse_since(value: Optional[str]) -> Optional[float]:
+    """解析 since 参数：Unix 时间戳、ISO 时间或当天的 HH:MM[:SS]"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if re.match(r'^\d{1,2}:\d{2}(:\d{2})?$', value):
+        parts = [int(part) for part in value.split(':')] + [0]
+        return datetime.combine(datetime.now().date(), dt_time(parts[0], parts[1], parts[2])).timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
 class NewsAPIHandler(BaseHTTPRequestHandler):
     """HTTP API处理器"""
     
+    def do_POST(self):
+        path = urllib.parse.urlparse(self.path).path
+        try:
+            if path == '/alerts/watchlist':
+                self._handle_alerts_watchlist_update()
+            else:
+                self._send_error(404, "Not Found")
+        except Exception as e:
+            api_logger.error(f"API错误: {e}")
+            self._send_error(500, str(e))
+    
     def do_GET(self):
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
@@ -956,36 +3870,58 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
             if path == '/status':
                 self._handle_status()
             elif path == '/next':
-                self._handle_next()
+                self._handle_next(query_params)
             elif path == '/random':
                 count = int(query_params.get('count', ['5'])[0])
                 self._handle_random(count)
             elif path == '/refresh':
-                self._handle_refresh()
+                self._handle_refresh(query_params)
+            elif path == '/reload':
+                self._handle_reload()
+            elif path == '/sources':
+                self._handle_sources()
+            elif path == '/search':
+                self._handle_search(query_params)
+            elif path == '/alerts':
+                self._handle_alerts(query_params)
+            elif path == '/alerts/watchlist':
+                self._handle_alerts_watchlist(query_params)
+            elif path == '/history':
+                self._handle_history(query_params)
+            elif path == '/changes':
+                self._handle_changes(query_params)
+            elif path.startswith('/debug/'):
+                self._handle_debug(path, query_params)
             # BigA模式API端点
             elif path == '/biga/status':
                 self._handle_biga_status()
             elif path == '/biga/next':
-                self._handle_biga_next()
+                self._handle_biga_next(query_params)
             elif path == '/biga/indices':
                 self._handle_biga_indices()
             elif path == '/biga/sectors':
                 self._handle_biga_sectors()
             elif path == '/biga/telegraph':
-                self._handle_biga_telegraph()
+                self._handle_biga_telegraph(query_params)
             else:
                 self._send_error(404, "Not Found")
         except Exception as e:
-            logger.error(f"API错误: {e}")
+            api_logger.error(f"API错误: {e}")
             self._send_error(500, str(e))
     
     def _handle_status(self):
         status = news_pool.get_status()
+        status['upstream'] = upstream_fetcher.get_stats()
         self._send_json_response(status)
     
-    def _handle_next(self):
+    def _handle_next(self, query_params: Dict):
+        """下一条轮播新闻；format=line 时返回渲染好的状态栏文本"""
         news_item = news_pool.get_next_news()
-        if news_item:
+        if query_params.get('format', [''])[0] == 'line':
+            enable_links, max_length = load_statusline_config()
+            line = render_news_status_line(news_item.to_dict() if news_item else None, enable_links, max_length)
+            self._send_text_response(line.replace('\n', ' ') + '\n')
+        elif news_item:
             self._send_json_response(news_item.to_dict())
         else:
             self._send_json_response({'error': 'No news available'})
@@ -995,9 +3931,263 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
         response = [item.to_dict() for item in news_items]
         self._send_json_response(response)
     
-    def _handle_refresh(self):
-        threading.Thread(target=news_pool.refresh_news, daemon=True).start()
-        self._send_json_response({'message': 'Refresh started'})
+    def _handle_refresh(self, query_params: Dict):
+        """手动刷新（单飞）：/refresh?source= 立即返回刷新编号，/refresh?flight=<编号> 查询进度和结果
+        
+        HTTP 服务是单线程的，这里不等待刷新完成，否则等待期间状态栏的 /next 请求全部排队超时。
+        """
+        if 'flight' in query_params:
+            try:
+                flight_id = int(query_params['flight'][0])
+            except ValueError as e:
+                self._send_error(400, f"Invalid parameter: {e}")
+                return
+            flight = news_pool.get_refresh_flight(flight_id)
+            if flight is None:
+                self._send_error(404, f"Unknown refresh flight: {flight_id}")
+                return
+            self._send_json_response(flight.to_dict())
+            return
+        
+        source = query_params.get('source', [None])[0]
+        try:
+            flight, status = news_pool.request_refresh(source)
+        except KeyError:
+            self._send_error(404, f"Unknown source: {source}")
+            return
+        
+        messages = {
+            'started': 'Refresh started',
+            'joined': 'Refresh already in progress',
+            'throttled': 'Refreshed recently'
+        }
+        response = {'message': messages[status], 'status': status, 'poll': f"/refresh?flight={flight.id}"}
+        response.update(flight.to_dict())
+        self._send_json_response(response)
+    
+    def _handle_reload(self):
+        """重新加载新闻源配置，新增和变更的源在后台抓取"""
+        result = news_pool.reload_news_sources_config(background=True)
+        self._send_json_response(result)
+    
+    def _handle_sources(self):
+        """各新闻源的选择器命中统计"""
+        self._send_json_response(news_pool.get_source_stats())
+    
+    def _handle_search(self, query_params: Dict):
+        """全文搜索新闻和电报：/search?q=&source=&since=&limit="""
+        query = query_params.get('q', [''])[0].strip()
+        if not query:
+            self._send_error(400, "Missing query parameter: q")
+            return
+        source = query_params.get('source', [None])[0]
+        try:
+            limit = max(1, min(int(query_params.get('limit', ['20'])[0]), 200))
+            since = parse_since(query_params.get('since', [None])[0])
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        
+        start = time.perf_counter()
+        results = search_index.search(query, source=source, since=since, limit=limit)
+        self._send_json_response({
+            'query': query,
+            'count': len(results),
+            'took_ms': round((time.perf_counter() - start) * 1000, 3),
+            'results': results
+        })
+    
+    def _handle_alerts(self, query_params: Dict):
+        """关键词提醒：/alerts?since=&limit="""
+        try:
+            limit = max(1, min(int(query_params.get('limit', ['100'])[0]), 500))
+            since = parse_since(query_params.get('since', [None])[0])
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        alerts = alert_manager.get_alerts(since=since, limit=limit)
+        self._send_json_response({
+            'count': len(alerts),
+            'stats': alert_manager.get_stats(),
+            'alerts': alerts
+        })
+    
+    def _handle_alerts_watchlist(self, query_params: Dict):
+        """列出关注列表；修改只能通过 POST（见 _handle_alerts_watchlist_update）"""
+        if 'name' in query_params or 'keywords' in query_params:
+            self.send_response(405)
+            self.send_header('Allow', 'POST')
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.end_headers()
+            self.wfile.write("Use POST with a JSON body to change watchlists".encode('utf-8'))
+            return
+        self._send_json_response(alert_manager.get_watchlists())
+    
+    def _handle_alerts_watchlist_update(self):
+        """注册关注列表：POST /alerts/watchlist，JSON 请求体 {"name": "", "keywords": ["a", "b"]}（keywords 为空时删除）
+        
+        只接受 application/json：浏览器跨站提交表单时无法带这个类型，网页不能借用户的浏览器改动关注列表。
+        """
+        content_type = self.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_error(415, "Content-Type must be application/json")
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > 65536:
+                raise ValueError("request body too large")
+            data = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+            name = str(data.get('name', '')).strip()
+            keywords = data.get('keywords') or []
+            if isinstance(keywords, str):
+                keywords = keywords.split(',')
+            if not name or not isinstance(keywords, list):
+                raise ValueError("name and keywords are required")
+        except (ValueError, AttributeError) as e:
+            self._send_error(400, f"Invalid request: {e}")
+            return
+        alert_manager.set_watchlist(name, [str(keyword) for keyword in keywords])
+        self._send_json_response(alert_manager.get_watchlists())
+    
+    def _handle_history(self, query_params: Dict):
+        """历史归档分页：/history?date=&source=&since=&cursor=&limit="""
+        if archive is None:
+            self._send_error(503, "Archive disabled")
+            return
+        try:
+            result = archive.history(
+                query_params.get('date', [datetime.now().strftime('%Y-%m-%d')])[0],
+                source=query_params.get('source', [None])[0],
+                cursor=query_params.get('cursor', [None])[0],
+                since=parse_since(query_params.get('since', [None])[0]),
+                limit=max(1, min(int(query_params.get('limit', ['50'])[0]), 500))
+            )
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        self._send_json_response(result)
+    
+    def _handle_changes(self, query_params: Dict):
+        """变更流：/changes?since=<seq>&feed=&limit=，不带 since、序号已过期或实例已重启时附带全量快照"""
+        change_feed = news_pool.change_feed
+        if change_feed is None:
+            self._send_error(503, "Change feed disabled")
+            return
+        try:
+            since = query_params.get('since', [None])[0]
+            since = int(since) if since is not None else None
+            limit = max(1, min(int(query_params.get('limit', ['500'])[0]), 2000))
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        
+        result = None
+        if since is not None:
+            result = change_feed.read(since, query_params.get('feed', [None])[0], limit)
+        if result is None:
+            # 先取序号再取快照：快照可能已包含其后的变更，副本重复应用是幂等的
+            stats = change_feed.get_stats()
+            snapshot = {'news': news_pool.get_items()}
+            if biga_pool is not None:
+                snapshot.update(telegraph=biga_pool.get_telegraph_timeline(), indices=biga_pool.get_indices(),
+                                sectors=biga_pool.get_sectors())
+            result = {'feed_id': stats['feed_id'], 'seq': stats['seq'], 'more': False,
+                      'changes': [], 'reset': True, 'snapshot': snapshot}
+        self._send_json_response(result)
+    
+    def _handle_debug(self, path: str, query_params: Dict):
+        """调试端点，需要 NEWS_SERVICE_DEBUG_TOKEN"""
+        if not DEBUG_TOKEN:
+            self._send_error(404, "Not Found")
+            return
+        if query_params.get('token', [''])[0] != DEBUG_TOKEN:
+            self._send_error(403, "Forbidden")
+            return
+        try:
+            top = max(1, min(int(query_params.get('top', ['30'])[0]), 500))
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        output_format = query_params.get('format', ['text'])[0]
+        if path == '/debug/profile':
+            self._handle_debug_profile(query_params, output_format, top)
+        elif path == '/debug/memory':
+            self._handle_debug_memory(query_params, output_format, top)
+        elif path == '/debug/trace':
+            self._handle_debug_trace(query_params, output_format)
+        else:
+            self._send_error(404, "Not Found")
+    
+    def _handle_debug_profile(self, query_params: Dict, output_format: str, top: int):
+        """/debug/profile?seconds=N&mode=cpu|wall 在后台开始剖析；不带 seconds 时取最近一次结果（format=text|collapsed）
+        
+        HTTP 服务是单线程的，剖析期间仍正常响应其他请求，剖析结果才能覆盖请求处理。
+        """
+        if 'seconds' in query_params:
+            try:
+                seconds = max(0.1, min(float(query_params['seconds'][0]), 300.0))
+                started = sampling_profiler.start(seconds, query_params.get('mode', ['cpu'])[0])
+            except ValueError as e:
+                self._send_error(400, f"Invalid parameter: {e}")
+                return
+            if not started:
+                self._send_error(409, "Profile already running")
+                return
+            self._send_json_response(sampling_profiler.get_status())
+        elif sampling_profiler.running:
+            self._send_json_response(sampling_profiler.get_status())
+        elif output_format == 'collapsed':
+            self._send_text_response(sampling_profiler.collapsed(), filename='news_service.collapsed')
+        else:
+            self._send_text_response(sampling_profiler.summary(top))
+    
+    def _handle_debug_memory(self, query_params: Dict, output_format: str, top: int):
+        """/debug/memory：首次请求开启 tracemalloc 并记录基线，之后返回与基线的差异
+        
+        reset=1 重新记录基线，stop=1 关闭跟踪，format=snapshot 下载可用 tracemalloc.Snapshot.load 读取的快照，
+        group=traceback 按调用栈汇总。
+        """
+        if query_params.get('stop', ['0'])[0] == '1':
+            memory_tracker.stop()
+            self._send_text_response("tracemalloc stopped\n")
+            return
+        if memory_tracker.start():
+            self._send_text_response("tracemalloc started, baseline taken\n")
+            return
+        if query_params.get('reset', ['0'])[0] == '1':
+            memory_tracker.reset_baseline()
+            self._send_text_response("baseline reset\n")
+            return
+        
+        snapshot = memory_tracker.snapshot()
+        if output_format == 'snapshot':
+            with tempfile.NamedTemporaryFile(suffix='.tracemalloc') as f:
+                snapshot.dump(f.name)
+                data = f.read()
+            self._send_text_response(data, 'application/octet-stream', 'news_service.tracemalloc')
+        else:
+            key_type = 'traceback' if query_params.get('group', [''])[0] == 'traceback' else 'lineno'
+            self._send_text_response(memory_tracker.summary(snapshot, top, key_type))
+    
+    def _handle_debug_trace(self, query_params: Dict, output_format: str):
+        """/debug/trace：最近各轮刷新的 Chrome trace-event JSON（format=summary 为概要）
+        
+        limit 只取最近 N 轮，min_ms 只取总耗时不低于该值的轮次，name 按轮次名称过滤
+        （refresh、fetch and merge、biga indices、biga sectors、biga telegraph）。
+        """
+        try:
+            limit = int(query_params['limit'][0]) if 'limit' in query_params else None
+            min_ms = float(query_params.get('min_ms', ['0'])[0])
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        name = query_params.get('name', [None])[0]
+        if output_format == 'summary':
+            self._send_json_response({**refresh_tracer.get_stats(),
+                                      'recent': refresh_tracer.summary(limit, min_ms, name)})
+        else:
+            trace = json.dumps(refresh_tracer.export(limit, min_ms, name), ensure_ascii=False)
+            self._send_text_response(trace, 'application/json; charset=utf-8', 'news_service.trace.json')
     
     # BigA模式处理函数
     def _handle_biga_status(self):
@@ -1005,10 +4195,14 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
         status = biga_pool.get_status()
         self._send_json_response(status)
     
-    def _handle_biga_next(self):
-        """处理BigA模式下一个内容请求"""
+    def _handle_biga_next(self, query_params: Dict):
+        """处理BigA模式下一个内容请求；format=line 时返回渲染好的状态栏文本"""
         content = biga_pool.get_display_content()
-        self._send_json_response(content)
+        if query_params.get('format', [''])[0] == 'line':
+            enable_links, _ = load_statusline_config()
+            self._send_text_response(render_biga_status_line(content, enable_links).replace('\n', ' ') + '\n')
+        else:
+            self._send_json_response(content)
     
     def _handle_biga_indices(self):
         """处理BigA模式股指数据请求"""
@@ -1020,10 +4214,20 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
         sectors = biga_pool.get_sectors()
         self._send_json_response(sectors)
     
-    def _handle_biga_telegraph(self):
-        """处理BigA模式电报数据请求"""
-        telegraph = biga_pool.get_telegraph()
-        self._send_json_response(telegraph)
+    def _handle_biga_telegraph(self, query_params: Dict):
+        """处理BigA模式电报数据请求：不带参数时返回最新5条，
+        带 since/until/limit 时按发布时间查询当天时间线（/biga/telegraph?since=09:30&until=10:00&limit=）"""
+        if not any(key in query_params for key in ('since', 'until', 'limit')):
+            self._send_json_response(biga_pool.get_telegraph())
+            return
+        try:
+            since = parse_since(query_params.get('since', [None])[0])
+            until = parse_since(query_params.get('until', [None])[0])
+            limit = max(1, min(int(query_params.get('limit', ['100'])[0]), 1000))
+        except ValueError as e:
+            self._send_error(400, f"Invalid parameter: {e}")
+            return
+        self._send_json_response(biga_pool.query_telegraph(since, until, limit))
     
     def _send_json_response(self, data):
         response = json.dumps(data, ensure_ascii=False, indent=2)
@@ -1033,6 +4237,17 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(response.encode('utf-8'))
     
+    def _send_text_response(self, data: Union[str, bytes], content_type: str = 'text/plain; charset=utf-8',
+                            filename: Optional[str] = None):
+        body = data.encode('utf-8') if isinstance(data, str) else data
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.end_headers()
+        self.wfile.write(body)
+    
     def _send_error(self, code: int, message: str):
         self.send_response(code)
         self.send_header('Content-Type', 'text/plain; charset=utf-8')
@@ -1043,67 +4258,219 @@ class NewsAPIHandler(BaseHTTPRequestHandler):
         # 减少HTTP日志输出
         pass
 
+def setup_batch_logging():
+    """批处理模式的日志：同步写到标准错误，不启动后台日志线程；默认只输出警告及以上"""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(os.getenv('NEWS_SERVICE_LOG_LEVEL', 'WARNING').upper())
+
+def run_once(source_names: Optional[List[str]] = None, output_format: str = 'jsonl',
+             output_path: Optional[str] = None, deadline: float = 60.0,
+             include_biga: bool = True, config_file: Optional[str] = None) -> int:
+    """批处理模式：并发抓取一次新闻源和大A行情，输出去重后的结果，返回进程退出码
+    
+    每个新闻源和每项大A数据各用一个守护线程抓取（沿用服务模式的 _fetch_* 抽取代码），
+    到 deadline 仍未完成的记为 timeout 并放弃。抓取出错、超时或没有得到任何内容都算该项失败。
+    退出码：0 全部成功，3 部分失败，1 全部失败、新闻源未知或无法写出结果（2 为命令行参数错误）。
+    """
+    pool = NewsPool(max_size=100000, auto_start=False, config_file=config_file)
+    sources = pool.news_sources
+    if source_names:
+        selected = {}
+        for name in source_names:
+            key = next((key for key, config in sources.items() if name in (key, config.get('name'))), None)
+            if key is None:
+                logger.error(f"未知或未启用的新闻源: {name}")
+                return 1
+            selected[key] = sources[key]
+        sources = selected
+    
+    tasks = {f"news:{key}": (lambda config=config: pool._fetch_news_from_source(config))
+             for key, config in sources.items()}
+    biga = None
+    if include_biga:
+        biga = BigAPool(auto_start=False)
+        tasks['biga:indices'] = biga._fetch_stock_indices
+        tasks['biga:sectors'] = biga._fetch_sector_data
+        tasks['biga:telegraph'] = biga._fetch_recent_telegraph
+    
+    results_lock = threading.Lock()
+    results: Dict[str, Dict] = {}
+    
+    def run_task(name, fetch):
+        start = time.perf_counter()
+        try:
+            items = fetch()
+            result = {'status': 'ok' if items else 'empty', 'items': items}
+        except Exception as e:
+            logger.error(f"批处理抓取失败 {name}: {e}")
+            result = {'status': 'error', 'error': str(e), 'items': []}
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        with results_lock:
+            results[name] = result
+    
+    threads = [threading.Thread(target=run_task, args=(name, fetch), name=name, daemon=True)
+               for name, fetch in tasks.items()]
+    finish_by = time.monotonic() + deadline
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0.0, finish_by - time.monotonic()))
+    with results_lock:
+        finished = dict(results)
+    
+    statuses = []
+    for name in tasks:
+        result = finished.get(name)
+        if result is None:
+            logger.warning(f"批处理抓取超时 {name}（{deadline}s）")
+            statuses.append({'task': name, 'status': 'timeout', 'items': 0})
+            continue
+        status = {'task': name, 'status': result['status'], 'items': len(result['items']),
+                  'elapsed_ms': result['elapsed_ms']}
+        if 'error' in result:
+            status['error'] = result['error']
+        statuses.append(status)
+    
+    # 与服务模式相同的去重（标题完全相同、近似重复聚类），按抓取时间倒序
+    pool._merge_news_items([item for name in tasks if name.startswith('news:')
+                            for item in finished.get(name, {}).get('items', [])])
+    snapshot = None
+    if biga is not None:
+        snapshot = {
+            'indices': [index.to_dict() for index in finished.get('biga:indices', {}).get('items', [])],
+            'sectors': [sector.to_dict() for sector in finished.get('biga:sectors', {}).get('items', [])],
+            'telegraph': [item.to_dict() for item in
+                          biga.telegraph_timeline.add(finished.get('biga:telegraph', {}).get('items', []))]
+        }
+    
+    def write(f):
+        if output_format == 'json':
+            document = {'generated_at': datetime.now().isoformat(), 'sources': statuses,
+                        'news': [item.to_dict() for item in pool.news_items]}
+            if snapshot is not None:
+                document['biga'] = snapshot
+            json.dump(document, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+            return
+        # jsonl：每行一条记录，type 为 news、index、sector、telegraph 或 source（各任务的结果）
+        records = [('news', item.to_dict()) for item in pool.news_items]
+        if snapshot is not None:
+            for record_type, key in (('index', 'indices'), ('sector', 'sectors'), ('telegraph', 'telegraph')):
+                records.extend((record_type, data) for data in snapshot[key])
+        records.extend(('source', status) for status in statuses)
+        for record_type, data in records:
+            f.write(json.dumps({'type': record_type, **data}, ensure_ascii=False) + '\n')
+    
+    try:
+        if output_path:
+            # 先写临时文件再替换，读取方不会看到写了一半的结果
+            directory = os.path.dirname(os.path.abspath(output_path))
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as f:
+                temp_path = f.name
+                try:
+                    write(f)
+                except BaseException:
+                    f.close()
+                    os.remove(temp_path)
+                    raise
+            os.replace(temp_path, output_path)
+        else:
+            write(sys.stdout)
+            sys.stdout.flush()
+    except (OSError, ValueError) as e:
+        logger.error(f"写出批处理结果失败: {e}")
+        return 1
+    
+    failed = [status for status in statuses if status['status'] != 'ok']
+    for status in failed:
+        logger.warning(f"{status['task']}: {status['status']} {status.get('error', '')}".rstrip())
+    if not failed:
+        return 0
+    return 1 if len(failed) == len(statuses) else 3
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="新闻状态栏服务；不带参数时作为后台服务运行")
+    parser.add_argument('--once', action='store_true', help="批处理模式：抓取一次，输出结果后退出")
+    parser.add_argument('--sources', help="只抓取这些新闻源（配置键或名称，逗号分隔），默认全部已启用的源")
+    parser.add_argument('--output', choices=('jsonl', 'json'), default='jsonl', help="输出格式（默认 jsonl）")
+    parser.add_argument('--output-file', help="写入该文件（原子替换），默认写到标准输出")
+    parser.add_argument('--deadline', type=float, default=60.0, help="全部抓取的总时限（秒，默认 60）")
+    parser.add_argument('--no-biga', action='store_true', help="不抓取大A行情（股指、板块、电报）")
+    parser.add_argument('--config', help="新闻源配置文件，默认 ~/.claude/news_sources_config.json")
+    args = parser.parse_args(argv)
+    if not args.once and (args.sources or args.output_file or args.no_biga or args.config):
+        parser.error("--sources、--output-file、--no-biga、--config 只用于 --once 批处理模式")
+    if args.deadline <= 0:
+        parser.error("--deadline 必须大于 0")
+    return args
+
 def signal_handler(signum, frame):
     """信号处理器"""
     logger.info("收到退出信号，正在停止服务...")
-    global news_pool, biga_pool, httpd
+    global news_pool, biga_pool, archive, snapshot_publisher, httpd
     if news_pool:
         news_pool.stop()
     if biga_pool:
         biga_pool.stop()
+    if archive:
+        archive.close()
+    if snapshot_publisher:
+        snapshot_publisher.stop()
+    stop_parse_pool()
     if httpd:
         httpd.shutdown()
     sys.exit(0)
 
-def check_existing_service():
-    """检查是否已有健康的服务在运行，如果有则跳过启动"""
-    import subprocess
+def acquire_instance_lock(port: int):
+    """单实例锁：对 <临时目录>/news_service_<端口>.lock 加非阻塞 flock
+    
+    锁随进程退出由内核释放，不会残留。成功时返回需一直持有的锁文件，已有实例时返回 None。
+    """
+    import fcntl
+    path = os.path.join(tempfile.gettempdir(), f"news_service_{port}.lock")
+    lock_file = open(path, 'a+')
     try:
-        # 先检查端口是否被占用
-        result = subprocess.run(['lsof', '-ti:8765'], capture_output=True, text=True, timeout=3)
-        if result.returncode == 0 and result.stdout.strip():
-            # 端口被占用，检查服务是否健康
-            try:
-                response = requests.get('http://localhost:8765/status', timeout=3)
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'total_news' in data:
-                        logger.info(f"检测到健康的新闻服务正在运行 (新闻数: {data.get('total_news', 0)})，跳过启动")
-                        sys.exit(0)
-                    else:
-                        logger.warning("服务响应格式异常，需要重启")
-                else:
-                    logger.warning(f"服务响应异常 (状态码: {response.status_code})，需要重启")
-            except Exception as e:
-                logger.warning(f"服务健康检查失败: {e}，需要重启")
-            
-            # 服务不健康，清理进程
-            pids = result.stdout.strip().split('\n')
-            logger.info("检测到端口被占用但服务不健康，正在清理...")
-            for pid in pids:
-                if pid.strip():
-                    try:
-                        logger.info(f"正在停止进程 PID: {pid}")
-                        subprocess.run(['kill', '-9', pid.strip()], timeout=3)
-                    except Exception as e:
-                        logger.warning(f"停止进程 {pid} 时出错: {e}")
-            
-            # 等待端口释放
-            import time
-            time.sleep(2)
-            logger.info("进程已清理，准备启动新服务")
-        else:
-            logger.info("端口8765空闲，准备启动服务")
-                
-    except Exception as e:
-        logger.warning(f"检查现有服务时出错: {e}")
-        pass
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.seek(0)
+        owner = lock_file.read().strip()
+        lock_file.close()
+        logger.info(f"检测到新闻服务已在运行 (PID: {owner or '未知'})，跳过启动")
+        return None
+    lock_file.truncate(0)
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+def check_existing_service(port: int):
+    """已有实例持有单实例锁时直接退出"""
+    global _instance_lock
+    _instance_lock = acquire_instance_lock(port)
+    if _instance_lock is None:
+        sys.exit(0)
 
 def main():
     global news_pool, httpd
     
-    # 检查是否已有服务运行
-    check_existing_service()
+    args = parse_args()
+    if args.once:
+        # 批处理模式不需要单实例锁、信号处理、后台数据池和 HTTP 服务
+        setup_batch_logging()
+        sources = [name.strip() for name in args.sources.split(',') if name.strip()] if args.sources else None
+        sys.exit(run_once(sources, args.output, args.output_file, args.deadline,
+                          include_biga=not args.no_biga, config_file=args.config))
+    
+    # 先检查是否已有服务运行：第二个实例不应打开（并可能轮转）正在运行的实例的日志文件
+    port = int(os.getenv('NEWS_SERVICE_PORT', '8765'))
+    check_existing_service(port)
+    
+    # 启动异步日志
+    setup_logging()
     
     # 注册信号处理器
     signal.signal(signal.SIGTERM, signal_handler)
@@ -1111,16 +4478,57 @@ def main():
     
     try:
         # 初始化新闻池
+        global biga_pool, search_index, alert_manager, archive
+        search_index = SearchIndex()
+        alert_manager = AlertManager()
+        change_feed = ChangeFeed()
+        # 副本模式：NEWS_SERVICE_REPLICA_OF=http://主实例:端口，不抓取上游，只同步主实例的变更流
+        replica_of = os.getenv('NEWS_SERVICE_REPLICA_OF', '').strip()
+        if NEWS_ARCHIVE_DIR:
+            try:
+                retention_days = int(os.getenv('NEWS_SERVICE_ARCHIVE_DAYS', '30') or 0)
+            except ValueError:
+                logger.warning("NEWS_SERVICE_ARCHIVE_DAYS 无效，使用默认保留 30 天")
+                retention_days = 30
+            archive = NewsArchive(NEWS_ARCHIVE_DIR, retention_days=retention_days)
+            atexit.register(archive.close)
+            logger.info(f"历史归档目录: {NEWS_ARCHIVE_DIR}，保留 {retention_days or '不限'} 天")
+        
+        try:
+            parse_workers = int(os.getenv('NEWS_SERVICE_PARSE_WORKERS', '0') or 0)
+        except ValueError:
+            logger.warning("NEWS_SERVICE_PARSE_WORKERS 无效，不启用解析进程池")
+            parse_workers = 0
+        if parse_workers > 0:
+            start_parse_pool(parse_workers)
+            atexit.register(stop_parse_pool)
+        
         logger.info("初始化新闻池...")
-        news_pool = NewsPool()
+        news_pool = NewsPool(auto_start=not replica_of, search_index=search_index,
+                             alert_manager=alert_manager, archive=archive, change_feed=change_feed)
         
         # 初始化BigA模式数据池
         logger.info("初始化BigA模式数据池...")
-        global biga_pool
-        biga_pool = BigAPool()
+        biga_pool = BigAPool(auto_start=not replica_of, search_index=search_index,
+                             alert_manager=alert_manager, archive=archive, change_feed=change_feed)
+        
+        if replica_of:
+            logger.info(f"副本模式：从 {replica_of} 同步数据")
+            news_pool.replica = ReplicaFollower(replica_of, news_pool, biga_pool)
+            news_pool.replica.start()
+        
+        # 快照发布：NEWS_SERVICE_SNAPSHOT=1 使用默认路径，也可以直接指定文件路径
+        snapshot_setting = os.getenv('NEWS_SERVICE_SNAPSHOT', '')
+        if snapshot_setting and snapshot_setting.lower() not in ('0', 'off', 'false'):
+            global snapshot_publisher
+            snapshot_path = (default_snapshot_path(port) if snapshot_setting.lower() in ('1', 'on', 'true')
+                             else os.path.expanduser(snapshot_setting))
+            snapshot_publisher = SnapshotPublisher(snapshot_path, news_pool, biga_pool)
+            news_pool.change_listeners.append(snapshot_publisher.notify)
+            biga_pool.change_listeners.append(snapshot_publisher.notify)
+            logger.info(f"状态栏快照发布到: {snapshot_path}")
         
         # 启动HTTP服务器
-        port = int(os.getenv('NEWS_SERVICE_PORT', '8765'))
         server_address = ('localhost', port)
         httpd = HTTPServer(server_address, NewsAPIHandler)
         
@@ -1129,7 +4537,14 @@ def main():
         logger.info("  GET /status  - 服务状态")
         logger.info("  GET /next    - 下一条新闻")
         logger.info("  GET /random?count=N - 随机新闻")
-        logger.info("  GET /refresh - 手动刷新")
+        logger.info("  GET /refresh?source= - 手动刷新（返回刷新编号，/refresh?flight=<编号> 查询结果）")
+        logger.info("  GET /reload  - 重新加载新闻源配置")
+        logger.info("  GET /sources - 新闻源抽取统计")
+        logger.info("  GET /search?q=&source=&since= - 全文搜索")
+        logger.info("  GET /alerts?since= - 关键词提醒")
+        logger.info("  POST /alerts/watchlist - 注册关注列表（JSON 请求体 {\"name\": \"\", \"keywords\": []}）")
+        logger.info("  GET /history?date=&source=&cursor= - 历史归档")
+        logger.info("  GET /changes?since= - 变更流（副本同步）")
         logger.info("BigA Mode endpoints:")
         logger.info("  GET /biga/status    - BigA模式状态")
         logger.info("  GET /biga/next      - BigA模式轮播内容")
@@ -1148,5 +4563,10 @@ def main():
 if __name__ == "__main__":
     news_pool = None
     biga_pool = None
+    search_index = None
+    alert_manager = None
+    archive = None
+    snapshot_publisher = None
     httpd = None
+    _instance_lock = None
     main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+#!/bin/bash
+# 状态栏脚本共用部分，由 status_line.sh 和 status_line_biga.sh source
+# 状态栏文本（图标、时间、截断、OSC 8 超链接、涨跌着色）统一由 news_service.py 渲染，
+# 这里只负责读取渲染好的文本并原样输出
+
+# 读取服务发布的快照文件（见 NEWS_SERVICE_SNAPSHOT），30秒内有效
+# 参数为行号（2: 新闻，3: BigA），成功时结果放在 SNAPSHOT_LINE
+read_snapshot_line() {
+    local line_no="$1"
+    local port="${NEWS_SERVICE_PORT:-8765}"
+    local snapshot_file
+    case "${NEWS_SERVICE_SNAPSHOT:-1}" in
+        0|off|false) return 1 ;;
+        1|on|true)
+            if [ -d /dev/shm ]; then
+                snapshot_file="/dev/shm/news_service_${port}.snapshot"
+            else
+                snapshot_file="${TMPDIR:-/tmp}/news_service_${port}.snapshot"
+            fi
+            ;;
+        *) snapshot_file="${NEWS_SERVICE_SNAPSHOT/#\~/$HOME}" ;;
+    esac
+    [ -r "$snapshot_file" ] || return 1
+    
+    # 只用 bash 内建命令读取，不启动额外进程
+    local published news_line biga_line now
+    { IFS= read -r published; IFS= read -r news_line; IFS= read -r biga_line; } < "$snapshot_file" || return 1
+    printf -v now '%(%s)T' -1 2>/dev/null || now=$(date +%s)
+    if ! [[ "$published" =~ ^[0-9]+$ ]] || [ $((now - published)) -gt 30 ]; then
+        return 1
+    fi
+    
+    if [ "$line_no" = "2" ]; then
+        SNAPSHOT_LINE="$news_line"
+    else
+        SNAPSHOT_LINE="$biga_line"
+    fi
+    [ -n "$SNAPSHOT_LINE" ]
+}
+
+# 输出一行状态栏文本：优先读取快照文件，否则请求服务渲染好的文本（format=line）
+# 参数：快照行号、接口路径、服务不可用时的备用文本
+print_status_line() {
+    local line_no="$1"
+    local path="$2"
+    local fallback="$3"
+    
+    # 服务发布了快照时直接读取，不发起HTTP请求
+    if read_snapshot_line "$line_no"; then
+        printf "%s\n" "$SNAPSHOT_LINE"
+        return 0
+    fi
+    
+    local port="${NEWS_SERVICE_PORT:-8765}"
+    local line
+    line=$(curl -sf --max-time 3 "http://localhost:${port}${path}?format=line" 2>/dev/null)
+    if [ $? -eq 0 ] && [ -n "$line" ]; then
+        printf "%s\n" "$line"
+        return 0
+    fi
+    
+    # 如果API失败，返回备用消息
+    echo "$fallback"
+    return 1
+}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+上游回放服务：用录制的响应模拟 cls.cn / sinajs.cn / eastmoney.com
+
+录制（在真实网络环境下运行服务）:
+    NEWS_SERVICE_RECORD_DIR=/tmp/upstream python3 news_service.py
+
+回放:
+    python3 tools/upstream_replay.py /tmp/upstream --port 9000 --retime-telegraph
+    NEWS_SERVICE_UPSTREAM=http://127.0.0.1:9000 python3 news_service.py
+
+请求路径为 /<原主机><原路径>，例如 /www.cls.cn/telegraph。可选的故障注入：
+
+    --latency 200                  所有请求额外延迟200ms
+    --latency www.cls.cn=3000      指定主机的延迟（可重复）
+    --latency recorded             按录制时的耗时延迟
+    --jitter 50                    延迟随机抖动 ±50ms
+    --error-rate 0.1               10% 的请求返回 --error-status
+    --error-rate hq.sinajs.cn=0.5  指定主机的错误率
+    --rotate request               同一URL的多份录制按请求轮换（或填秒数按时间轮换）
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+_TELEGRAPH_TIME_RE = re.compile(rb'(telegraph-time-box">)(\d{2}):(\d{2}):(\d{2})')
+
+def retime_telegraph(content: bytes, now: Optional[float] = None) -> bytes:
+    """把电报页面中的时间整体平移，使最新一条等于当前时刻"""
+    matches = list(_TELEGRAPH_TIME_RE.finditer(content))
+    if not matches:
+        return content
+    first = matches[0]
+    newest = int(first.group(2)) * 3600 + int(first.group(3)) * 60 + int(first.group(4))
+    local = time.localtime(now or time.time())
+    shift = local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec - newest
+
+    def replace(match):
+        seconds = (int(match.group(2)) * 3600 + int(match.group(3)) * 60 + int(match.group(4)) + shift) % 86400
+        return match.group(1) + f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}".encode()
+
+    return _TELEGRAPH_TIME_RE.sub(replace, content)
+
+class RecordingIndex:
+    """读取 index.jsonl，按 URL 查找录制的响应"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.exact: Dict[tuple, List[dict]] = {}
+        self.by_path: Dict[tuple, List[dict]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        with open(os.path.join(directory, 'index.jsonl'), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    self.add(json.loads(line))
+
+    @staticmethod
+    def _key(url: str):
+        parsed = urllib.parse.urlparse(url)
+        return parsed.netloc, parsed.path or '/', parsed.query
+
+    def add(self, entry: dict):
+        host, path, query = self._key(entry['url'])
+        self.exact.setdefault((host, path, query), []).append(entry)
+        self.by_path.setdefault((host, path), []).append(entry)
+
+    def candidates(self, url: str) -> List[dict]:
+        """精确匹配优先，其次忽略查询参数按主机+路径匹配（不区分协议）"""
+        host, path, query = self._key(url)
+        return self.exact.get((host, path, query)) or self.by_path.get((host, path)) or []
+
+    def body(self, entry: dict) -> bytes:
+        with self._lock:
+            if entry['body'] not in self._bodies:
+                with open(os.path.join(self.directory, entry['body']), 'rb') as f:
+                    self._bodies[entry['body']] = f.read()
+            return self._bodies[entry['body']]
+
+def _per_host_option(values: List[str], cast):
+    """把 ["200", "host=3000"] 解析为 (默认值, {主机: 值})"""
+    default, hosts = None, {}
+    for value in values or []:
+        if '=' in value:
+            host, item = value.split('=', 1)
+            hosts[host] = item if item == 'recorded' else cast(item)
+        else:
+            default = value if value == 'recorded' else cast(value)
+    return default, hosts
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, index: RecordingIndex, latency=None, jitter: float = 0.0,
+                 error_rate=None, error_status: int = 503, rotate: str = 'off', retime: bool = False):
+        super().__init__(address, ReplayHandler)
+        self.index = index
+        self.latency_default, self.latency_hosts = latency or (None, {})
+        self.error_default, self.error_hosts = error_rate or (None, {})
+        self.jitter = jitter
+        self.error_status = error_status
+        self.rotate = rotate
+        self.retime = retime
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {'requests': 0, 'errors_injected': 0, 'not_found': 0}
+
+    def pick(self, url: str, entries: List[dict]) -> dict:
+        if self.rotate == 'request':
+            with self._lock:
+                counter = self._counters.setdefault(url, itertools.count())
+                return entries[next(counter) % len(entries)]
+        if self.rotate not in ('off', '', None):
+            slot = int((time.time() - self.started) // float(self.rotate))
+            return entries[slot % len(entries)]
+        return entries[-1]
+
+    def delay_for(self, host: str, entry: Optional[dict]) -> float:
+        latency = self.latency_hosts.get(host, self.latency_default)
+        if latency == 'recorded':
+            latency = entry.get('elapsed_ms', 0) if entry else 0
+        latency = float(latency or 0)
+        if self.jitter:
+            latency += random.uniform(-self.jitter, self.jitter)
+        return max(0.0, latency) / 1000
+
+    def should_fail(self, host: str) -> bool:
+        rate = self.error_hosts.get(host, self.error_default)
+        return bool(rate) and random.random() < rate
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server: ReplayServer = self.server
+        with server._lock:
+            server.stats['requests'] += 1
+        if self.path == '/__stats':
+            self._send(200, {'Content-Type': 'application/json'}, json.dumps(server.stats).encode())
+            return
+
+        # /<host>/<path>?<query> -> https://<host>/<path>?<query>
+        host, _, rest = self.path.lstrip('/').partition('/')
+        url = f"https://{host}/{rest}"
+        entries = server.index.candidates(url)
+        entry = server.pick(url, entries) if entries else None
+
+        time.sleep(server.delay_for(host, entry))
+
+        if server.should_fail(host):
+            with server._lock:
+                server.stats['errors_injected'] += 1
+            self._send(server.error_status, {'Content-Type': 'text/plain'}, b'injected error')
+            return
+        if entry is None:
+            with server._lock:
+                server.stats['not_found'] += 1
+            self._send(404, {'Content-Type': 'text/plain'}, f"no recording for {url}".encode())
+            return
+
+        body = server.index.body(entry)
+        if server.retime and '/telegraph' in url:
+            body = retime_telegraph(body)
+        self._send(entry.get('status', 200), entry.get('headers', {}), body)
+
+    def _send(self, status: int, headers: Dict[str, str], body: bytes):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description='上游回放服务', formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog=__doc__)
+    parser.add_argument('directory', help='录制目录（包含 index.jsonl）')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency', action='append', help='毫秒、host=毫秒 或 recorded')
+    parser.add_argument('--jitter', type=float, default=0.0, help='延迟抖动（毫秒）')
+    parser.add_argument('--error-rate', action='append', help='0~1 或 host=0~1')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--rotate', default='off', help='off、request 或轮换间隔秒数')
+    parser.add_argument('--retime-telegraph', action='store_true', help='把电报时间平移到当前时刻')
+    args = parser.parse_args()
+
+    index = RecordingIndex(args.directory)
+    server = ReplayServer(
+        (args.host, args.port), index,
+        latency=_per_host_option(args.latency, float),
+        jitter=args.jitter,
+        error_rate=_per_host_option(args.error_rate, float),
+        error_status=args.error_status,
+        rotate=args.rotate,
+        retime=args.retime_telegraph,
+    )
+    print(f"回放 {sum(len(v) for v in index.exact.values())} 条录制，监听 http://{args.host}:{server.server_address[1]}",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()